@@ -0,0 +1,163 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Union
+
+from fitted import FittedPipeline
+
+Chunk = Dict[str, List[Any]]
+
+# Número padrão de micro-lotes em cada fila entre as etapas
+DEFAULT_QUEUE_SIZE = 8
+
+# Marca de fim do fluxo nas filas
+_DONE = object()
+
+
+class _Failure:
+    """Erro de uma etapa, repassado pelas filas até o consumidor."""
+    __slots__ = ('error',)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _rows(batch: Chunk) -> int:
+    return len(next(iter(batch.values()))) if batch else 0
+
+
+class AsyncPipeline:
+    """Aplica um FittedPipeline a um fluxo assíncrono de micro-lotes (dicionários de listas).
+
+    Ingestão, transformação e consumo rodam como etapas concorrentes ligadas por filas
+    limitadas a 'maxsize' lotes: enquanto um lote é transformado, o próximo já pode ser
+    lido da fonte e o anterior entregue ao destino. Quando o consumidor atrasa, as filas
+    enchem e a leitura da fonte é pausada (backpressure), de modo que a memória fica
+    limitada a cerca de 2 * maxsize lotes.
+
+    Com offload=True a transformação roda em 'executor' (por padrão, o executor de threads
+    do loop), sem bloquear o loop de eventos. Os lotes recebidos são modificados, como em
+    FittedPipeline.transform()."""
+
+    def __init__(self, pipeline: FittedPipeline, maxsize: int = DEFAULT_QUEUE_SIZE, offload: bool = True,
+                 executor: Executor = None):
+        if maxsize < 1:
+            raise ValueError("O 'maxsize' das filas deve ser positivo.")
+        self.pipeline = pipeline
+        self.maxsize = maxsize
+        self.offload = offload
+        self.executor = executor
+
+    async def _ingest(self, source: Union[AsyncIterable[Chunk], Iterable[Chunk]], queue: asyncio.Queue):
+        try:
+            if hasattr(source, '__aiter__'):
+                async for batch in source:
+                    await queue.put(batch)
+            else:
+                for batch in source:
+                    await queue.put(batch)
+        except Exception as error:
+            await queue.put(_Failure(error))
+            return
+        await queue.put(_DONE)
+
+    async def _transform(self, inbound: asyncio.Queue, outbound: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await inbound.get()
+            if batch is _DONE or isinstance(batch, _Failure):
+                await outbound.put(batch)
+                return
+            try:
+                if self.offload:
+                    batch = await loop.run_in_executor(self.executor, self.pipeline.transform, batch)
+                else:
+                    batch = self.pipeline.transform(batch)
+            except Exception as error:
+                await outbound.put(_Failure(error))
+                return
+            await outbound.put(batch)
+
+    async def stream(self, source: Union[AsyncIterable[Chunk], Iterable[Chunk]]) -> AsyncIterator[Chunk]:
+        """Gerador assíncrono dos lotes transformados, na ordem da fonte. Erros da fonte ou da
+        transformação são relançados aqui. Fechar o gerador cancela as etapas; para fazê-lo
+        logo ao interromper a iteração, use contextlib.aclosing(pipeline.stream(fonte))."""
+        inbound = asyncio.Queue(self.maxsize)
+        outbound = asyncio.Queue(self.maxsize)
+        tasks = [asyncio.ensure_future(self._ingest(source, inbound)),
+                 asyncio.ensure_future(self._transform(inbound, outbound))]
+        try:
+            while True:
+                item = await outbound.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, source: Union[AsyncIterable[Chunk], Iterable[Chunk]],
+                  sink: Callable[[Chunk], Any]) -> int:
+        """Consome o fluxo entregando cada lote transformado a 'sink' (função ou corrotina).
+        Retorna o número de linhas entregues."""
+        rows = 0
+        async for batch in self.stream(source):
+            result = sink(batch)
+            if inspect.isawaitable(result):
+                await result
+            rows += _rows(batch)
+        return rows
+
+
+class InMemoryProducer:
+    """Fonte assíncrona de micro-lotes em memória, para testes e simulações.
+
+    Com 'batches', entrega os lotes informados (esperando 'interval' segundos antes de
+    cada um) e termina. Sem eles, funciona como um fluxo ao vivo: lotes enviados com
+    put() são entregues na ordem, e close() encerra o fluxo. A fila interna tem no máximo
+    'maxsize' lotes, então put() espera quando o pipeline não acompanha o ritmo."""
+
+    def __init__(self, batches: Iterable[Chunk] = None, maxsize: int = DEFAULT_QUEUE_SIZE, interval: float = 0.0):
+        self._batches = list(batches) if batches is not None else None
+        self._queue = asyncio.Queue(maxsize) if batches is None else None
+        self._closed = batches is not None
+        self.interval = interval
+
+    @classmethod
+    def from_dataset(cls, dataset: Dict[str, List[Any]], batch_size: int, interval: float = 0.0) -> 'InMemoryProducer':
+        """Divide um dataset (dicionário de colunas) em lotes de até 'batch_size' linhas."""
+        if batch_size < 1:
+            raise ValueError("O 'batch_size' deve ser positivo.")
+        columns = {name: list(values) for name, values in dataset.items()}
+        rows = _rows(columns)
+        return cls([{name: values[start:start + batch_size] for name, values in columns.items()}
+                    for start in range(0, rows, batch_size)], interval=interval)
+
+    async def put(self, batch: Chunk):
+        if self._closed:
+            raise RuntimeError("O produtor já foi fechado.")
+        await self._queue.put(batch)
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            await self._queue.put(_DONE)
+
+    def __aiter__(self) -> AsyncIterator[Chunk]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Chunk]:
+        if self._batches is not None:
+            for batch in self._batches:
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+                yield batch
+            return
+        while True:
+            batch = await self._queue.get()
+            if batch is _DONE:
+                return
+            yield batch
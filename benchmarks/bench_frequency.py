@@ -0,0 +1,50 @@
+"""Benchmark de escalabilidade das frequências de Statistics.
+
+Mede o tempo de absolute_frequency, mode, relative_frequency e
+cumulative_frequency em colunas de 10^4 a 10^7 linhas. Como a tabela de
+frequências é construída em uma única passada, o tempo por linha deve se
+manter aproximadamente constante entre os tamanhos.
+
+Uso:
+    python benchmarks/bench_frequency.py [--max-exponent 7] [--categories 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from food_statistics import Statistics  # noqa: E402
+
+
+def run(rows, categories, seed=0):
+    rng = random.Random(seed)
+    dataset = {'prato_id': [rng.randrange(categories) for _ in range(rows)]}
+    stats = Statistics(dataset)
+
+    start = time.perf_counter()
+    stats.absolute_frequency('prato_id')
+    stats.mode('prato_id')
+    stats.relative_frequency('prato_id')
+    stats.cumulative_frequency('prato_id', 'relative')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--min-exponent', type=int, default=4)
+    parser.add_argument('--max-exponent', type=int, default=7)
+    parser.add_argument('--categories', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>12} {'segundos':>10} {'ns/linha':>10}")
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        rows = 10 ** exponent
+        elapsed = run(rows, args.categories)
+        print(f"{rows:>12} {elapsed:>10.4f} {elapsed / rows * 1e9:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark do Scaler: caminho vetorizado (NumPy) contra o caminho em Python puro.
+
+Mede colunas em listas (onde a conversão lista <-> ndarray domina o tempo) e em
+TypedColumn do ColumnarDataset, em que o buffer é lido e escrito sem cópia por célula.
+
+Uso:
+    python benchmarks/bench_scaler.py [--rows 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import preprocessing  # noqa: E402
+from columnar import TypedColumn  # noqa: E402
+from preprocessing import Scaler  # noqa: E402
+
+
+def timed(method, values, vectorized, columnar):
+    column = TypedColumn(values) if columnar else list(values)
+    scaler = Scaler({'tempo_entrega': column})
+    start = time.perf_counter()
+    if vectorized:
+        getattr(scaler, method)()
+    else:
+        with patch('preprocessing.np', None):
+            getattr(scaler, method)()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if preprocessing.np is None:
+        sys.exit("NumPy não está instalado; o caminho vetorizado não está disponível.")
+
+    rng = random.Random(0)
+    values = [rng.uniform(5.0, 90.0) for _ in range(args.rows)]
+
+    print(f"{'método':>16} {'coluna':>12} {'python (s)':>11} {'numpy (s)':>10} {'ganho':>7}")
+    for columnar in (False, True):
+        storage = 'TypedColumn' if columnar else 'list'
+        for method in ('minMax_scaler', 'standard_scaler'):
+            python_time = timed(method, values, vectorized=False, columnar=columnar)
+            numpy_time = timed(method, values, vectorized=True, columnar=columnar)
+            print(f"{method:>16} {storage:>12} {python_time:>11.4f} {numpy_time:>10.4f} "
+                  f"{python_time / numpy_time:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""Suíte de benchmarks reprodutível dos caminhos críticos de Preprocessing e Statistics.
+
+Gera datasets sintéticos no formato de pedidos de delivery (tempos, distâncias, valores,
+restaurantes, bairros) e mede fillna, dropna, scale, encode e os métodos de Statistics
+variando o número de linhas (10^3 a 10^7), de colunas numéricas extras, a fração de nulos
+e a cardinalidade das colunas categóricas. Para cada caso são registrados o tempo de
+parede (melhor de --repeat execuções), linhas por segundo e o pico de memória alocada
+(tracemalloc, em uma execução separada para não distorcer o tempo).
+
+Os resultados são gravados em JSON; com --baseline, cada caso é comparado ao mesmo caso
+de uma execução anterior e os que ficarem mais lentos que --threshold são marcados como
+regressão (o processo termina com código 1).
+
+Uso:
+    python benchmarks/bench_suite.py [--min-exponent 3] [--max-exponent 5] \\
+        [--null-ratios 0.1] [--cardinalities 50,5000] [--extra-columns 0] \\
+        [--cases fillna_mean,scale_standard] [--output resultados.json] \\
+        [--baseline baseline.json] [--threshold 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from food_statistics import Statistics  # noqa: E402
+from preprocessing import Preprocessing  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BAIRROS = ['Boa Viagem', 'Casa Forte', 'Graças', 'Espinheiro', 'Pina', 'Madalena', 'Torre', 'Derby']
+NUMERIC_COLUMNS = ('tempo_entrega', 'distancia_km', 'valor_pedido', 'itens')
+
+
+def make_delivery_dataset(rows, null_ratio=0.1, cardinality=500, extra_columns=0, seed=0):
+    """Dataset sintético de pedidos: colunas numéricas com 'null_ratio' de nulos, o
+    restaurante com 'cardinality' valores distintos (distribuição enviesada, como em
+    pedidos reais) e o bairro com poucas categorias."""
+    rng = random.Random(seed)
+
+    def with_nulls(values):
+        return [None if rng.random() < null_ratio else value for value in values]
+
+    distancias = [round(rng.expovariate(1 / 4.0), 2) for _ in range(rows)]
+    dataset = {
+        'tempo_entrega': with_nulls(round(10 + 3.5 * d + rng.gauss(0, 5), 1) for d in distancias),
+        'distancia_km': with_nulls(distancias),
+        'valor_pedido': with_nulls(round(rng.lognormvariate(3.5, 0.5), 2) for _ in range(rows)),
+        'itens': with_nulls(rng.randint(1, 8) for _ in range(rows)),
+        'restaurante': [f'rest_{int(rng.paretovariate(1.2)) % cardinality}' for _ in range(rows)],
+        'bairro': [rng.choice(BAIRROS) for _ in range(rows)],
+        'avaliacao': [rng.randint(1, 5) for _ in range(rows)],
+    }
+    for index in range(extra_columns):
+        dataset[f'feature_{index}'] = with_nulls(rng.uniform(0, 100) for _ in range(rows))
+    return dataset
+
+
+def _numeric(dataset):
+    return {name for name in dataset if name in NUMERIC_COLUMNS or name.startswith('feature_')}
+
+
+def _filled(dataset):
+    """Cópia sem nulos, para os casos que exigem colunas completas."""
+    processor = Preprocessing(_copy(dataset))
+    processor.fillna(columns=_numeric(dataset), method='mean')
+    return processor.dataset
+
+
+def _copy(dataset):
+    return {name: list(values) for name, values in dataset.items()}
+
+
+# Cada caso recebe o dataset gerado e devolve (preparo, operação): o preparo (cópias,
+# preenchimento prévio) não entra na medição; a operação é a parte cronometrada.
+CASES = {
+    'fillna_mean': lambda d: (lambda: Preprocessing(_copy(d)),
+                              lambda p: p.fillna(columns=_numeric(d), method='mean')),
+    'fillna_median': lambda d: (lambda: Preprocessing(_copy(d)),
+                                lambda p: p.fillna(columns=_numeric(d), method='median')),
+    'dropna': lambda d: (lambda: Preprocessing(_copy(d)), lambda p: p.dropna()),
+    'scale_minmax': lambda d: (lambda: Preprocessing(_filled(d)),
+                               lambda p: p.scale(columns=_numeric(d), method='minMax')),
+    'scale_standard': lambda d: (lambda: Preprocessing(_filled(d)),
+                                 lambda p: p.scale(columns=_numeric(d), method='standard')),
+    'encode_label': lambda d: (lambda: Preprocessing(_copy(d)),
+                               lambda p: p.encode(columns={'restaurante', 'bairro'}, method='label')),
+    'encode_onehot': lambda d: (lambda: Preprocessing(_copy(d)),
+                                lambda p: p.encode(columns={'bairro'}, method='oneHot')),
+    'encode_sparse_onehot': lambda d: (lambda: Preprocessing(_copy(d)),
+                                       lambda p: p.encode(columns={'restaurante'}, method='sparseOneHot')),
+    'stats_moments': lambda d: (lambda: Statistics(_filled(d)),
+                                lambda s: [s.stdev(column) for column in NUMERIC_COLUMNS]),
+    'stats_median': lambda d: (lambda: Statistics(_filled(d)),
+                               lambda s: [s.median(column) for column in NUMERIC_COLUMNS]),
+    'stats_frequency': lambda d: (lambda: Statistics(d),
+                                  lambda s: (s.mode('restaurante'), s.cumulative_frequency('restaurante'))),
+    'stats_conditional': lambda d: (lambda: Statistics(d),
+                                    lambda s: [s.conditional_probability('bairro', a, b)
+                                               for a in BAIRROS for b in BAIRROS]),
+    'stats_correlation': lambda d: (lambda: Statistics(_filled(d)),
+                                    lambda s: s.correlation_matrix(_numeric(d))),
+}
+
+
+def measure(case, dataset, repeat=3, memory=True):
+    """Retorna (melhor tempo em segundos, pico de memória em bytes ou None)."""
+    setup, operation = CASES[case](dataset)
+    best = float('inf')
+    for _ in range(repeat):
+        target = setup()
+        start = time.perf_counter()
+        operation(target)
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        target = setup()
+        tracemalloc.start()
+        try:
+            operation(target)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def case_key(result):
+    return (result['case'], result['rows'], result['null_ratio'], result['cardinality'], result['extra_columns'])
+
+
+def compare(results, baseline, threshold):
+    """Compara cada resultado ao caso equivalente do baseline. Retorna a lista de
+    (resultado, razão tempo_atual / tempo_baseline) e as regressões acima de 'threshold'."""
+    previous = {case_key(result): result for result in baseline['results']}
+    comparisons, regressions = [], []
+    for result in results:
+        reference = previous.get(case_key(result))
+        if reference is None or not reference['seconds']:
+            continue
+        ratio = result['seconds'] / reference['seconds']
+        comparisons.append((result, ratio))
+        if ratio > 1 + threshold:
+            regressions.append((result, ratio))
+    return comparisons, regressions
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__ if np is not None else None,
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def _parse_list(text, convert):
+    return [convert(item) for item in text.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--min-exponent', type=int, default=3)
+    parser.add_argument('--max-exponent', type=int, default=5, help='até 7 (10^7 linhas)')
+    parser.add_argument('--null-ratios', default='0.1')
+    parser.add_argument('--cardinalities', default='500')
+    parser.add_argument('--extra-columns', default='0', help='colunas numéricas adicionais, ex.: 0,16')
+    parser.add_argument('--cases', default=','.join(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='não mede o pico de memória')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparação')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fração de lentidão tolerada antes de marcar regressão')
+    args = parser.parse_args()
+
+    cases = _parse_list(args.cases, str)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(sorted(unknown))}. Disponíveis: {', '.join(CASES)}")
+
+    results = []
+    print(f"{'caso':<22} {'linhas':>9} {'nulos':>6} {'card.':>7} {'extras':>6} "
+          f"{'segundos':>10} {'linhas/s':>12} {'pico (MB)':>10}")
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        rows = 10 ** exponent
+        for null_ratio in _parse_list(args.null_ratios, float):
+            for cardinality in _parse_list(args.cardinalities, int):
+                for extra_columns in _parse_list(args.extra_columns, int):
+                    dataset = make_delivery_dataset(rows, null_ratio, cardinality, extra_columns, args.seed)
+                    for case in cases:
+                        seconds, peak = measure(case, dataset, args.repeat, not args.no_memory)
+                        result = {'case': case, 'rows': rows, 'null_ratio': null_ratio,
+                                  'cardinality': cardinality, 'extra_columns': extra_columns,
+                                  'seconds': seconds, 'rows_per_sec': rows / seconds if seconds else None,
+                                  'peak_bytes': peak}
+                        results.append(result)
+                        peak_text = f"{peak / 2 ** 20:>10.2f}" if peak is not None else f"{'-':>10}"
+                        print(f"{case:<22} {rows:>9} {null_ratio:>6.2f} {cardinality:>7} {extra_columns:>6} "
+                              f"{seconds:>10.4f} {result['rows_per_sec']:>12.0f} {peak_text}")
+                    del dataset
+
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump({'environment': environment(), 'results': results}, output, indent=2)
+    print(f"\nResultados gravados em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        comparisons, regressions = compare(results, baseline, args.threshold)
+        print(f"\nComparação com {args.baseline} ({len(comparisons)} casos em comum):")
+        for result, ratio in comparisons:
+            flag = '  REGRESSÃO' if ratio > 1 + args.threshold else ''
+            print(f"{result['case']:<22} {result['rows']:>9} {ratio:>8.2f}x{flag}")
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
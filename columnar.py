@@ -0,0 +1,452 @@
+from array import array
+from collections import Counter
+from collections.abc import MutableMapping, MutableSequence, Sequence
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional
+
+from sparse import SparseOneHotColumn
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele as contagens usam Counter
+    np = None
+
+
+# Tabela que expande um byte do bitmap de validade em 8 bytes de nulidade (1 = None)
+_NULL_BYTES = [bytes(0 if (byte >> bit) & 1 else 1 for bit in range(8)) for byte in range(256)]
+
+
+def _infer_typecode(values: Iterable[Any]) -> Optional[str]:
+    """Retorna 'q' (inteiros), 'd' (floats) ou None se a coluna não for puramente numérica."""
+    has_float = False
+    for value in values:
+        if value is None:
+            continue
+        value_type = type(value)
+        if value_type is float:
+            has_float = True
+        elif value_type is not int:
+            return None
+    return 'd' if has_float else 'q'
+
+
+class TypedColumn(MutableSequence):
+    """Coluna numérica armazenada em um buffer contíguo (módulo array) com um
+    bitmap de validade separado para os valores None.
+
+    Inteiros usam 'q' e floats usam 'd' (8 bytes por célula); o bitmap só é alocado
+    quando a coluna contém nulos. Atribuir um float a uma coluna de inteiros promove
+    o buffer para 'd'; atribuir um valor não numérico converte a coluna para uma
+    lista de objetos, preservando o comportamento de uma lista comum."""
+
+    __slots__ = ('_values', '_validity')
+
+    def __init__(self, values: Iterable[Any] = (), typecode: str = None):
+        values = values if isinstance(values, list) else list(values)
+        if typecode is None:
+            typecode = _infer_typecode(values)
+        self._validity = None
+        self._load(values, typecode)
+
+    @classmethod
+    def from_buffers(cls, values, validity=None) -> 'TypedColumn':
+        """Cria a coluna diretamente a partir de um buffer tipado e de um bitmap, sem cópia."""
+        column = cls.__new__(cls)
+        column._values = values
+        column._validity = validity
+        return column
+
+    def _load(self, values: List[Any], typecode: Optional[str]):
+        if typecode is None:
+            self._values = list(values)
+            self._validity = None
+            return
+
+        if None in values:
+            null_indices = [index for index, value in enumerate(values) if value is None]
+            filled = list(values)
+            for index in null_indices:
+                filled[index] = 0
+            values = filled
+            self._validity = bytearray(b'\xff' * ((len(values) + 7) // 8))
+            for index in null_indices:
+                self._validity[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        else:
+            self._validity = None
+
+        try:
+            self._values = array(typecode, values)
+        except OverflowError:
+            # Inteiros fora do intervalo de 64 bits continuam como objetos Python
+            self._load([None if not self._is_valid(i) else v for i, v in enumerate(values)], None)
+
+    @property
+    def typecode(self) -> str:
+        """'q', 'd' ou 'O' (lista de objetos)."""
+        if isinstance(self._values, list):
+            return 'O'
+        return getattr(self._values, 'typecode', None) or self._values.format
+
+    @property
+    def values(self):
+        """Buffer subjacente (array, memoryview ou lista). Posições nulas contêm lixo."""
+        return self._values
+
+    @property
+    def validity(self):
+        """Bitmap de validade (bit 1 = valor presente) ou None se não houver nulos."""
+        return self._validity
+
+    @property
+    def nbytes(self) -> int:
+        if isinstance(self._values, list):
+            return 0
+        validity_bytes = len(self._validity) if self._validity is not None else 0
+        return len(self._values) * self._values.itemsize + validity_bytes
+
+    @property
+    def null_count(self) -> int:
+        if isinstance(self._values, list):
+            return self._values.count(None)
+        if self._validity is None:
+            return 0
+        return self.null_mask().count(1)
+
+    def null_mask(self) -> bytes:
+        """Retorna um byte por linha: 1 se o valor é None, 0 caso contrário."""
+        if isinstance(self._values, list):
+            return bytes(value is None for value in self._values)
+        if self._validity is None:
+            return bytes(len(self._values))
+        return b''.join(map(_NULL_BYTES.__getitem__, self._validity))[:len(self._values)]
+
+    def _is_valid(self, index: int) -> bool:
+        return self._validity is None or bool((self._validity[index >> 3] >> (index & 7)) & 1)
+
+    def _set_valid(self, index: int, valid: bool):
+        if valid:
+            if self._validity is not None:
+                self._validity[index >> 3] |= 1 << (index & 7)
+            return
+        if self._validity is None:
+            self._validity = bytearray(b'\xff' * ((len(self._values) + 7) // 8))
+        elif not isinstance(self._validity, bytearray):
+            self._validity = bytearray(self._validity)
+        self._validity[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def _ensure_writable(self):
+        """Copia buffers somente leitura (ex.: memoryview) antes de uma escrita."""
+        if isinstance(self._values, memoryview):
+            self._values = array(self._values.format, self._values)
+        if self._validity is not None and not isinstance(self._validity, bytearray):
+            self._validity = bytearray(self._validity)
+
+    def _promote_to_objects(self):
+        self._values = self.tolist()
+        self._validity = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        if isinstance(self._values, list):
+            return self._values[index]
+        if index < 0:
+            index += len(self._values)
+        value = self._values[index]
+        return value if self._is_valid(index) else None
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = self.tolist()
+            values[index] = value
+            self._load(values, _infer_typecode(values))
+            return
+        if isinstance(self._values, list):
+            self._values[index] = value
+            return
+        if index < 0:
+            index += len(self._values)
+        if not 0 <= index < len(self._values):
+            raise IndexError("Índice fora do intervalo da coluna.")
+
+        self._ensure_writable()
+        if value is None:
+            self._set_valid(index, False)
+            return
+
+        value_type = type(value)
+        if value_type is float and self._values.typecode == 'q':
+            self._values = array('d', self._values)
+        elif value_type is not float and value_type is not int:
+            self._promote_to_objects()
+            self._values[index] = value
+            return
+
+        try:
+            self._values[index] = value
+        except OverflowError:
+            self._promote_to_objects()
+            self._values[index] = value
+            return
+        self._set_valid(index, True)
+
+    def __delitem__(self, index):
+        values = self.tolist()
+        del values[index]
+        self._load(values, self.typecode if self.typecode != 'O' else None)
+
+    def insert(self, index, value):
+        values = self.tolist()
+        values.insert(index, value)
+        self._load(values, _infer_typecode(values))
+
+    def append(self, value):
+        if isinstance(self._values, list):
+            self._values.append(value)
+            return
+        self._ensure_writable()
+        if self._validity is not None and len(self._values) % 8 == 0:
+            self._validity.append(0xFF)
+        self._values.append(0)
+        self[len(self._values) - 1] = value
+
+    def __iter__(self):
+        if self._validity is None:
+            return iter(self._values)
+        return iter(self.tolist())
+
+    def tolist(self) -> List[Any]:
+        """Materializa a coluna como uma lista Python (visão de compatibilidade)."""
+        if isinstance(self._values, list):
+            return list(self._values)
+        values = self._values.tolist()
+        if self._validity is not None:
+            for index in compress(range(len(values)), self.null_mask()):
+                values[index] = None
+        return values
+
+    def __eq__(self, other):
+        if isinstance(other, (TypedColumn, list)):
+            return self.tolist() == list(other)
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TypedColumn({self.typecode!r}, {self.tolist()!r})"
+
+
+class CategoricalColumn(MutableSequence):
+    """Coluna categórica codificada por dicionário: um código inteiro por linha (buffer 'q')
+    e a tabela de categorias, construídos uma única vez.
+
+    As categorias ficam em ordem crescente quando são comparáveis entre si (a mesma ordem
+    do label encoding), de modo que os códigos já são o label encoding da coluna. None é
+    tratado como uma categoria comum. Frequências são calculadas sobre os códigos
+    (np.bincount quando o NumPy está disponível) e seguem a ordem da tabela de categorias."""
+
+    __slots__ = ('_codes', '_categories', '_lookup', '_ordered')
+
+    def __init__(self, values: Iterable[Any] = ()):
+        values = values if isinstance(values, list) else list(values)
+        categories = list(dict.fromkeys(values))
+        try:
+            categories.sort()
+            ordered = True
+        except TypeError:
+            # Categorias não comparáveis (ex.: None e texto) ficam na ordem de aparição
+            ordered = False
+        self._set_categories(categories, ordered)
+        self._codes = array('q', map(self._lookup.__getitem__, values))
+
+    @classmethod
+    def from_codes(cls, codes: array, categories: List[Any], ordered: bool = False) -> 'CategoricalColumn':
+        """Cria a coluna a partir de códigos e categorias já existentes, sem cópia."""
+        column = cls.__new__(cls)
+        column._set_categories(list(categories), ordered)
+        column._codes = codes
+        return column
+
+    def _set_categories(self, categories: List[Any], ordered: bool):
+        self._categories = categories
+        self._lookup = {category: code for code, category in enumerate(categories)}
+        self._ordered = ordered
+
+    @property
+    def codes(self) -> array:
+        """Buffer de códigos (índices em 'categories'): array ou memoryview somente leitura."""
+        return self._codes
+
+    @property
+    def categories(self) -> List[Any]:
+        return self._categories
+
+    @property
+    def ordered(self) -> bool:
+        """True quando as categorias estão em ordem crescente (códigos = label encoding)."""
+        return self._ordered
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._codes) * self._codes.itemsize
+
+    def _code_for(self, value: Any) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(value)
+            self._lookup[value] = code
+            self._ordered = False
+        return code
+
+    def value_counts(self) -> Counter:
+        """Contagem por categoria em uma passada sobre os códigos (categorias ausentes são omitidas)."""
+        if np is not None and len(self._codes):
+            counts = np.bincount(np.frombuffer(self._codes, dtype=np.int64),
+                                 minlength=len(self._categories)).tolist()
+        else:
+            counts = [0] * len(self._categories)
+            for code, count in Counter(self._codes).items():
+                counts[code] = count
+        return Counter({category: count for category, count in zip(self._categories, counts) if count})
+
+    def recode(self, mapping: Dict[Any, Any], default: Any = None) -> List[Any]:
+        """Traduz cada linha por 'mapping' consultando o dicionário uma vez por categoria,
+        não uma vez por linha. Categorias fora de 'mapping' recebem 'default'."""
+        table = [mapping.get(category, default) for category in self._categories]
+        return list(map(table.__getitem__, self._codes))
+
+    def null_mask(self) -> bytes:
+        """Retorna um byte por linha: 1 se o valor é None, 0 caso contrário."""
+        null_code = self._lookup.get(None)
+        if null_code is None:
+            return bytes(len(self._codes))
+        return bytes(map(null_code.__eq__, self._codes))
+
+    def select(self, row_mask: bytes) -> 'CategoricalColumn':
+        """Retorna as linhas cujo byte na máscara é diferente de zero, mantendo a tabela de categorias."""
+        return CategoricalColumn.from_codes(array('q', compress(self._codes, row_mask)), self._categories,
+                                            self._ordered)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._categories[code] for code in self._codes[index]]
+        return self._categories[self._codes[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = self.tolist()
+            values[index] = value
+            self.__init__(values)
+            return
+        self._ensure_writable()
+        self._codes[index] = self._code_for(value)
+
+    def __delitem__(self, index):
+        self._ensure_writable()
+        del self._codes[index]
+
+    def insert(self, index, value):
+        self._ensure_writable()
+        self._codes.insert(index, self._code_for(value))
+
+    def _ensure_writable(self):
+        """Copia o buffer de códigos somente leitura (ex.: memoryview de um arquivo mapeado) antes de uma escrita."""
+        if isinstance(self._codes, memoryview):
+            self._codes = array('q', self._codes)
+
+    def __contains__(self, value) -> bool:
+        code = self._lookup.get(value)
+        return code is not None and code in self._codes
+
+    def __iter__(self):
+        return map(self._categories.__getitem__, self._codes)
+
+    def tolist(self) -> List[Any]:
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CategoricalColumn({self.tolist()!r})"
+
+
+class ColumnarDataset(MutableMapping):
+    """Dataset colunar: colunas numéricas em buffers tipados e demais colunas como listas.
+
+    Implementa a mesma interface de um Dict[str, List[Any]], podendo ser passado
+    diretamente para Preprocessing, Statistics, Scaler, Encoder e MissingValueProcessor.
+    Colunas atribuídas como listas são convertidas automaticamente. Com categorical=True,
+    colunas não numéricas viram CategoricalColumn (códigos + tabela de categorias)."""
+
+    def __init__(self, dataset: Dict[str, Iterable[Any]] = None, categorical: bool = False):
+        self._columns = {}
+        self.categorical = categorical
+        if dataset:
+            self.update(dataset)
+
+    @classmethod
+    def from_dict(cls, dataset: Dict[str, List[Any]], categorical: bool = False) -> 'ColumnarDataset':
+        return cls(dataset, categorical=categorical)
+
+    def _to_column(self, values):
+        if isinstance(values, (TypedColumn, CategoricalColumn, SparseOneHotColumn)):
+            return values
+        values = values if isinstance(values, list) else list(values)
+        if not values:
+            return values
+        typecode = _infer_typecode(values)
+        if typecode is None:
+            return self._to_categorical(values) if self.categorical else values
+        return TypedColumn(values, typecode)
+
+    @staticmethod
+    def _to_categorical(values: List[Any]):
+        try:
+            return CategoricalColumn(values)
+        except TypeError:
+            # Valores não hasheáveis continuam como lista de objetos
+            return values
+
+    def __getitem__(self, key):
+        return self._columns[key]
+
+    def __setitem__(self, key, values):
+        self._columns[key] = self._to_column(values)
+
+    def __delitem__(self, key):
+        del self._columns[key]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Visão de compatibilidade: materializa todas as colunas como listas."""
+        return {name: (column.tolist() if isinstance(column, TypedColumn) else list(column))
+                for name, column in self._columns.items()}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados pelos buffers tipados e de códigos (colunas de objetos e tabelas de
+        categorias não são contabilizadas)."""
+        return sum(column.nbytes for column in self._columns.values()
+                   if isinstance(column, (TypedColumn, CategoricalColumn)))
+
+    def __repr__(self) -> str:
+        return f"ColumnarDataset({self.to_dict()!r})"
@@ -0,0 +1,247 @@
+import csv
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, count, repeat
+from operator import not_
+from typing import Any, Dict, List, Optional, Tuple
+
+from columnar import ColumnarDataset, TypedColumn
+from parallel import resolve_n_jobs
+
+# Tamanho padrão dos blocos lidos do arquivo (16 MiB)
+DEFAULT_BLOCK_SIZE = 16 * 1024 * 1024
+_BOOLEANS = {'true': True, 'false': False, 'True': True, 'False': False, 'TRUE': True, 'FALSE': False}
+
+
+def parse_value(field: str) -> Any:
+    """Converte um campo de CSV: vazio vira None, depois tenta int, float e por fim texto."""
+    if field == '':
+        return None
+    try:
+        return int(field)
+    except ValueError:
+        pass
+    try:
+        return float(field)
+    except ValueError:
+        return field
+
+
+# Bloco convertido de uma coluna: (tipo, valores, posições nulas relativas ao bloco).
+# O tipo é 'q' ou 'd' (array com 0 nas posições nulas), 'b' (lista de bool/None), 'O'
+# (lista de objetos convertidos campo a campo, como parse_value) ou None (só nulos).
+ColumnBlock = Tuple[Optional[str], Any, List[int]]
+
+
+def _convert_column(fields: List[str]) -> ColumnBlock:
+    """Infere o tipo de uma coluna de um bloco e a converte em lote: map(int)/map(float)
+    rodam em C sobre a coluna inteira, sem testar campo a campo."""
+    nulls = list(compress(count(), map(not_, fields))) if '' in fields else []
+    numeric_fields = fields
+    if nulls:
+        numeric_fields = list(fields)
+        for index in nulls:
+            numeric_fields[index] = '0'
+        if len(nulls) == len(fields):
+            return None, [None] * len(fields), nulls
+
+    try:
+        return 'q', array('q', map(int, numeric_fields)), nulls
+    except (ValueError, OverflowError):
+        pass
+    try:
+        return 'd', array('d', map(float, numeric_fields)), nulls
+    except ValueError:
+        pass
+
+    # Texto costuma repetir valores: cada campo distinto é convertido uma única vez
+    distinct = set(fields)
+    distinct.discard('')
+    if distinct <= _BOOLEANS.keys():
+        return 'b', list(map(_BOOLEANS.get, fields)), nulls
+    parsed = {field: parse_value(field) for field in distinct}
+    parsed[''] = None
+    return 'O', list(map(parsed.__getitem__, fields)), nulls
+
+
+def _split_columns(text: str, width: int, delimiter: str) -> List[List[str]]:
+    """Separa o bloco em colunas de campos (texto). Blocos sem aspas usam um caminho rápido
+    inteiramente em C: as linhas são unidas pelo delimitador, divididas uma única vez e
+    fatiadas por coluna. Os demais passam pelo csv.reader."""
+    # Fora de aspas, '\r\n' é só o fim da linha; dentro delas o csv.reader o preserva
+    if '\r' in text and '"' not in text:
+        text = text.replace('\r\n', '\n')
+    if '"' in text or '\r' in text:
+        # filter(None, ...) descarta linhas em branco sem laço Python
+        rows = list(filter(None, csv.reader(io.StringIO(text, newline=''), delimiter=delimiter)))
+        widths = set(map(len, rows))
+        columns = [list(fields) for fields in zip(*rows)]
+    else:
+        lines = list(filter(None, text.split('\n')))
+        widths = {count + 1 for count in set(map(str.count, lines, repeat(delimiter)))}
+        fields = delimiter.join(lines).split(delimiter) if lines else []
+        columns = [fields[position::width] for position in range(width)] if lines else []
+
+    if widths - {width}:
+        wrong = next(iter(widths - {width}))
+        raise ValueError(f"Uma linha tem {wrong} campos, mas o cabeçalho tem {width}.")
+    return columns
+
+
+def _parse_block(text: str, width: int, delimiter: str) -> List[ColumnBlock]:
+    columns = _split_columns(text, width, delimiter)
+    if not columns:
+        return [(None, [], []) for _ in range(width)]
+    return [_convert_column(fields) for fields in columns]
+
+
+def _cut_position(block: bytes) -> int:
+    """Posição logo após a última quebra de linha do bloco que não está dentro de um campo
+    entre aspas (o número de aspas antes dela é par). Retorna 0 se não houver nenhuma."""
+    position = block.rfind(b'\n')
+    if b'"' not in block:
+        return position + 1
+    while position >= 0:
+        if block.count(b'"', 0, position) % 2 == 0:
+            return position + 1
+        position = block.rfind(b'\n', 0, position)
+    return 0
+
+
+def _read_header(path: str, delimiter: str) -> Tuple[List[str], int]:
+    with open(path, 'rb') as source:
+        line = source.readline()
+        header = next(csv.reader([line.decode('utf-8-sig')], delimiter=delimiter), [])
+        return header, source.tell()
+
+
+def _parse_range(path: str, start: int, end: int, width: int, delimiter: str,
+                 block_size: int) -> List[List[ColumnBlock]]:
+    """Lê o intervalo [start, end) do arquivo em blocos de 'block_size' bytes, cortados
+    em quebras de linha, e converte cada bloco em colunas."""
+    blocks = []
+    with open(path, 'rb') as source:
+        source.seek(start)
+        remaining = end - start
+        pending = b''
+        while remaining > 0 or pending:
+            data = source.read(min(block_size, remaining)) if remaining > 0 else b''
+            remaining -= len(data)
+            block = pending + data
+            if remaining > 0:
+                cut = _cut_position(block)
+                if cut == 0:
+                    # Nenhuma linha completa: continua lendo até encontrar o fim da linha
+                    pending = block
+                    continue
+                block, pending = block[:cut], block[cut:]
+            else:
+                pending = b''
+            if block:
+                blocks.append(_parse_block(block.decode('utf-8'), width, delimiter))
+    return blocks
+
+
+def _byte_ranges(path: str, start: int, parts: int) -> List[Tuple[int, int]]:
+    """Divide o arquivo em até 'parts' intervalos que começam e terminam em quebras de linha."""
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as source:
+        for part in range(1, parts):
+            target = max(start + (size - start) * part // parts, bounds[-1])
+            source.seek(target)
+            source.readline()
+            position = source.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _merge_blocks(blocks: List[ColumnBlock]) -> Tuple[Optional[str], Any, List[int]]:
+    """Concatena os blocos de uma coluna, promovendo o tipo quando eles divergem: inteiros
+    com floats viram floats e qualquer outra combinação vira lista de objetos. Blocos só
+    com nulos (tipo None) não influenciam o tipo da coluna."""
+    kinds = {kind for kind, _, _ in blocks if kind is not None}
+    if not kinds:
+        kind = None
+    elif kinds <= {'q', 'd'}:
+        kind = 'd' if 'd' in kinds else 'q'
+    else:
+        kind = kinds.pop() if len(kinds) == 1 else 'O'
+
+    nulls = []
+    if kind in ('q', 'd'):
+        values = array(kind)
+        for block_kind, block_values, block_nulls in blocks:
+            if block_kind is None:
+                block_values = bytes(len(block_values) * values.itemsize)
+            nulls.extend(map(len(values).__add__, block_nulls))
+            values.extend(block_values if block_kind == kind else array(kind, block_values))
+        return kind, values, nulls
+
+    values = []
+    for _, block_values, block_nulls in blocks:
+        if isinstance(block_values, array):
+            block_values = block_values.tolist()
+            for index in block_nulls:
+                block_values[index] = None
+        values.extend(block_values)
+    return kind, values, nulls
+
+
+def _to_column(kind: Optional[str], values: Any, nulls: List[int], columnar: bool):
+    if kind not in ('q', 'd'):
+        return values
+    validity = None
+    if nulls:
+        validity = bytearray(b'\xff' * ((len(values) + 7) // 8))
+        for index in nulls:
+            validity[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+    column = TypedColumn.from_buffers(values, validity)
+    return column if columnar else column.tolist()
+
+
+def read_csv(path: str, columnar: bool = True, categorical: bool = True, block_size: int = DEFAULT_BLOCK_SIZE,
+             n_jobs: int = 1, delimiter: str = ',') -> Dict[str, List[Any]]:
+    """Lê um CSV com cabeçalho direto para colunas, inferindo o tipo de cada uma.
+
+    O arquivo é lido em blocos de 'block_size' bytes; cada bloco é separado em campos,
+    transposto em colunas e convertido em lote para int ('q'), float ('d'), bool
+    (true/false) ou, se nada disso se aplicar, campo a campo como parse_value (texto).
+    Campos vazios viram None. Com columnar=True o resultado é um ColumnarDataset com
+    TypedColumn (e CategoricalColumn para texto, se 'categorical'); caso contrário, um
+    dicionário de listas.
+
+    Com n_jobs != 1, o arquivo é dividido em intervalos de bytes processados em paralelo
+    (None ou -1 = todos os núcleos). Nesse modo, campos entre aspas não podem conter
+    quebras de linha, pois os intervalos são cortados na quebra de linha mais próxima."""
+    if block_size < 1:
+        raise ValueError("O 'block_size' deve ser positivo.")
+    header, data_start = _read_header(path, delimiter)
+    if not header:
+        return ColumnarDataset(categorical=categorical) if columnar else {}
+    if len(set(header)) != len(header):
+        raise ValueError("O cabeçalho do CSV contém colunas repetidas.")
+
+    jobs = resolve_n_jobs(n_jobs)
+    if jobs == 1:
+        blocks = _parse_range(path, data_start, os.path.getsize(path), len(header), delimiter, block_size)
+    else:
+        ranges = _byte_ranges(path, data_start, jobs)
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(ranges)))) as pool:
+            parts = pool.map(_parse_range, *zip(*((path, start, end, len(header), delimiter, block_size)
+                                                   for start, end in ranges)))
+            blocks = [block for part in parts for block in part]
+
+    # O ColumnarDataset recebe as colunas numéricas já prontas e converte as listas de
+    # texto em CategoricalColumn (com categorical=True)
+    dataset = ColumnarDataset(categorical=categorical) if columnar else {}
+    for position, name in enumerate(header):
+        kind, values, nulls = _merge_blocks([block[position] for block in blocks])
+        dataset[name] = _to_column(kind, values, nulls, columnar)
+    return dataset
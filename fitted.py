@@ -0,0 +1,376 @@
+import hashlib
+import json
+from array import array
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional
+
+from columnar import CategoricalColumn, TypedColumn
+from sparse import SparseOneHotColumn
+
+# Largura padrão da saída do feature hashing
+DEFAULT_HASH_FEATURES = 1024
+
+
+class FillState:
+    """Parâmetro ajustado de fillna: o valor que substitui os None de uma coluna."""
+    kind = 'fillna'
+
+    def __init__(self, column: str, value: Any):
+        self.column = column
+        self.value = value
+
+    def map_value(self, value: Any) -> Any:
+        return self.value if value is None else value
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        column_data[:] = [self.value if value is None else value for value in column_data]
+
+    def transform_record(self, record: Dict[str, Any]):
+        if record.get(self.column) is None:
+            record[self.column] = self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FillState':
+        return cls(data['column'], data['value'])
+
+
+class MinMaxState:
+    """Parâmetros ajustados da normalização Min-Max de uma coluna."""
+    kind = 'minMax'
+
+    def __init__(self, column: str, min_value: float, value_range: float):
+        self.column = column
+        self.min_value = min_value
+        self.value_range = value_range
+
+    @property
+    def offset(self) -> float:
+        return self.min_value
+
+    @property
+    def divisor(self) -> float:
+        return self.value_range
+
+    def map_value(self, value: Any) -> float:
+        if self.value_range == 0:
+            return 0.0
+        return float((value - self.min_value) / self.value_range)
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        column_data[:] = [self.map_value(value) for value in column_data]
+
+    def transform_record(self, record: Dict[str, Any]):
+        if self.column in record:
+            record[self.column] = self.map_value(record[self.column])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'min': self.min_value, 'range': self.value_range}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MinMaxState':
+        return cls(data['column'], data['min'], data['range'])
+
+
+class StandardState:
+    """Parâmetros ajustados da padronização Z-score de uma coluna."""
+    kind = 'standard'
+
+    def __init__(self, column: str, mean: float, std_deviation: float):
+        self.column = column
+        self.mean = mean
+        self.std_deviation = std_deviation
+
+    @property
+    def offset(self) -> float:
+        return self.mean
+
+    @property
+    def divisor(self) -> float:
+        return self.std_deviation
+
+    def map_value(self, value: Any) -> float:
+        if self.std_deviation == 0:
+            return 0.0
+        return float((value - self.mean) / self.std_deviation)
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        column_data[:] = [self.map_value(value) for value in column_data]
+
+    def transform_record(self, record: Dict[str, Any]):
+        if self.column in record:
+            record[self.column] = self.map_value(record[self.column])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'mean': self.mean, 'std': self.std_deviation}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StandardState':
+        return cls(data['column'], data['mean'], data['std'])
+
+
+class LabelState:
+    """Mapeamento ajustado categoria -> inteiro do label encoding (ordem alfabética)."""
+    kind = 'label'
+
+    def __init__(self, column: str, categories: List[Any]):
+        self.column = column
+        self.categories = list(categories)
+        self.mapping = {category: index for index, category in enumerate(self.categories)}
+
+    def map_value(self, value: Any) -> int:
+        try:
+            return self.mapping[value]
+        except KeyError:
+            raise ValueError(f"A categoria '{value}' não foi vista no ajuste da coluna '{self.column}'.") from None
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        if isinstance(column_data, CategoricalColumn):
+            dataset[self.column] = self._transform_categorical(column_data)
+            return
+        dataset[self.column] = [self.map_value(value) for value in column_data]
+
+    def _transform_categorical(self, column_data: CategoricalColumn) -> TypedColumn:
+        # Mesma tabela de categorias em ordem crescente: os códigos já são o label encoding
+        # e a coluna resultante é uma visão do buffer de códigos, sem cópia
+        if column_data.ordered and column_data.categories == self.categories:
+            return TypedColumn.from_buffers(memoryview(column_data.codes))
+        # Caso contrário, o mapeamento é consultado uma vez por categoria, não por linha
+        for category in column_data.value_counts():
+            self.map_value(category)
+        return TypedColumn.from_buffers(array('q', column_data.recode(self.mapping, -1)))
+
+    def transform_record(self, record: Dict[str, Any]):
+        if self.column in record:
+            record[self.column] = self.map_value(record[self.column])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'categories': self.categories}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LabelState':
+        return cls(data['column'], data['categories'])
+
+
+class OneHotState:
+    """Categorias ajustadas do one-hot encoding. Categorias desconhecidas viram linhas só de zeros."""
+    kind = 'oneHot'
+
+    def __init__(self, column: str, categories: List[Any]):
+        self.column = column
+        self.categories = list(categories)
+
+    def output_columns(self) -> List[str]:
+        return [f'{self.column}_{category}' for category in self.categories]
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        if isinstance(column_data, CategoricalColumn):
+            # Compara códigos inteiros em vez dos valores originais
+            lookup = {category: code for code, category in enumerate(column_data.categories)}
+            column_data = column_data.codes
+        else:
+            lookup = None
+        for category, new_column_name in zip(self.categories, self.output_columns()):
+            target = category if lookup is None else lookup.get(category, -1)
+            dataset[new_column_name] = [1 if value == target else 0 for value in column_data]
+        del dataset[self.column]
+
+    def transform_record(self, record: Dict[str, Any]):
+        if self.column not in record:
+            return
+        value = record.pop(self.column)
+        for category, new_column_name in zip(self.categories, self.output_columns()):
+            record[new_column_name] = 1 if value == category else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'categories': self.categories}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'OneHotState':
+        return cls(data['column'], data['categories'])
+
+
+class SparseOneHotState:
+    """Categorias ajustadas do one-hot esparso: a coluna vira um SparseOneHotColumn (um
+    código por linha e o vocabulário). Categorias desconhecidas recebem o código -1."""
+    kind = 'sparseOneHot'
+
+    def __init__(self, column: str, categories: List[Any]):
+        self.column = column
+        self.categories = list(categories)
+        self.mapping = {category: index for index, category in enumerate(self.categories)}
+
+    def output_columns(self) -> List[str]:
+        return [f'{self.column}_{category}' for category in self.categories]
+
+    def map_value(self, value: Any) -> int:
+        return self.mapping.get(value, -1)
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        if isinstance(column_data, CategoricalColumn):
+            codes = array('q', column_data.recode(self.mapping, -1))
+            dataset[self.column] = SparseOneHotColumn(self.column, self.categories, codes)
+            return
+        dataset[self.column] = SparseOneHotColumn.encode(self.column, column_data, self.categories)
+
+    def transform_record(self, record: Dict[str, Any]):
+        if self.column in record:
+            record[self.column] = self.map_value(record[self.column])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'categories': self.categories}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SparseOneHotState':
+        return cls(data['column'], data['categories'])
+
+
+class HashState:
+    """Feature hashing de uma coluna categórica: cada valor vai para um de 'n_features'
+    baldes por um hash estável (BLAKE2b com a semente como chave), sem guardar as
+    categorias vistas. Sementes diferentes produzem colisões independentes.
+
+    O resultado tem o mesmo formato do one-hot esparso (um código por linha), com
+    vocabulário range(n_features); densify() gera as colunas 'coluna_0' ... 'coluna_{n-1}'.
+    Valores nunca vistos no ajuste também são codificados."""
+    kind = 'hash'
+
+    def __init__(self, column: str, n_features: int = DEFAULT_HASH_FEATURES, seed: int = 0):
+        if not isinstance(n_features, int) or n_features < 1:
+            raise ValueError("O 'n_features' deve ser um inteiro positivo.")
+        self.column = column
+        self.n_features = n_features
+        self.seed = seed
+        self._hash_key = (seed & 0xFFFFFFFFFFFFFFFF).to_bytes(8, 'little')
+
+    def map_value(self, value: Any) -> int:
+        # O nome do tipo entra na chave para que 1 e '1' caiam em baldes independentes
+        key = f'{type(value).__name__}:{value}'.encode('utf-8')
+        digest = hashlib.blake2b(key, digest_size=8, key=self._hash_key).digest()
+        return int.from_bytes(digest, 'little') % self.n_features
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        if self.column not in dataset:
+            return
+        column_data = dataset[self.column]
+        if isinstance(column_data, CategoricalColumn):
+            # Cada categoria é calculada uma vez e os códigos da coluna indexam os baldes
+            buckets = list(map(self.map_value, column_data.categories))
+            codes = array('q', map(buckets.__getitem__, column_data.codes))
+        else:
+            codes = array('q', map(self.map_value, column_data))
+        dataset[self.column] = SparseOneHotColumn(self.column, range(self.n_features), codes)
+
+    def transform_record(self, record: Dict[str, Any]):
+        if self.column in record:
+            record[self.column] = self.map_value(record[self.column])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'column': self.column, 'n_features': self.n_features, 'seed': self.seed}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HashState':
+        return cls(data['column'], data['n_features'], data['seed'])
+
+
+class DropState:
+    """Etapa de dropna: remove as linhas (ou descarta o registro) com None nas colunas indicadas."""
+    kind = 'dropna'
+
+    def __init__(self, columns: Optional[Iterable[str]] = None):
+        self.columns = sorted(columns) if columns else []
+
+    def transform(self, dataset: Dict[str, List[Any]]):
+        target_columns = self.columns or list(dataset.keys())
+        if not dataset or not target_columns:
+            return
+        keep = bytes(map(lambda *values: None not in values, *(dataset[column] for column in target_columns)))
+        for column_name in list(dataset.keys()):
+            dataset[column_name] = list(compress(dataset[column_name], keep))
+
+    def transform_record(self, record: Dict[str, Any]) -> bool:
+        """Retorna False quando o registro deve ser descartado."""
+        target_columns = self.columns or list(record.keys())
+        return all(record.get(column) is not None for column in target_columns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'columns': self.columns}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DropState':
+        return cls(data['columns'])
+
+
+_STATE_TYPES = {state_type.kind: state_type
+                for state_type in (FillState, MinMaxState, StandardState, LabelState, OneHotState,
+                                   SparseOneHotState, HashState, DropState)}
+
+
+class FittedPipeline:
+    """Sequência de etapas ajustadas que pode ser salva, carregada e aplicada a novos dados
+    (um dataset inteiro ou um único registro) sem reler os dados de treino."""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, states: List[Any] = None):
+        self.states = list(states or [])
+
+    def transform(self, dataset: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """Aplica as etapas ao dataset (modificando-o) e o retorna."""
+        for state in self.states:
+            state.transform(dataset)
+        return dataset
+
+    def transform_record(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Aplica as etapas a um único registro. Retorna um novo dicionário, ou None se o
+        registro for descartado por uma etapa de dropna."""
+        record = dict(record)
+        for state in self.states:
+            if state.transform_record(record) is False:
+                return None
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'version': self.FORMAT_VERSION, 'steps': [state.to_dict() for state in self.states]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FittedPipeline':
+        if data.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Versão de pipeline não suportada: {data.get('version')!r}.")
+        try:
+            return cls([_STATE_TYPES[step['kind']].from_dict(step) for step in data['steps']])
+        except KeyError as error:
+            raise ValueError(f"Etapa de pipeline inválida: {error}.") from None
+
+    def save(self, path: str):
+        """Serializa o pipeline em um arquivo JSON compacto."""
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(self.to_dict(), handle, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'FittedPipeline':
+        with open(path, encoding='utf-8') as handle:
+            return cls.from_dict(json.load(handle))
+
+    def __len__(self) -> int:
+        return len(self.states)
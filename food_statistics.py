@@ -1,11 +1,51 @@
+from collections import Counter
+from collections.abc import Mapping, MutableSequence
+from functools import wraps
+from itertools import islice
+from operator import mul
+
+from columnar import CategoricalColumn, TypedColumn
+from groupby import GroupBy
+from quantiles import DEFAULT_ERROR, KLLSketch, exact_quantile, validate_quantile
+from result_cache import DEFAULT_CACHE_SIZE, ColumnVersions, ResultCache
+from sparse import SparseOneHotColumn
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele as matrizes são calculadas em Python puro
+    np = None
+
+
+def _cached_result(n_columns=1):
+    """Memoriza o resultado do método no cache LRU de Statistics. Os 'n_columns' primeiros
+    argumentos são nomes de colunas; a chave inclui a versão de cada uma, de modo que
+    modificações registradas ou a troca da lista tornam o resultado obsoleto."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            colunas = args[:n_columns]
+            chave = (method.__name__, args, tuple(sorted(kwargs.items())),
+                     tuple(self._column_signature(coluna) for coluna in colunas))
+            return self._cache.get_or_compute(chave, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
 class Statistics:
+    """Estatísticas descritivas sobre um dataset (dicionário de colunas).
 
-    def __init__(self, dataset):
-        if not isinstance(dataset, dict):
+    Os resultados ficam em um cache LRU de 'cache_size' entradas. A troca da lista de uma
+    coluna e as modificações registradas em 'versions' (compartilhado pelo Preprocessing
+    com os processadores) são detectadas; alterações feitas diretamente dentro de uma
+    lista exigem invalidate(colunas)."""
+
+    def __init__(self, dataset, cache_size=DEFAULT_CACHE_SIZE, versions=None):
+        if not isinstance(dataset, Mapping):
             raise TypeError("O dataset deve ser um dicionário.")
 
         for _, values in dataset.items():
-            if not isinstance(values, list):
+            # Colunas one-hot esparsas (códigos somente leitura) também são aceitas
+            if not isinstance(values, (MutableSequence, SparseOneHotColumn)):
                 raise TypeError("Todos os valores no dicionário do dataset devem ser listas.")
 
         lengths = [len(values) for values in dataset.values()]
@@ -13,12 +53,44 @@ class Statistics:
             raise ValueError("Todas as colunas no dataset devem ter o mesmo tamanho.")
 
         self.dataset = dataset
+        # Resultados por coluna (médias, variâncias, tabelas de frequência, índices de
+        # transição...) em um cache LRU limitado, com chaves que incluem a versão de cada
+        # coluna. 'versions' pode ser compartilhado com quem modifica o mesmo dataset.
+        self.versions = versions if versions is not None else ColumnVersions()
+        self._cache = ResultCache(cache_size)
+        # Última lista vista de cada coluna. A referência impede que o id de uma lista
+        # descartada seja reaproveitado por outra enquanto houver resultados em cache.
+        self._seen_columns = {}
+
+    def invalidate(self, columns=None):
+        """Registra uma modificação nas colunas informadas (ou em todas), tornando obsoletos
+        os resultados em cache que dependem delas.
+
+        Deve ser chamado sempre que o conteúdo de uma coluna for alterado
+        diretamente, sem trocar a lista que a representa. Modificações feitas por
+        Preprocessing e pelos processadores que compartilham 'versions' já são registradas."""
+        self.versions.bump(columns)
+
+    def cache_info(self):
+        """Retorna acertos, faltas, tamanho atual e tamanho máximo do cache de resultados."""
+        return self._cache.info()
+
+    def _column_signature(self, column):
+        valores = self._get_column_data(column)
+        # A troca da lista da coluna conta como modificação, mesmo sem invalidate()
+        anterior = self._seen_columns.get(column)
+        if anterior is not valores:
+            if anterior is not None:
+                self.versions.bump([column])
+            self._seen_columns[column] = valores
+        return column, self.versions.get(column), len(valores)
 
     def _get_column_data(self, column):
         if column not in self.dataset:
             raise KeyError(f"A coluna '{column}' não existe no dataset.")
         return self.dataset[column]
 
+    @_cached_result()
     def mean(self, column):
         valores = self._get_column_data(column)
 
@@ -28,26 +100,40 @@ class Statistics:
         media_aritmetica = sum(valores) / len(valores)
         return float(media_aritmetica)
 
+    @_cached_result()
     def median(self, column):
         valores = self._get_column_data(column)
 
         if not valores:
             return 0.0
 
-        valores_ordenados = sorted(valores)
+        # Seleção em O(n) (quickselect) em vez de ordenar uma cópia da coluna
+        return exact_quantile(valores, 0.5)
 
-        n = len(valores_ordenados)
-        if n % 2 == 0:
-            i = n // 2 - 1
-            mediana = (valores_ordenados[i] + valores_ordenados[i + 1]) / 2
-        else:
-            i = n // 2
-            mediana = valores_ordenados[i]
+    @_cached_result()
+    def quantile(self, column, q, method='exact', error=DEFAULT_ERROR):
+        """Quantil q (entre 0 e 1) da coluna.
+
+        'exact' usa seleção em O(n) com interpolação linear entre as posições vizinhas;
+        'approx' usa um sketch KLL com erro de rank 'error' e memória O(1/error), sem
+        copiar a coluna."""
+        validate_quantile(q)
+        if method not in ['exact', 'approx']:
+            raise ValueError("O 'method' deve ser 'exact' ou 'approx'.")
 
-        return float(mediana)
+        valores = self._get_column_data(column)
+
+        if not valores:
+            return 0.0
+
+        if method == 'exact':
+            return exact_quantile(valores, q)
+        return float(KLLSketch(error).update_many(valores).quantile(q))
 
     def mode(self, column):
-        frequencias = self.absolute_frequency(column)
+        """Valores mais frequentes da coluna. Empates seguem a ordem da primeira aparição de
+        cada valor (em colunas categóricas, a ordem da tabela de categorias)."""
+        frequencias = self._frequency_table(column)
 
         if not frequencias:
             return []
@@ -58,6 +144,15 @@ class Statistics:
 
         return moda
 
+    def groupby(self, by):
+        """Agrupa as linhas pelos valores de 'by' (uma coluna ou uma lista de colunas).
+
+        Retorna um GroupBy: groupby('restaurante').mean('tempo') devolve {restaurante: média},
+        e também median, mode, sum, count e sizes. As linhas são particionadas em uma passada
+        e cada agregação percorre a coluna uma vez, ignorando os valores None. O GroupBy
+        reflete o dataset no momento da chamada; reutilize-o para várias agregações."""
+        return GroupBy(self.dataset, by)
+
     def stdev(self, column):
         variancia = self.variance(column)
 
@@ -65,6 +160,7 @@ class Statistics:
 
         return float(desvio_padrao)
 
+    @_cached_result()
     def variance(self, column):
         valores = self._get_column_data(column)
 
@@ -79,6 +175,7 @@ class Statistics:
 
         return float(variancia)
 
+    @_cached_result(n_columns=2)
     def covariance(self, column_a, column_b):
         valores_a = self._get_column_data(column_a)
         valores_b = self._get_column_data(column_b)
@@ -93,22 +190,86 @@ class Statistics:
 
         return float(soma_produto_desvios / len(valores_a))
 
-    def itemset(self, column):
+    def _numeric_columns(self):
+        return [column for column, valores in self.dataset.items()
+                if valores and set(map(type, valores)) <= {int, float}]
+
+    @staticmethod
+    def _as_matrix(colunas):
+        """Monta a matriz linhas x colunas em float64, ou None se alguma coluna não for
+        puramente numérica (o caminho em Python puro levanta o erro apropriado)."""
+        matriz = np.empty((len(colunas[0]), len(colunas)), dtype=np.float64)
+        for indice, valores in enumerate(colunas):
+            if isinstance(valores, TypedColumn):
+                if valores.typecode not in ('q', 'd') or valores.null_count:
+                    return None
+                matriz[:, indice] = np.frombuffer(valores.values, dtype=np.int64 if valores.typecode == 'q'
+                                                  else np.float64)
+            elif set(map(type, valores)) <= {int, float}:
+                matriz[:, indice] = valores
+            else:
+                return None
+        return matriz
+
+    def covariance_matrix(self, columns=None):
+        """Covariâncias populacionais de todos os pares de colunas, como {coluna: {coluna: cov}}.
+
+        Sem 'columns', usa todas as colunas numéricas. As médias são calculadas uma vez por
+        coluna e os co-momentos de todos os pares saem de uma única passada em lote
+        (X.T @ X com NumPy, quando disponível), em vez de uma chamada a covariance por par."""
+        colunas = self._numeric_columns() if columns is None else list(columns)
+        dados = [self._get_column_data(coluna) for coluna in colunas]
+        n = len(dados[0]) if dados else 0
+
+        if n < 2:
+            return {a: {b: 0.0 for b in colunas} for a in colunas}
+
+        matriz = self._as_matrix(dados) if np is not None else None
+        if matriz is not None:
+            matriz -= matriz.mean(axis=0)
+            covariancias = ((matriz.T @ matriz) / n).tolist()
+        else:
+            desvios = [[item - media for item in valores]
+                       for valores, media in zip(dados, (sum(valores) / n for valores in dados))]
+            covariancias = [[0.0] * len(colunas) for _ in colunas]
+            for i, desvios_a in enumerate(desvios):
+                for j in range(i, len(desvios)):
+                    covariancias[i][j] = covariancias[j][i] = float(sum(map(mul, desvios_a, desvios[j])) / n)
+
+        return {a: dict(zip(colunas, linha)) for a, linha in zip(colunas, covariancias)}
+
+    def correlation_matrix(self, columns=None):
+        """Correlações de Pearson de todos os pares de colunas, derivadas de covariance_matrix.
+        Pares envolvendo uma coluna constante têm correlação 0.0."""
+        covariancias = self.covariance_matrix(columns)
+        desvios = {coluna: covariancias[coluna][coluna] ** 0.5 for coluna in covariancias}
+        return {a: {b: float(cov / (desvios[a] * desvios[b])) if desvios[a] and desvios[b] else 0.0
+                    for b, cov in linha.items()}
+                for a, linha in covariancias.items()}
+
+    @_cached_result()
+    def _frequency_table(self, column):
         valores = self._get_column_data(column)
-        return set(valores)
+
+        # Colunas categóricas são contadas sobre os códigos inteiros; a tabela (e o
+        # desempate de mode) segue a ordem das categorias, não a ordem de aparição.
+        return valores.value_counts() if isinstance(valores, CategoricalColumn) else Counter(valores)
+
+    def itemset(self, column):
+        return set(self._frequency_table(column))
 
     def absolute_frequency(self, column):
-        valores = self._get_column_data(column)
+        tabela = self._frequency_table(column)
 
-        if not valores:
+        if not tabela:
             return {}
 
-        frequencias = {item: valores.count(item) for item in self.itemset(column)}
+        frequencias = dict(tabela)
 
         return frequencias
 
     def relative_frequency(self, column):
-        frequencias_absolutas = self.absolute_frequency(column)
+        frequencias_absolutas = self._frequency_table(column)
 
         if not frequencias_absolutas:
             return {}
@@ -142,17 +303,60 @@ class Statistics:
 
         return frequencia_acumulada
 
-    def conditional_probability(self, column, value1, value2):
+    @_cached_result()
+    def _transition_table(self, column, order=2):
+        """Retorna (transicoes, contextos) da coluna: transicoes[contexto] é um Counter dos
+        valores que seguem o contexto e contextos[contexto] é o número de ocorrências do
+        contexto em qualquer posição. Com order=2 o contexto é um único valor; com ordens
+        maiores, uma tupla com os order - 1 valores anteriores.
+
+        O índice é montado em uma passada e fica no cache de resultados, como as
+        tabelas de frequência."""
+        if not isinstance(order, int) or order < 2:
+            raise ValueError("A ordem dos n-gramas deve ser um inteiro maior ou igual a 2.")
         valores = self._get_column_data(column)
 
-        if len(valores) < 2:
-            return 0.0
+        if order == 2:
+            contextos = self._frequency_table(column)
+            ngramas = Counter(zip(valores, islice(valores, 1, None)))
+        else:
+            valores = list(valores)
+            contextos = Counter(zip(*(islice(valores, i, None) for i in range(order - 1))))
+            ngramas = Counter(((*ngrama[:-1],), ngrama[-1])
+                              for ngrama in zip(*(islice(valores, i, None) for i in range(order))))
+
+        transicoes = {}
+        for (contexto, proximo), contagem in ngramas.items():
+            transicoes.setdefault(contexto, Counter())[proximo] = contagem
 
-        total_ocorrencias_value2 = valores.count(value2)
+        return transicoes, contextos
 
-        sequencia = sum(1 for i in range(len(valores) - 1) if valores[i] == value2 and valores[i + 1] == value1)
+    def conditional_probability(self, column, value1, value2, order=2):
+        """P(próximo = value1 | anterior = value2), a partir do índice de transições da coluna.
+
+        Com order > 2, value2 é a tupla dos order - 1 valores anteriores. Após a primeira
+        consulta, cada chamada custa O(1) até a coluna mudar (troca da lista ou invalidate())."""
+        if len(self._get_column_data(column)) < 2:
+            return 0.0
+
+        transicoes, contextos = self._transition_table(column, order)
+        total_ocorrencias_value2 = contextos.get(value2, 0)
 
         if total_ocorrencias_value2 > 0:
+            sequencia = transicoes.get(value2, {}).get(value1, 0)
             return float(sequencia / total_ocorrencias_value2)
 
-        return 0.0
\ No newline at end of file
+        return 0.0
+
+    def next_item_distribution(self, column, value, order=2):
+        """Distribuição do próximo valor após 'value' (ou após a tupla de order - 1 valores),
+        como {valor: probabilidade}, com o mesmo denominador de conditional_probability.
+
+        Quando o contexto aparece no fim da coluna, essa ocorrência não tem sucessor e as
+        probabilidades somam menos que 1."""
+        if len(self._get_column_data(column)) < 2:
+            return {}
+
+        transicoes, contextos = self._transition_table(column, order)
+        total = contextos.get(value, 0)
+        return {proximo: float(contagem / total) for proximo, contagem in transicoes.get(value, {}).items()}
@@ -0,0 +1,188 @@
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, List, Sequence, Union
+
+from columnar import CategoricalColumn, TypedColumn
+from quantiles import exact_quantile
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele as somas por grupo são feitas em Python puro
+    np = None
+
+# Agregações disponíveis por grupo
+AGGREGATIONS = ('count', 'sum', 'mean', 'median', 'mode')
+# Métodos do fillna por grupo
+FILL_METHODS = ('mean', 'median', 'mode', 'default_value')
+
+
+def key_columns(dataset: Dict[str, List[Any]], by: Union[str, Sequence[str]]) -> List[str]:
+    """Normaliza 'by' para uma lista de colunas, validando que existem no dataset."""
+    columns = [by] if isinstance(by, str) else list(by)
+    if not columns:
+        raise ValueError("Informe ao menos uma coluna para agrupar.")
+    for column in columns:
+        if column not in dataset:
+            raise KeyError(f"A coluna '{column}' não existe no dataset.")
+    return columns
+
+
+class GroupBy:
+    """Partição das linhas de um dataset pelos valores de uma ou mais colunas-chave.
+
+    Cada linha recebe o código (int64) do seu grupo em uma passada de hash sobre a chave;
+    colunas categóricas reaproveitam os próprios códigos. As agregações percorrem a coluna
+    uma única vez, acumulando por código, sem montar um sub-dataset por grupo. Valores None
+    são ignorados nas agregações; None na chave forma um grupo como qualquer outro valor."""
+
+    def __init__(self, dataset: Dict[str, List[Any]], by: Union[str, Sequence[str]]):
+        self.dataset = dataset
+        self.by = key_columns(dataset, by)
+
+        key_column = self.dataset[self.by[0]]
+        if len(self.by) == 1 and isinstance(key_column, CategoricalColumn):
+            # Categorias sem linhas não formam grupos (ver sizes())
+            self.keys = list(key_column.categories)
+            self.codes = key_column.codes
+        else:
+            values = iter(key_column) if len(self.by) == 1 else zip(*(self.dataset[column] for column in self.by))
+            values = list(values)
+            self.keys = list(dict.fromkeys(values))
+            lookup = {key: code for code, key in enumerate(self.keys)}
+            self.codes = array('q', map(lookup.__getitem__, values))
+
+    def _get_column_data(self, column: str):
+        if column not in self.dataset:
+            raise KeyError(f"A coluna '{column}' não existe no dataset.")
+        return self.dataset[column]
+
+    def _counts(self) -> List[int]:
+        if np is not None and len(self.codes):
+            return np.bincount(np.frombuffer(self.codes, dtype=np.int64), minlength=len(self.keys)).tolist()
+        counts = [0] * len(self.keys)
+        for code, count in Counter(self.codes).items():
+            counts[code] = count
+        return counts
+
+    def _by_key(self, per_code: List[Any]) -> Dict[Any, Any]:
+        """Traduz um resultado indexado por código para {chave: valor}, só com grupos que têm linhas."""
+        return {key: value for key, value, count in zip(self.keys, per_code, self._counts()) if count}
+
+    def sizes(self) -> Dict[Any, int]:
+        """Número de linhas de cada grupo."""
+        return self._by_key(self._counts())
+
+    def indices(self) -> Dict[Any, array]:
+        """Índices das linhas de cada grupo (array 'q')."""
+        groups = [array('q') for _ in self.keys]
+        for index, code in enumerate(self.codes):
+            groups[code].append(index)
+        return self._by_key(groups)
+
+    def _sums(self, column: str, numeric_only: bool = False):
+        """Soma e contagem dos valores não nulos de cada grupo, indexadas por código."""
+        column_data = self._get_column_data(column)
+        if np is not None and isinstance(column_data, TypedColumn) and column_data.typecode in ('q', 'd') \
+                and len(column_data):
+            codes = np.frombuffer(self.codes, dtype=np.int64)
+            values = np.frombuffer(column_data.values, dtype=np.int64 if column_data.typecode == 'q' else np.float64)
+            if column_data.null_count:
+                valid = np.frombuffer(column_data.null_mask(), dtype=np.uint8) == 0
+                codes, values = codes[valid], values[valid]
+            counts = np.bincount(codes, minlength=len(self.keys)).tolist()
+            if column_data.typecode == 'q':
+                # Inteiros são somados em int64 (bincount somaria em float64)
+                sums = np.zeros(len(self.keys), dtype=np.int64)
+                np.add.at(sums, codes, values)
+                return sums.tolist(), counts
+            return np.bincount(codes, weights=values, minlength=len(self.keys)).tolist(), counts
+
+        sums = [0] * len(self.keys)
+        counts = [0] * len(self.keys)
+        for code, value in zip(self.codes, column_data):
+            if value is None or (numeric_only and not isinstance(value, (int, float))):
+                continue
+            sums[code] += value
+            counts[code] += 1
+        return sums, counts
+
+    def _buckets(self, column: str, numeric_only: bool = False) -> List[List[Any]]:
+        """Valores não nulos de cada grupo, indexados por código."""
+        buckets = [[] for _ in self.keys]
+        for code, value in zip(self.codes, self._get_column_data(column)):
+            if value is None or (numeric_only and not isinstance(value, (int, float))):
+                continue
+            buckets[code].append(value)
+        return buckets
+
+    def aggregate_codes(self, column: str, method: str, numeric_only: bool = False) -> List[Any]:
+        """Agrega a coluna por grupo e retorna uma lista indexada pelo código do grupo. Grupos
+        sem valores recebem None (ou [] no 'mode'). Com numeric_only=True, valores não
+        numéricos são ignorados, como no fillna."""
+        if method == 'count':
+            return self._sums(column, numeric_only)[1]
+        if method in ('sum', 'mean'):
+            sums, counts = self._sums(column, numeric_only)
+            if method == 'sum':
+                return sums
+            return [float(total / count) if count else None for total, count in zip(sums, counts)]
+        if method == 'median':
+            return [exact_quantile(values, 0.5) if values else None
+                    for values in self._buckets(column, numeric_only)]
+        if method == 'mode':
+            modes = []
+            for values in self._buckets(column, numeric_only):
+                frequencies = Counter(values)
+                top = max(frequencies.values(), default=0)
+                modes.append([value for value, frequency in frequencies.items() if frequency == top])
+            return modes
+        raise ValueError(f"Agregação '{method}' não suportada. Use: {', '.join(map(repr, AGGREGATIONS))}")
+
+    def aggregate(self, column: str, method: str) -> Dict[Any, Any]:
+        """Agrega a coluna por grupo: {chave: valor}."""
+        return self._by_key(self.aggregate_codes(column, method))
+
+    def count(self, column: str) -> Dict[Any, int]:
+        return self.aggregate(column, 'count')
+
+    def sum(self, column: str) -> Dict[Any, Any]:
+        return self.aggregate(column, 'sum')
+
+    def mean(self, column: str) -> Dict[Any, float]:
+        return self.aggregate(column, 'mean')
+
+    def median(self, column: str) -> Dict[Any, float]:
+        return self.aggregate(column, 'median')
+
+    def mode(self, column: str) -> Dict[Any, List[Any]]:
+        return self.aggregate(column, 'mode')
+
+    def fill_values(self, column: str, null_mask: bytes, fills: List[Any], default_value: Any = None):
+        """Percorre apenas as posições nulas da coluna (segundo 'null_mask') e grava o valor
+        do grupo de cada linha ('fills', indexado por código; None usa 'default_value')."""
+        column_data = self.dataset[column]
+        for index in compress(range(len(column_data)), null_mask):
+            value = fills[self.codes[index]]
+            column_data[index] = default_value if value is None else value
+
+
+class GroupedPreprocessing:
+    """Operações do Preprocessing aplicadas grupo a grupo (ver Preprocessing.groupby)."""
+
+    def __init__(self, preprocessing, by: Union[str, Sequence[str]]):
+        self.preprocessing = preprocessing
+        self.by = key_columns(preprocessing.dataset, by)
+
+    def fillna(self, columns=None, method: str = 'mean', default_value: Any = 0):
+        """Preenche os nulos de cada linha com a estatística ('mean', 'median', 'mode' ou
+        'default_value') calculada sobre o grupo da linha. Grupos sem valores usam
+        'default_value'. As colunas-chave não são preenchidas. Retorna o Preprocessing."""
+        if method not in FILL_METHODS:
+            raise ValueError(f"Método '{method}' não suportado. Use: {', '.join(map(repr, FILL_METHODS))}")
+        preprocessing = self.preprocessing
+        group = GroupBy(preprocessing.dataset, self.by)
+        preprocessing._instrumented(
+            'fillna', columns, {'method': method, 'by': self.by},
+            lambda target: preprocessing.missing_values.fillna_by_group(group, target, method, default_value))
+        return preprocessing
@@ -0,0 +1,304 @@
+import heapq
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from itertools import combinations
+
+from quantiles import KLLSketch, validate_quantile
+
+
+class _ColumnAccumulator:
+    """Estado acumulado de uma coluna: contagem, média/M2 (Welford/Chan), frequências,
+    bigramas consecutivos e, opcionalmente, duas heaps para a mediana e um sketch de quantis."""
+
+    def __init__(self, track_median, sketch_error=None):
+        self.count = 0
+        self.numeric = True
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.frequencies = Counter()
+        self.bigrams = Counter()
+        self.first = None
+        self.last = None
+        self.track_median = track_median
+        self.lower = []  # max-heap (valores negados) com a metade inferior
+        self.upper = []  # min-heap com a metade superior
+        self.sketch = KLLSketch(sketch_error) if sketch_error else None
+
+    def append(self, valores):
+        if not valores:
+            return
+
+        if self.numeric and not all(isinstance(item, (int, float)) for item in valores):
+            self.numeric = False
+            self.lower, self.upper = [], []
+            self.sketch = None
+
+        if self.numeric:
+            media_lote = sum(valores) / len(valores)
+            m2_lote = sum((item - media_lote) ** 2 for item in valores)
+            self._merge_moments(len(valores), media_lote, m2_lote)
+            if self.track_median:
+                for item in valores:
+                    self._push_median(item)
+            if self.sketch is not None:
+                self.sketch.update_many(valores)
+
+        self.frequencies.update(valores)
+        if self.count:
+            self.bigrams[(self.last, valores[0])] += 1
+        else:
+            self.first = valores[0]
+        self.bigrams.update(zip(valores, valores[1:]))
+        self.last = valores[-1]
+        self.count += len(valores)
+
+    def _merge_moments(self, n, media, m2):
+        total = self.count + n
+        delta = media - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+
+    def _push_median(self, item):
+        if self.lower and item > -self.lower[0]:
+            heapq.heappush(self.upper, item)
+        else:
+            heapq.heappush(self.lower, -item)
+        if len(self.lower) > len(self.upper) + 1:
+            heapq.heappush(self.upper, -heapq.heappop(self.lower))
+        elif len(self.upper) > len(self.lower):
+            heapq.heappush(self.lower, -heapq.heappop(self.upper))
+
+    def merge(self, other):
+        if not other.count:
+            return
+        if not self.count:
+            self.first = other.first
+        else:
+            self.bigrams[(self.last, other.first)] += 1
+        self.last = other.last
+
+        self.numeric = self.numeric and other.numeric
+        if self.numeric:
+            self._merge_moments(other.count, other.mean, other.m2)
+            if self.track_median and other.track_median:
+                for item in other.lower:
+                    self._push_median(-item)
+                for item in other.upper:
+                    self._push_median(item)
+            else:
+                self.track_median = False
+                self.lower, self.upper = [], []
+            if self.sketch is not None and other.sketch is not None:
+                self.sketch.merge(other.sketch)
+            else:
+                self.sketch = None
+        else:
+            self.lower, self.upper = [], []
+            self.sketch = None
+
+        self.frequencies.update(other.frequencies)
+        self.bigrams.update(other.bigrams)
+        self.count += other.count
+
+
+class IncrementalStatistics:
+    """Versão incremental de Statistics para datasets que crescem por lotes (append-only).
+
+    Mantém, por coluna, contagem, média e M2 (combinação de Welford/Chan), frequências,
+    bigramas consecutivos e co-momentos entre todos os pares de colunas numéricas. Após
+    append(lote) ou merge(outro), as consultas respondem em O(1) (ou O(k) para as
+    frequências), com a mesma semântica de Statistics sobre os dados concatenados.
+
+    A mediana é mantida com duas heaps (O(log n) por valor inserido); passe
+    track_median=False para não guardar os valores. Com sketch_error (ex.: 0.01), cada
+    coluna numérica mantém também um sketch KLL combinável, usado por quantile() e, sem
+    as heaps, por median(), com memória O(1/sketch_error)."""
+
+    def __init__(self, dataset=None, track_median=True, sketch_error=None):
+        self.track_median = track_median
+        self.sketch_error = sketch_error
+        self._columns = {}
+        self._comoments = {}
+        if dataset is not None:
+            self.append(dataset)
+
+    def _validate_batch(self, batch):
+        if not isinstance(batch, Mapping):
+            raise TypeError("O dataset deve ser um dicionário.")
+        for _, values in batch.items():
+            if not isinstance(values, Sequence) or isinstance(values, (str, bytes)):
+                raise TypeError("Todos os valores no dicionário do dataset devem ser listas.")
+        lengths = [len(values) for values in batch.values()]
+        if len(set(lengths)) > 1:
+            raise ValueError("Todas as colunas no dataset devem ter o mesmo tamanho.")
+        if self._columns and set(batch) != set(self._columns):
+            raise ValueError("O lote deve conter exatamente as mesmas colunas dos lotes anteriores.")
+
+    def append(self, batch):
+        """Absorve um lote de linhas (dicionário de listas) ao final dos dados acumulados."""
+        self._validate_batch(batch)
+        if not self._columns:
+            self._columns = {column: _ColumnAccumulator(self.track_median, self.sketch_error) for column in batch}
+            self._comoments = {pair: 0.0 for pair in combinations(batch, 2)}
+
+        lote = {column: list(values) for column, values in batch.items()}
+        if not lote or not len(next(iter(lote.values()))):
+            return self
+
+        anterior = {column: (acc.count, acc.mean) for column, acc in self._columns.items()}
+        for column, acc in self._columns.items():
+            acc.append(lote[column])
+
+        n_lote = len(next(iter(lote.values())))
+        for pair in list(self._comoments):
+            column_a, column_b = pair
+            if not (self._columns[column_a].numeric and self._columns[column_b].numeric):
+                del self._comoments[pair]
+                continue
+            valores_a, valores_b = lote[column_a], lote[column_b]
+            media_a = sum(valores_a) / n_lote
+            media_b = sum(valores_b) / n_lote
+            comomento_lote = sum((x - media_a) * (y - media_b) for x, y in zip(valores_a, valores_b))
+            n_anterior, media_anterior_a = anterior[column_a]
+            _, media_anterior_b = anterior[column_b]
+            self._comoments[pair] += comomento_lote + (media_a - media_anterior_a) * (media_b - media_anterior_b) \
+                * n_anterior * n_lote / (n_anterior + n_lote)
+        return self
+
+    def merge(self, other):
+        """Combina outro IncrementalStatistics, como se os dados dele viessem depois dos deste."""
+        if not other._columns:
+            return self
+        if not self._columns:
+            self._columns = {column: _ColumnAccumulator(self.track_median, self.sketch_error) for column in other._columns}
+            self._comoments = {pair: 0.0 for pair in combinations(other._columns, 2)}
+        if set(self._columns) != set(other._columns):
+            raise ValueError("As estatísticas combinadas devem ter as mesmas colunas.")
+
+        anterior = {column: (acc.count, acc.mean) for column, acc in self._columns.items()}
+        for column, acc in self._columns.items():
+            acc.merge(other._columns[column])
+
+        for pair in list(self._comoments):
+            column_a, column_b = pair
+            outro = other._comoments.get(pair)
+            if outro is None:
+                outro = other._comoments.get((column_b, column_a))
+            if outro is None or not (self._columns[column_a].numeric and self._columns[column_b].numeric):
+                del self._comoments[pair]
+                continue
+            n_a, media_a = anterior[column_a]
+            _, media_b = anterior[column_b]
+            n_b = other._columns[column_a].count
+            if not n_b:
+                continue
+            delta_a = other._columns[column_a].mean - media_a
+            delta_b = other._columns[column_b].mean - media_b
+            self._comoments[pair] += outro + delta_a * delta_b * n_a * n_b / (n_a + n_b)
+        return self
+
+    def _get_column(self, column):
+        if column not in self._columns:
+            raise KeyError(f"A coluna '{column}' não existe no dataset.")
+        return self._columns[column]
+
+    def _get_numeric_column(self, column):
+        acc = self._get_column(column)
+        if acc.count and not acc.numeric:
+            raise TypeError(f"A coluna '{column}' não é numérica.")
+        return acc
+
+    def __len__(self):
+        return next(iter(self._columns.values())).count if self._columns else 0
+
+    def mean(self, column):
+        acc = self._get_numeric_column(column)
+        if not acc.count:
+            return 0.0
+        return float(acc.mean)
+
+    def median(self, column):
+        acc = self._get_numeric_column(column)
+        if not acc.count:
+            return 0.0
+        if not acc.track_median:
+            if acc.sketch is not None:
+                return float(acc.sketch.median())
+            raise ValueError("A mediana não é mantida; crie o objeto com track_median=True ou sketch_error.")
+        if len(acc.lower) == len(acc.upper):
+            return float((-acc.lower[0] + acc.upper[0]) / 2)
+        return float(-acc.lower[0])
+
+    def quantile(self, column, q):
+        """Quantil aproximado pelo sketch KLL da coluna (requer sketch_error)."""
+        validate_quantile(q)
+        acc = self._get_numeric_column(column)
+        if not acc.count:
+            return 0.0
+        if acc.sketch is None:
+            raise ValueError("Os quantis não são mantidos; crie o objeto com sketch_error.")
+        return float(acc.sketch.quantile(q))
+
+    def variance(self, column):
+        acc = self._get_numeric_column(column)
+        if not acc.count:
+            return 0.0
+        return float(acc.m2 / acc.count)
+
+    def stdev(self, column):
+        return float(self.variance(column) ** 0.5)
+
+    def covariance(self, column_a, column_b):
+        acc_a = self._get_numeric_column(column_a)
+        self._get_numeric_column(column_b)
+        if acc_a.count < 2:
+            return 0.0
+        if column_a == column_b:
+            return float(acc_a.m2 / acc_a.count)
+        comomento = self._comoments.get((column_a, column_b))
+        if comomento is None:
+            comomento = self._comoments[(column_b, column_a)]
+        return float(comomento / acc_a.count)
+
+    def itemset(self, column):
+        return set(self._get_column(column).frequencies)
+
+    def absolute_frequency(self, column):
+        return dict(self._get_column(column).frequencies)
+
+    def relative_frequency(self, column):
+        acc = self._get_column(column)
+        if not acc.count:
+            return {}
+        return {item: freq / acc.count for item, freq in acc.frequencies.items()}
+
+    def cumulative_frequency(self, column, frequency_method='absolute'):
+        if frequency_method not in ['absolute', 'relative']:
+            raise ValueError("O 'frequency_method' deve ser 'absolute' ou 'relative'.")
+        if frequency_method == 'absolute':
+            frequencias = self.absolute_frequency(column)
+        else:
+            frequencias = self.relative_frequency(column)
+
+        frequencia_acumulada = {}
+        acumulado = 0
+        for item in sorted(frequencias.keys()):
+            acumulado += frequencias[item]
+            frequencia_acumulada[item] = acumulado
+        return frequencia_acumulada
+
+    def mode(self, column):
+        frequencias = self._get_column(column).frequencies
+        if not frequencias:
+            return []
+        maior_frequencia = max(frequencias.values())
+        return [item for item, freq in frequencias.items() if freq == maior_frequencia]
+
+    def conditional_probability(self, column, value1, value2):
+        acc = self._get_column(column)
+        if acc.count < 2:
+            return 0.0
+        total_ocorrencias_value2 = acc.frequencies[value2]
+        if total_ocorrencias_value2 > 0:
+            return float(acc.bigrams[(value2, value1)] / total_ocorrencias_value2)
+        return 0.0
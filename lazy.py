@@ -0,0 +1,214 @@
+from typing import Any, List, Set
+
+from fitted import DEFAULT_HASH_FEATURES, DropState, FittedPipeline
+
+FILL_METHODS = ('mean', 'median', 'approx_median', 'mode', 'default_value')
+SCALE_METHODS = ('minMax', 'standard')
+ENCODE_METHODS = ('label', 'oneHot', 'sparseOneHot', 'hash')
+
+
+class _Stage:
+    """Um estágio do plano: uma operação isolada ou um fillna+scale fundido."""
+
+    def __init__(self, operation: str, columns: Set[str], params: dict):
+        self.operation = operation
+        self.columns = columns
+        self.params = params
+
+    def describe(self) -> str:
+        columns = sorted(self.columns) if self.columns else 'todas'
+        if self.operation == 'fillna+scale':
+            return (f"fillna+scale [fundido] colunas={columns} "
+                    f"fillna(method={self.params['fill_method']!r}) -> scale(method={self.params['scale_method']!r})")
+        params = ', '.join(f"{key}={value!r}" for key, value in self.params.items())
+        return f"{self.operation} colunas={columns} ({params})"
+
+
+class LazyPreprocessing:
+    """Modo preguiçoso do Preprocessing: registra as operações encadeadas como um plano,
+    funde etapas compatíveis e só executa tudo em collect().
+
+    A fusão atual combina um fillna seguido de um scale sobre as mesmas colunas em uma
+    única passada de escrita por coluna, reaproveitando as estatísticas calculadas para
+    o preenchimento (média, contagem e variância dos valores não nulos) no escalonamento."""
+
+    def __init__(self, preprocessing):
+        self._preprocessing = preprocessing
+        self._steps: List[_Stage] = []
+
+    def fillna(self, columns: Set[str] = None, method: str = 'mean', default_value: Any = 0):
+        """Registra um fillna no plano. Retorna 'self' para permitir encadeamento de métodos."""
+        if method not in FILL_METHODS:
+            raise ValueError(f"Método '{method}' não suportado. Use: 'mean', 'median', 'approx_median', 'mode', 'default_value'")
+        self._steps.append(_Stage('fillna', columns, {'method': method, 'default_value': default_value}))
+        return self
+
+    def dropna(self, columns: Set[str] = None):
+        """Registra um dropna no plano. Retorna 'self' para permitir encadeamento de métodos."""
+        self._steps.append(_Stage('dropna', columns, {}))
+        return self
+
+    def scale(self, columns: Set[str] = None, method: str = 'minMax'):
+        """Registra um scale no plano. Retorna 'self' para permitir encadeamento de métodos."""
+        if method not in SCALE_METHODS:
+            raise ValueError(f"Método de escalonamento '{method}' não suportado. Use 'minMax' ou 'standard'.")
+        self._steps.append(_Stage('scale', columns, {'method': method}))
+        return self
+
+    def encode(self, columns: Set[str], method: str = 'label', n_features: int = DEFAULT_HASH_FEATURES,
+               seed: int = 0):
+        """Registra um encode no plano. Retorna 'self' para permitir encadeamento de métodos."""
+        if method not in ENCODE_METHODS:
+            raise ValueError(f"Método de codificação '{method}' não suportado. Use 'label', 'oneHot', 'sparseOneHot' ou 'hash'.")
+        params = {'method': method}
+        if method == 'hash':
+            params.update(n_features=n_features, seed=seed)
+        self._steps.append(_Stage('encode', columns, params))
+        return self
+
+    def _optimize(self) -> List[_Stage]:
+        """Gera os estágios de execução, fundindo fillna -> scale sobre as mesmas colunas."""
+        stages = []
+        index = 0
+        while index < len(self._steps):
+            step = self._steps[index]
+            following = self._steps[index + 1] if index + 1 < len(self._steps) else None
+            if (step.operation == 'fillna' and following is not None and following.operation == 'scale'
+                    and set(step.columns or ()) == set(following.columns or ())):
+                stages.append(_Stage('fillna+scale', step.columns, {
+                    'fill_method': step.params['method'],
+                    'default_value': step.params['default_value'],
+                    'scale_method': following.params['method'],
+                }))
+                index += 2
+                continue
+            stages.append(step)
+            index += 1
+        return stages
+
+    def explain(self) -> str:
+        """Descreve o plano otimizado, indicando os estágios fundidos."""
+        stages = self._optimize()
+        lines = [f"Plano de execução ({len(stages)} estágio(s)):"]
+        for position, stage in enumerate(stages, start=1):
+            lines.append(f"  {position}. {stage.describe()}")
+        return '\n'.join(lines)
+
+    def collect(self):
+        """Executa o plano sobre o dataset e retorna o Preprocessing de origem."""
+        preprocessing = self._preprocessing
+        for stage in self._optimize():
+            if stage.operation == 'fillna':
+                preprocessing.fillna(columns=stage.columns, **stage.params)
+            elif stage.operation == 'dropna':
+                preprocessing.dropna(columns=stage.columns)
+            elif stage.operation == 'scale':
+                preprocessing.scale(columns=stage.columns, **stage.params)
+            elif stage.operation == 'encode':
+                preprocessing.encode(columns=stage.columns, **stage.params)
+            else:
+                self._run_fill_and_scale(stage)
+        self._steps = []
+        return preprocessing
+
+    def fit(self) -> FittedPipeline:
+        """Executa o plano etapa a etapa (sem fusão) separando ajuste e transformação, e
+        retorna o FittedPipeline com os parâmetros ajustados, para reaplicá-los a novos
+        dados ou a registros individuais sem reler os dados de treino."""
+        preprocessing = self._preprocessing
+        states = []
+        for step in self._steps:
+            if step.operation == 'fillna':
+                fitted = preprocessing.missing_values.fit(columns=step.columns, **step.params)
+                preprocessing.missing_values.transform(fitted)
+            elif step.operation == 'dropna':
+                fitted = [DropState(step.columns)]
+                preprocessing.missing_values.dropna(columns=step.columns)
+            elif step.operation == 'scale':
+                fitted = preprocessing.scaler.fit(columns=step.columns, **step.params)
+                preprocessing.scaler.transform(fitted)
+            else:
+                fitted = preprocessing.encoder.fit(columns=step.columns, **step.params)
+                preprocessing.encoder.transform(fitted)
+            states.extend(fitted)
+        preprocessing.statistics.invalidate()
+        self._steps = []
+        return FittedPipeline(states)
+
+    def _run_fill_and_scale(self, stage: _Stage):
+        preprocessing = self._preprocessing
+        dataset = preprocessing.dataset
+        target_columns = list(stage.columns) if stage.columns else list(dataset.keys())
+
+        instrumentation = preprocessing.instrumentation
+        for column_name in target_columns:
+            if column_name not in dataset:
+                continue
+            if instrumentation.enabled:
+                params = {'fill_method': stage.params['fill_method'], 'scale_method': stage.params['scale_method']}
+                with instrumentation.span('fillna+scale', dataset, column_name, params):
+                    self._fill_and_scale(column_name, stage)
+            else:
+                self._fill_and_scale(column_name, stage)
+        preprocessing.statistics.invalidate(stage.columns or None)
+
+    def _fill_and_scale(self, column_name: str, stage: _Stage):
+        preprocessing = self._preprocessing
+        if not _fill_and_scale_column(preprocessing.missing_values, column_name, **stage.params):
+            # Colunas não puramente numéricas seguem o caminho passo a passo
+            preprocessing.missing_values.fillna(columns={column_name}, method=stage.params['fill_method'],
+                                                default_value=stage.params['default_value'])
+            if stage.params['scale_method'] == 'minMax':
+                preprocessing.scaler.minMax_scaler(columns={column_name})
+            else:
+                preprocessing.scaler.standard_scaler(columns={column_name})
+
+
+def _fill_and_scale_column(missing_values, column_name: str, fill_method: str, default_value: Any,
+                           scale_method: str) -> bool:
+    """Preenche e escala uma coluna numérica em uma única passada de escrita.
+
+    As estatísticas do escalonamento são derivadas das estatísticas dos valores não nulos
+    e do valor de preenchimento, sem reler a coluna preenchida. Retorna False quando a
+    coluna não é puramente numérica (ou o preenchimento não é numérico)."""
+    column_data = missing_values.dataset[column_name]
+    if not column_data:
+        return True
+    if not set(map(type, column_data)) <= {int, float, type(None)}:
+        return False
+
+    present = [value for value in column_data if value is not None]
+    present_mean = float(sum(present) / len(present)) if present else 0.0
+    if fill_method == 'mean' and present:
+        fill_value = present_mean
+    else:
+        fill_value = missing_values._compute_fill_value(column_name, fill_method, default_value)
+    if type(fill_value) not in (int, float):
+        return False
+
+    total = len(column_data)
+    missing = total - len(present)
+
+    if scale_method == 'minMax':
+        candidates = present + [fill_value] if missing else present
+        offset = min(candidates)
+        divisor = max(candidates) - offset
+    else:
+        # Combinação das estatísticas dos presentes com as 'missing' cópias do preenchimento
+        present_m2 = sum((value - present_mean) ** 2 for value in present)
+        delta = fill_value - present_mean
+        offset = present_mean + delta * missing / total
+        m2 = present_m2 + delta ** 2 * len(present) * missing / total
+        divisor = (m2 / total) ** 0.5
+
+    if divisor == 0:
+        for index in range(total):
+            column_data[index] = 0.0
+        return True
+
+    for index in range(total):
+        value = column_data[index]
+        if value is None:
+            value = fill_value
+        column_data[index] = float((value - offset) / divisor)
+    return True
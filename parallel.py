@@ -0,0 +1,216 @@
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import compress, repeat
+from multiprocessing import shared_memory
+from operator import is_
+from typing import Any, Dict, List, Optional, Tuple
+
+from columnar import TypedColumn
+from fitted import FillState
+
+_NONE_TYPE = type(None)
+_TYPECODES = {frozenset({int}): 'q', frozenset({float}): 'd'}
+
+
+def resolve_n_jobs(n_jobs: Optional[int]) -> int:
+    """Converte o parâmetro n_jobs em um número de processos (None ou -1 = todos os núcleos)."""
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise ValueError("O parâmetro 'n_jobs' deve ser um inteiro positivo, -1 ou None.")
+    return n_jobs
+
+
+def _column_buffers(column) -> Optional[Tuple[Any, Optional[bytes], str]]:
+    """Retorna (buffer de valores, bitmap de validade, typecode) de uma coluna numérica,
+    ou None quando a coluna deve seguir pelo caminho serial (vazia, mista ou não numérica)."""
+    if not column:
+        return None
+    if isinstance(column, TypedColumn):
+        if column.typecode not in ('q', 'd'):
+            return None
+        # Um bitmap sem nulos (ex.: após fillna) não precisa ser compartilhado
+        return column.values, column.validity if column.null_count else None, column.typecode
+
+    value_types = set(map(type, column))
+    value_types.discard(_NONE_TYPE)
+    typecode = _TYPECODES.get(frozenset(value_types))
+    if typecode is None:
+        return None
+
+    null_mask = bytes(map(is_, column, repeat(None)))
+    validity = None
+    if 1 in null_mask:
+        values = list(column)
+        validity = bytearray(b'\xff' * ((len(values) + 7) // 8))
+        for index in compress(range(len(values)), null_mask):
+            values[index] = 0
+            validity[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+    else:
+        values = column
+    try:
+        return array(typecode, values), validity, typecode
+    except OverflowError:
+        return None
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Abre um bloco de memória compartilhada criado pelo processo principal. Quem o criou
+    é o responsável por liberá-lo (track=False existe a partir do Python 3.13)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _read_buffer(shm: shared_memory.SharedMemory, length: int, typecode: str) -> array:
+    """Copia os valores gravados pelo processo de trabalho para um array próprio."""
+    buffer = array(typecode)
+    buffer.frombytes(shm.buf[:length * 8])
+    return buffer
+
+
+def _run_column_task(column_name: str, shm_name: str, length: int, typecode: str, has_nulls: bool,
+                     operation: str, params: tuple) -> Any:
+    """Executado no processo de trabalho: remonta a coluna sobre a memória compartilhada
+    e aplica o mesmo código do caminho serial.
+
+    Para 'fillna' retorna (valor de preenchimento, typecode da coluna preenchida gravada
+    no bloco, ou None se ela deixou de ser numérica); para 'scale' grava a coluna
+    escalonada (float64) no próprio bloco compartilhado."""
+    from preprocessing import MissingValueProcessor, Scaler
+
+    shm = _attach(shm_name)
+    data_size = length * 8
+    values = shm.buf[:data_size].cast(typecode)
+    validity = shm.buf[data_size:data_size + (length + 7) // 8] if has_nulls else None
+    dataset = None
+    try:
+        dataset = {column_name: TypedColumn.from_buffers(values, validity)}
+        if operation == 'fillna':
+            missing_values = MissingValueProcessor(dataset)
+            fill_value = missing_values._compute_fill_value(column_name, *params)
+            missing_values.transform([FillState(column_name, fill_value)])
+            result = dataset.pop(column_name)
+            if result.typecode not in ('q', 'd'):
+                # Preenchimento não numérico: o processo principal aplica o valor
+                return fill_value, None
+            shm.buf[:data_size] = memoryview(result.values).cast('B')
+            return fill_value, result.typecode
+
+        method, = params
+        scaler = Scaler(dataset)
+        if method == 'minMax':
+            scaler.minMax_scaler(columns={column_name})
+        else:
+            scaler.standard_scaler(columns={column_name})
+        result = dataset.pop(column_name)
+        scaled = result.values if result.typecode == 'd' else array('d', result.values)
+        shm.buf[:data_size] = memoryview(scaled).cast('B')
+        return None
+    finally:
+        del dataset
+        values.release()
+        if validity is not None:
+            validity.release()
+        shm.close()
+
+
+class ColumnPool:
+    """Distribui o trabalho independente de cada coluna (fillna e scale) entre processos.
+
+    Os buffers das colunas numéricas são copiados uma única vez para blocos de memória
+    compartilhada (8 bytes por célula e um bitmap de validade), e os processos de trabalho
+    os leem e escrevem diretamente, sem serializar os valores com pickle. Cada processo
+    executa o mesmo código do caminho serial, de modo que os resultados são idênticos.
+
+    Colunas não elegíveis (vazias, não numéricas ou com tipos mistos) são devolvidas ao
+    chamador para seguirem pelo caminho serial. Sem 'executor', um ProcessPoolExecutor
+    com 'n_jobs' processos é criado a cada operação; passe um executor próprio para
+    reaproveitar os processos entre chamadas."""
+
+    def __init__(self, n_jobs: Optional[int] = None, executor: Executor = None):
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.executor = executor
+
+    def _map_columns(self, dataset: Dict[str, Any], column_names: List[str], operation: str,
+                     params: tuple, allow_nulls: bool) -> Tuple[Dict[str, Any], List[str]]:
+        """Executa a operação nas colunas elegíveis. Retorna ({coluna: resultado}, colunas restantes)."""
+        shared, remaining = {}, []
+        try:
+            for column_name in column_names:
+                buffers = _column_buffers(dataset[column_name]) if column_name in dataset else None
+                if buffers is None or (buffers[1] is not None and not allow_nulls):
+                    remaining.append(column_name)
+                    continue
+                values, validity, typecode = buffers
+                data_size = len(values) * 8
+                shm = shared_memory.SharedMemory(create=True, size=data_size + (len(validity) if validity else 0))
+                shared[column_name] = (shm, len(values), typecode, validity is not None)
+                shm.buf[:data_size] = memoryview(values).cast('B')
+                if validity is not None:
+                    shm.buf[data_size:data_size + len(validity)] = validity
+
+            if not shared:
+                return {}, remaining
+
+            executor = self.executor or ProcessPoolExecutor(max_workers=min(self.n_jobs, len(shared)))
+            try:
+                futures = {column_name: executor.submit(_run_column_task, column_name, shm.name, length,
+                                                        typecode, has_nulls, operation, params)
+                           for column_name, (shm, length, typecode, has_nulls) in shared.items()}
+                results = {column_name: future.result() for column_name, future in futures.items()}
+            finally:
+                if executor is not self.executor:
+                    executor.shutdown()
+
+            for column_name, (shm, length, _, _) in shared.items():
+                if operation == 'scale':
+                    results[column_name] = _read_buffer(shm, length, 'd')
+                else:
+                    fill_value, typecode = results[column_name]
+                    if typecode is not None:
+                        results[column_name] = (fill_value, _read_buffer(shm, length, typecode))
+            return results, remaining
+        finally:
+            for shm, _, _, _ in shared.values():
+                shm.close()
+                shm.unlink()
+
+    def fillna(self, dataset: Dict[str, Any], column_names: List[str], method: str,
+               default_value: Any) -> Tuple[List[FillState], List[str]]:
+        """Preenche em paralelo os nulos das colunas numéricas e grava o resultado no dataset.
+
+        Retorna (estados, colunas restantes). Só as TypedColumn são gravadas aqui; os estados
+        das colunas em lista e daquelas cujo preenchimento as deixou não numéricas (ex.:
+        default_value textual) ainda precisam ser aplicados pelo chamador com
+        MissingValueProcessor.transform(), que visita apenas as posições nulas."""
+        results, remaining = self._map_columns(dataset, column_names, 'fillna', (method, default_value),
+                                               allow_nulls=True)
+        pending = []
+        for column_name, (fill_value, filled) in results.items():
+            # Em listas, só as posições nulas são gravadas (pelo chamador, como no caminho
+            # serial): regravar o buffer inteiro trocaria os int da coluna por float
+            if filled is None or not isinstance(dataset[column_name], TypedColumn):
+                pending.append(FillState(column_name, fill_value))
+            else:
+                self._write_column(dataset, column_name, filled)
+        return pending, remaining
+
+    def scale(self, dataset: Dict[str, Any], column_names: List[str], method: str) -> List[str]:
+        """Escalona em paralelo as colunas numéricas sem nulos e grava o resultado no dataset.
+        Retorna as colunas restantes, que devem seguir pelo caminho serial."""
+        results, remaining = self._map_columns(dataset, column_names, 'scale', (method,), allow_nulls=False)
+        for column_name, scaled in results.items():
+            self._write_column(dataset, column_name, scaled)
+        return remaining
+
+    @staticmethod
+    def _write_column(dataset: Dict[str, Any], column_name: str, values: array):
+        """Grava o buffer calculado na coluna, preservando o tipo de armazenamento."""
+        column_data = dataset[column_name]
+        if isinstance(column_data, TypedColumn):
+            dataset[column_name] = TypedColumn.from_buffers(values)
+        else:
+            column_data[:] = values.tolist()
@@ -1,11 +1,60 @@
 from food_statistics import Statistics
-from typing import Dict, List, Set, Any
+from columnar import CategoricalColumn, ColumnarDataset, TypedColumn
+from csv_loader import DEFAULT_BLOCK_SIZE, read_csv
+from groupby import GroupBy, GroupedPreprocessing
+from fitted import (DEFAULT_HASH_FEATURES, FillState, HashState, LabelState, MinMaxState, OneHotState,
+                    SparseOneHotState, StandardState)
+from lazy import LazyPreprocessing
+from parallel import ColumnPool
+from profiling import Instrumentation, Profiler
+from quantiles import KLLSketch
+from result_cache import ColumnVersions
+from schema import ColumnSchema, SchemaRegistry
+from selection import RowSelection, select_rows
+from storage import open_dataset, save_dataset
+from sparse import SparseOneHotColumn
+from array import array
+from collections.abc import MutableMapping
+from concurrent.futures import Executor
+from itertools import compress, repeat
+from operator import is_
+from typing import Dict, List, Set, Any, Union
+import warnings
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele usamos o caminho em Python puro
+    np = None
 
 
 class MissingValueProcessor:
     """Processa valores ausentes (representados como None) no dataset."""
-    def __init__(self, dataset: Dict[str, List[Any]]):
+    def __init__(self, dataset: Dict[str, List[Any]], versions: ColumnVersions = None,
+                 schema: SchemaRegistry = None):
         self.dataset = dataset
+        # Versões das colunas compartilhadas com Statistics (modificações invalidam o cache)
+        self.versions = versions
+        # Metadados por coluna (nulos, tipo); colunas sem nulos são ignoradas sem varredura
+        self.schema = schema
+
+    def _record_change(self, columns: List[str] = None):
+        if self.versions is not None:
+            self.versions.bump(columns)
+
+    def _schema_entry(self, column_name: str) -> ColumnSchema:
+        if self.schema is None or column_name not in self.dataset:
+            return None
+        return self.schema.get(column_name)
+
+    def _has_nulls(self, column_name: str) -> bool:
+        """Responde pelo registro de esquema em O(1) quando há um; sem ele, procura None na coluna."""
+        entry = self._schema_entry(column_name)
+        if entry is not None:
+            return entry.null_count > 0
+        column_data = self.dataset[column_name]
+        if isinstance(column_data, TypedColumn):
+            return column_data.null_count > 0
+        return None in column_data
 
     def _get_target_columns(self, columns: Set[str]) -> List[str]:
         """Retorna as colunas a serem processadas. Se 'columns' for vazio ou None, retorna todas as colunas."""
@@ -13,91 +62,150 @@ class MissingValueProcessor:
             return list(self.dataset.keys())
         return list(columns)
 
-    def isna(self, columns: Set[str] = None) -> Dict[str, List[Any]]:
-        """Retorna as linhas que contêm valores ausentes nas colunas especificadas."""
+    def _null_mask(self, column_name: str) -> bytes:
+        """Retorna o bitmap de nulos da coluna: um byte por linha, 1 se o valor é None."""
+        column_data = self.dataset[column_name]
+        if isinstance(column_data, (TypedColumn, CategoricalColumn)):
+            return column_data.null_mask()
+        if None not in column_data:
+            return bytes(len(column_data))
+        return bytes(map(is_, column_data, repeat(None)))
+
+    def _rows_with_missing(self, target_columns: List[str]) -> int:
+        """Combina os bitmaps das colunas com OR bit a bit. No inteiro resultante, o byte de
+        cada linha vale 1 quando a linha tem ao menos um None nas colunas alvo."""
+        combined = 0
+        for column_name in target_columns:
+            if self._has_nulls(column_name):
+                combined |= int.from_bytes(self._null_mask(column_name), 'little')
+        return combined
+
+    def _select_rows(self, row_mask: bytes) -> Dict[str, List[Any]]:
+        """Compacta todas as colunas a partir da máscara de linhas, em uma passada por coluna."""
+        return select_rows(self.dataset, row_mask)
+
+    def _rows_result(self, row_mask: bytes, view: bool) -> Union[Dict[str, List[Any]], RowSelection]:
+        return RowSelection.from_mask(self.dataset, row_mask) if view else self._select_rows(row_mask)
+
+    def isna(self, columns: Set[str] = None, view: bool = False) -> Union[Dict[str, List[Any]], RowSelection]:
+        """Retorna as linhas que contêm valores ausentes nas colunas especificadas. Com
+        view=True, retorna uma RowSelection (só os índices das linhas, sem copiar colunas)."""
         target_columns = self._get_target_columns(columns)
 
         if not target_columns or not self.dataset:
+            if view:
+                return RowSelection(self.dataset, array('q'), 0)
             return {col: [] for col in self.dataset.keys()} if self.dataset else {}
 
         num_rows = len(self.dataset[target_columns[0]])
-        result_dataset = {col: [] for col in self.dataset.keys()}
-
-        for row_index in range(num_rows):
-            has_missing_value = any(self.dataset[col][row_index] is None for col in target_columns)
-            if has_missing_value:
-                for col in self.dataset.keys():
-                    result_dataset[col].append(self.dataset[col][row_index])
+        missing_rows = self._rows_with_missing(target_columns)
+        return self._rows_result(missing_rows.to_bytes(num_rows, 'little'), view)
 
-        return result_dataset
-
-    def notna(self, columns: Set[str] = None) -> Dict[str, List[Any]]:
-        """Retorna as linhas que NÃO contêm valores ausentes nas colunas especificadas."""
+    def notna(self, columns: Set[str] = None, view: bool = False) -> Union[Dict[str, List[Any]], RowSelection]:
+        """Retorna as linhas que NÃO contêm valores ausentes nas colunas especificadas. Com
+        view=True, retorna uma RowSelection (só os índices das linhas, sem copiar colunas)."""
         target_columns = self._get_target_columns(columns)
 
         if not target_columns or not self.dataset:
+            if view:
+                return RowSelection(self.dataset, array('q'), 0)
             return {col: [] for col in self.dataset.keys()} if self.dataset else {}
 
         num_rows = len(self.dataset[target_columns[0]])
-        result_dataset = {col: [] for col in self.dataset.keys()}
-
-        for row_index in range(num_rows):
-            has_all_values = all(self.dataset[col][row_index] is not None for col in target_columns)
-            if has_all_values:
-                for col in self.dataset.keys():
-                    result_dataset[col].append(self.dataset[col][row_index])
-
-        return result_dataset
-
-    def fillna(self, columns: Set[str] = None, method: str = 'mean', default_value: Any = 0):
-        """Preenche valores ausentes usando diferentes estratégias estatísticas."""
+        all_rows = int.from_bytes(b'\x01' * num_rows, 'little')
+        complete_rows = self._rows_with_missing(target_columns) ^ all_rows
+        return self._rows_result(complete_rows.to_bytes(num_rows, 'little'), view)
+
+    def _compute_fill_value(self, column_name: str, method: str, default_value: Any) -> Any:
+        """Calcula o valor usado por fillna para preencher os nulos de uma coluna."""
+        if method == 'mean':
+            numeric_values = [value for value in self.dataset[column_name]
+                              if value is not None and isinstance(value, (int, float))]
+            if numeric_values:
+                statistics_calculator = Statistics({column_name: numeric_values})
+                return statistics_calculator.mean(column_name)
+            return default_value
+
+        elif method == 'median':
+            numeric_values = [value for value in self.dataset[column_name]
+                              if value is not None and isinstance(value, (int, float))]
+            if numeric_values:
+                statistics_calculator = Statistics({column_name: numeric_values})
+                return statistics_calculator.median(column_name)
+            return default_value
+
+        elif method == 'approx_median':
+            # Sketch KLL alimentado direto pela coluna: memória O(1/erro), sem cópia filtrada
+            sketch = KLLSketch().update_many(value for value in self.dataset[column_name]
+                                             if value is not None and isinstance(value, (int, float)))
+            if sketch.count:
+                return float(sketch.median())
+            return default_value
+
+        elif method == 'mode':
+            valid_values = [value for value in self.dataset[column_name] if value is not None]
+            if valid_values:
+                statistics_calculator = Statistics({column_name: valid_values})
+                mode_results = statistics_calculator.mode(column_name)
+                if mode_results:
+                    return mode_results[0]
+            return default_value
+
+        elif method == 'default_value':
+            return default_value
+        raise ValueError(f"Método '{method}' não suportado. Use: 'mean', 'median', 'approx_median', 'mode', 'default_value'")
+
+    def fit(self, columns: Set[str] = None, method: str = 'mean', default_value: Any = 0) -> List[FillState]:
+        """Calcula os valores de preenchimento de cada coluna sem modificar o dataset."""
         target_columns = self._get_target_columns(columns)
         if not target_columns or not self.dataset:
-            return
-
-        for column_name in target_columns:
-            if column_name not in self.dataset:
-                continue
+            return []
 
-            fill_value = None
-            if method == 'mean':
-                numeric_values = [value for value in self.dataset[column_name]
-                                  if value is not None and isinstance(value, (int, float))]
-                if numeric_values:
-                    statistics_calculator = Statistics({column_name: numeric_values})
-                    fill_value = statistics_calculator.mean(column_name)
-                else:
-                    fill_value = default_value
-
-            elif method == 'median':
-                numeric_values = [value for value in self.dataset[column_name]
-                                  if value is not None and isinstance(value, (int, float))]
-                if numeric_values:
-                    statistics_calculator = Statistics({column_name: numeric_values})
-                    fill_value = statistics_calculator.median(column_name)
-                else:
-                    fill_value = default_value
+        return [FillState(column_name, self._compute_fill_value(column_name, method, default_value))
+                for column_name in target_columns if column_name in self.dataset]
 
+    def transform(self, states: List[FillState]):
+        """Preenche os None com valores já ajustados, visitando apenas as posições nulas. Modifica o dataset."""
+        for state in states:
+            if state.column not in self.dataset or not self._has_nulls(state.column):
+                continue
+            # Só uma entrada já calculada é atualizada; sem ela, o próximo get() a calcula
+            entry = self.schema.peek(state.column) if self.schema is not None else None
+            column_data = self.dataset[state.column]
+            for position_index in compress(range(len(column_data)), self._null_mask(state.column)):
+                column_data[position_index] = state.value
+            self._record_change([state.column])
+            if entry is not None:
+                self.schema.update(state.column, entry.filled(state.value))
+
+    def columns_to_fill(self, columns: Set[str] = None) -> List[str]:
+        """Colunas alvo que podem ter nulos (as sem nulos no registro são descartadas em O(1))."""
+        return [column_name for column_name in self._get_target_columns(columns)
+                if column_name in self.dataset and self._has_nulls(column_name)]
+
+    def fillna_by_group(self, group: GroupBy, columns: Set[str] = None, method: str = 'mean',
+                        default_value: Any = 0):
+        """Preenche os None com a estatística do grupo de cada linha ('mean', 'median', 'mode'
+        ou 'default_value'), calculada para todos os grupos em uma passada pela coluna.
+        Grupos sem valores usam 'default_value'; as colunas-chave não são preenchidas."""
+        for column_name in self.columns_to_fill(columns):
+            if column_name in group.by:
+                continue
+            if method == 'default_value':
+                fills = [None] * len(group.keys)
             elif method == 'mode':
-                valid_values = [value for value in self.dataset[column_name] if value is not None]
-                if valid_values:
-                    statistics_calculator = Statistics({column_name: valid_values})
-                    mode_results = statistics_calculator.mode(column_name)
-                    if mode_results:
-                        fill_value = mode_results[0]
-                    else:
-                        fill_value = default_value
-                else:
-                    fill_value = default_value
-
-            elif method == 'default_value':
-                fill_value = default_value
+                fills = [modes[0] if modes else None for modes in group.aggregate_codes(column_name, 'mode')]
             else:
-                raise ValueError(f"Método '{method}' não suportado. Use: 'mean', 'median', 'mode', 'default_value'")
+                fills = group.aggregate_codes(column_name, method, numeric_only=True)
+            group.fill_values(column_name, self._null_mask(column_name), fills, default_value)
+            self._record_change([column_name])
 
-            for position_index in range(len(self.dataset[column_name])):
-                if self.dataset[column_name][position_index] is None:
-                    self.dataset[column_name][position_index] = fill_value
+    def fillna(self, columns: Set[str] = None, method: str = 'mean', default_value: Any = 0):
+        """Preenche valores ausentes usando diferentes estratégias estatísticas."""
+        target_columns = self.columns_to_fill(columns)
+        if not target_columns:
+            return
+        self.transform(self.fit(columns=target_columns, method=method, default_value=default_value))
 
     def dropna(self, columns: Set[str] = None):
         """Remove linhas que contêm valores ausentes nas colunas especificadas."""
@@ -106,30 +214,36 @@ class MissingValueProcessor:
         if not target_columns or not self.dataset:
             return
 
-        valid_row_indices = []
-        num_rows = len(self.dataset[target_columns[0]]) if target_columns else 0
-
-        for row_index in range(num_rows):
-            is_row_valid = True
-            for column_name in target_columns:
-                if self.dataset[column_name][row_index] is None:
-                    is_row_valid = False
-                    break
-            if is_row_valid:
-                valid_row_indices.append(row_index)
+        missing_rows = self._rows_with_missing(target_columns)
+        if not missing_rows:
+            return
 
-        new_dataset = {col: [] for col in self.dataset.keys()}
-        for valid_index in valid_row_indices:
-            for column_name in self.dataset.keys():
-                new_dataset[column_name].append(self.dataset[column_name][valid_index])
+        num_rows = len(self.dataset[target_columns[0]])
+        all_rows = int.from_bytes(b'\x01' * num_rows, 'little')
+        new_dataset = self._select_rows((missing_rows ^ all_rows).to_bytes(num_rows, 'little'))
 
         self.dataset.clear()
         self.dataset.update(new_dataset)
+        self._record_change()
 
 class Scaler:
     """Aplica transformações de escala em colunas numéricas do dataset."""
-    def __init__(self, dataset: Dict[str, List[Any]]):
+    def __init__(self, dataset: Dict[str, List[Any]], versions: ColumnVersions = None,
+                 schema: SchemaRegistry = None):
         self.dataset = dataset
+        # Versões das colunas compartilhadas com Statistics (modificações invalidam o cache)
+        self.versions = versions
+        # Metadados por coluna: tipo, nulos, mínimo e máximo dispensam a validação por célula
+        self.schema = schema
+
+    def _record_change(self, columns: List[str] = None):
+        if self.versions is not None:
+            self.versions.bump(columns)
+
+    def _schema_entry(self, column_name: str) -> ColumnSchema:
+        if self.schema is None or column_name not in self.dataset:
+            return None
+        return self.schema.get(column_name)
 
     def _get_target_columns(self, columns: Set[str]) -> List[str]:
         """Retorna colunas alvo ou todas se não especificado."""
@@ -142,118 +256,233 @@ class Scaler:
         if column_name not in self.dataset:
             return False
 
+        entry = self._schema_entry(column_name)
+        if entry is not None:
+            return entry.dtype in ('int', 'float', 'null')
+
         column_data = self.dataset[column_name]
+        if isinstance(column_data, TypedColumn) and column_data.typecode in ('q', 'd'):
+            return True
         return all(isinstance(value, (int, float)) and not isinstance(value, bool)
                    for value in column_data if value is not None)
 
-    def minMax_scaler(self, columns: Set[str] = None):
-        """Aplica a normalização Min-Max ($X_{norm} = \frac{X - X_{min}}{X_{max} - X_{min}}$)
-        nas colunas especificadas. Modifica o dataset. """
-        target_columns = self._get_target_columns(columns)
-        for column_name in target_columns:
-            if not self._validate_numeric_data(column_name):
-                continue
+    def _as_numpy(self, column_name: str):
+        """Converte a coluna em um ndarray float64 para o caminho vetorizado.
 
-            column_data = self.dataset[column_name]
-            if not column_data:
-                continue
+        Retorna None quando o caminho vetorizado não se aplica (NumPy ausente, coluna
+        inexistente ou vazia, valores nulos ou não numéricos); nesses casos o caminho
+        em Python puro decide o que fazer com a coluna."""
+        if np is None or column_name not in self.dataset:
+            return None
 
-            min_value = min(column_data)
-            max_value = max(column_data)
-            value_range = max_value - min_value
+        column_data = self.dataset[column_name]
+        if not column_data:
+            return None
+
+        if isinstance(column_data, TypedColumn):
+            if column_data.typecode not in ('q', 'd') or column_data.null_count:
+                return None
+            return np.asarray(column_data.values, dtype=np.float64)
+
+        entry = self._schema_entry(column_name)
+        if entry is not None:
+            if not entry.is_numeric or entry.null_count:
+                return None
+            return np.array(column_data, dtype=np.float64)
+
+        # Validação em lote: map(type) e set() rodam em C, sem laço Python por célula
+        if not set(map(type, column_data)) <= {int, float}:
+            return None
+        return np.array(column_data, dtype=np.float64)
+
+    def _write_numpy(self, column_name: str, values):
+        """Grava o resultado vetorizado de volta na coluna, preservando o tipo de armazenamento."""
+        column_data = self.dataset[column_name]
+        if isinstance(column_data, TypedColumn):
+            self.dataset[column_name] = TypedColumn.from_buffers(array('d', values.tobytes()))
+        else:
+            column_data[:] = values.tolist()
+
+    def _fit_column(self, column_name: str, method: str, values=None):
+        """Calcula os parâmetros de escala de uma coluna ('values' é o ndarray do caminho
+        vetorizado, quando disponível). Retorna None se a coluna deve ser ignorada."""
+        if values is not None:
+            if method == 'minMax':
+                min_value = float(values.min())
+                return MinMaxState(column_name, min_value, float(values.max()) - min_value)
+            mean_value = float(values.sum() / len(values))
+            centered = values - mean_value
+            return StandardState(column_name, mean_value, float(np.sqrt(np.dot(centered, centered) / len(values))))
+
+        if not self._validate_numeric_data(column_name):
+            return None
+
+        column_data = self.dataset[column_name]
+        if not column_data:
+            return None
 
-            if value_range == 0:
-                for index in range(len(column_data)):
-                    self.dataset[column_name][index] = 0.0
+        if method == 'minMax':
+            entry = self._schema_entry(column_name)
+            if entry is not None and entry.min is not None and not entry.null_count:
+                min_value, max_value = entry.min, entry.max
             else:
-                for index in range(len(column_data)):
-                    normalized_value = (self.dataset[column_name][index] - min_value) / value_range
-                    self.dataset[column_name][index] = float(normalized_value)
+                min_value = min(column_data)
+                max_value = max(column_data)
+            return MinMaxState(column_name, min_value, max_value - min_value)
+
+        statistics_calculator = Statistics({column_name: column_data})
+        return StandardState(column_name, statistics_calculator.mean(column_name),
+                             statistics_calculator.stdev(column_name))
+
+    def _fit_columns(self, columns: Set[str], method: str):
+        """Gera (estado, ndarray ou None) coluna a coluna, para não manter todas as colunas convertidas."""
+        for column_name in self._get_target_columns(columns):
+            values = self._as_numpy(column_name)
+            state = self._fit_column(column_name, method, values)
+            if state is not None:
+                yield state, values
+
+    def _transform_column(self, state, values=None):
+        # Só uma entrada já calculada é atualizada; sem ela, o próximo get() a calcula
+        entry = self.schema.peek(state.column) if self.schema is not None else None
+        self._record_change([state.column])
+        if values is None:
+            state.transform(self.dataset)
+        elif state.divisor == 0:
+            self._write_numpy(state.column, np.zeros_like(values))
+        else:
+            self._write_numpy(state.column, (values - state.offset) / state.divisor)
+        if entry is not None:
+            self.schema.update(state.column, entry.scaled(state))
 
-    def standard_scaler(self, columns: Set[str] = None):
-        """ Aplica a padronização Z-score ($X_{std} = \frac{X - \mu}{\sigma}$) nas colunas especificadas. Modifica o dataset."""
-        target_columns = self._get_target_columns(columns)
-        for column_name in target_columns:
-            if not self._validate_numeric_data(column_name):
-                continue
+    def fit(self, columns: Set[str] = None, method: str = 'minMax') -> List[Any]:
+        """Calcula os parâmetros de escala ('minMax' ou 'standard') sem modificar o dataset."""
+        if method not in ('minMax', 'standard'):
+            raise ValueError(f"Método de escalonamento '{method}' não suportado. Use 'minMax' ou 'standard'.")
+        return [state for state, _ in self._fit_columns(columns, method)]
 
-            column_data = self.dataset[column_name]
-            if not column_data:
-                continue
+    def transform(self, states: List[Any]):
+        """Aplica parâmetros de escala já ajustados às colunas correspondentes. Modifica o dataset."""
+        for state in states:
+            if state.column in self.dataset:
+                self._transform_column(state, self._as_numpy(state.column))
 
-            statistics_calculator = Statistics({column_name: column_data})
-            mean_value = statistics_calculator.mean(column_name)
-            std_deviation = statistics_calculator.stdev(column_name)
+    def minMax_scaler(self, columns: Set[str] = None):
+        """Aplica a normalização Min-Max ($X_{norm} = \frac{X - X_{min}}{X_{max} - X_{min}}$)
+        nas colunas especificadas. Modifica o dataset. """
+        for state, values in self._fit_columns(columns, 'minMax'):
+            self._transform_column(state, values)
 
-            if std_deviation == 0:
-                for index in range(len(column_data)):
-                    self.dataset[column_name][index] = 0.0
-            else:
-                for index in range(len(column_data)):
-                    standardized_value = (self.dataset[column_name][index] - mean_value) / std_deviation
-                    self.dataset[column_name][index] = float(standardized_value)
+    def standard_scaler(self, columns: Set[str] = None):
+        """ Aplica a padronização Z-score ($X_{std} = \frac{X - \mu}{\sigma}$) nas colunas especificadas. Modifica o dataset."""
+        for state, values in self._fit_columns(columns, 'standard'):
+            self._transform_column(state, values)
 
 class Encoder:
     """Aplica codificação em colunas categóricas."""
-    def __init__(self, dataset: Dict[str, List[Any]]):
+    def __init__(self, dataset: Dict[str, List[Any]], versions: ColumnVersions = None):
         self.dataset = dataset
-
-    def label_encode(self, columns: Set[str]):
-        """ Converte cada categoria em uma coluna em um número inteiro. Modifica o dataset. """
+        # Versões das colunas compartilhadas com Statistics (modificações invalidam o cache)
+        self.versions = versions
+
+    def _record_change(self, columns: List[str] = None):
+        if self.versions is not None:
+            self.versions.bump(columns)
+
+    def fit(self, columns: Set[str], method: str = 'label', n_features: int = DEFAULT_HASH_FEATURES,
+            seed: int = 0) -> List[Any]:
+        """Calcula as categorias (em ordem alfabética) de cada coluna sem modificar o dataset.
+        O método 'hash' não depende dos dados: usa apenas 'n_features' e 'seed'."""
+        if method not in ('label', 'oneHot', 'sparseOneHot', 'hash'):
+            raise ValueError(f"Método de codificação '{method}' não suportado. Use 'label', 'oneHot', 'sparseOneHot' ou 'hash'.")
         if not columns:
-            return
+            return []
 
-        for column_name in columns:
-            if column_name not in self.dataset:
-                continue
+        if method == 'hash':
+            return [HashState(column_name, n_features, seed) for column_name in columns if column_name in self.dataset]
+
+        state_type = {'label': LabelState, 'oneHot': OneHotState, 'sparseOneHot': SparseOneHotState}[method]
+        return [state_type(column_name, self._categories(self.dataset[column_name]))
+                for column_name in columns if column_name in self.dataset]
 
-            unique_categories = sorted(list(set(self.dataset[column_name])))
-            category_to_number_mapping = {category: index for index, category in enumerate(unique_categories)}
+    @staticmethod
+    def _categories(column_data) -> List[Any]:
+        # Uma coluna categórica já tem a tabela de categorias; só as presentes são usadas
+        if isinstance(column_data, CategoricalColumn):
+            return sorted(column_data.value_counts())
+        return sorted(list(set(column_data)))
 
-            encoded_values = [category_to_number_mapping[value] for value in self.dataset[column_name]]
-            self.dataset[column_name] = encoded_values
+    def transform(self, states: List[Any]):
+        """Aplica codificações já ajustadas. Modifica o dataset."""
+        for state in states:
+            state.transform(self.dataset)
+            self._record_change([state.column, *getattr(state, 'output_columns', list)()])
+
+    def label_encode(self, columns: Set[str]):
+        """ Converte cada categoria em uma coluna em um número inteiro. Modifica o dataset. """
+        self.transform(self.fit(columns, method='label'))
 
     def oneHot_encode(self, columns: Set[str]):
         """ Cria novas colunas binárias para cada categoria nas colunas especificadas (One-Hot Encoding).
         Modifica o dataset adicionando e removendo colunas."""
-        if not columns:
-            return
-
-        new_columns_to_add = {}
-        columns_to_remove = set()
-
-        for column_name in columns:
-            if column_name not in self.dataset:
+        self.transform(self.fit(columns, method='oneHot'))
+
+    def sparse_oneHot_encode(self, columns: Set[str]):
+        """ One-Hot Encoding esparso: substitui cada coluna por um SparseOneHotColumn (um código
+        por linha e o vocabulário), construído em uma única passada. Modifica o dataset."""
+        self.transform(self.fit(columns, method='sparseOneHot'))
+
+    def hash_encode(self, columns: Set[str], n_features: int = DEFAULT_HASH_FEATURES, seed: int = 0):
+        """ Feature hashing: distribui as categorias em 'n_features' baldes por um hash estável com
+        semente, em uma única passada e sem guardar o vocabulário. O resultado é um SparseOneHotColumn
+        de largura fixa, que também codifica categorias novas. Modifica o dataset."""
+        self.transform(self.fit(columns, method='hash', n_features=n_features, seed=seed))
+
+    def densify(self, columns: Set[str] = None):
+        """ Converte colunas SparseOneHotColumn (todas, se 'columns' não for informado) nas colunas
+        binárias 'coluna_categoria' do One-Hot Encoding denso. Modifica o dataset."""
+        target_columns = columns or [name for name, values in self.dataset.items()
+                                     if isinstance(values, SparseOneHotColumn)]
+        for column_name in list(target_columns):
+            sparse_column = self.dataset.get(column_name)
+            if not isinstance(sparse_column, SparseOneHotColumn):
                 continue
-
-            unique_categories = sorted(list(set(self.dataset[column_name])))
-
-            for category in unique_categories:
-                new_column_name = f'{column_name}_{category}'
-                binary_values = [1 if value == category else 0 for value in self.dataset[column_name]]
-                new_columns_to_add[new_column_name] = binary_values
-
-            columns_to_remove.add(column_name)
-
-        self.dataset.update(new_columns_to_add)
-        for column_name in columns_to_remove:
-            if column_name in self.dataset:
-                del self.dataset[column_name]
+            self._record_change([column_name, *sparse_column.output_columns()])
+            del self.dataset[column_name]
+            self.dataset.update(sparse_column.densify())
 
 class Preprocessing:
     """Classe principal que orquestra as operações de pré-processamento de dados."""
-    def __init__(self, dataset: Dict[str, List[Any]]):
-        if not isinstance(dataset, dict):
+    def __init__(self, dataset: Dict[str, List[Any]], columnar: bool = False, n_jobs: int = 1,
+                 executor: Executor = None):
+        if not isinstance(dataset, MutableMapping):
             raise TypeError("Dataset deve ser um dicionário")
 
+        # No modo colunar as colunas numéricas passam a ocupar buffers tipados;
+        # o dicionário original não é modificado.
+        if columnar and not isinstance(dataset, ColumnarDataset):
+            dataset = ColumnarDataset(dataset)
+
         self.dataset = dataset
         self._validate_dataset_shape()
         
         # Atributos compostos para cada tipo de tarefa
+        # As versões das colunas são compartilhadas: toda modificação feita pelos
+        # processadores invalida os resultados em cache de Statistics.
         self.statistics = Statistics(self.dataset)
-        self.missing_values = MissingValueProcessor(self.dataset)
-        self.scaler = Scaler(self.dataset)
-        self.encoder = Encoder(self.dataset)
+        # Tipo, nulos, mínimo e máximo por coluna, mantidos pelas operações (ver schema.py)
+        self.schema = SchemaRegistry(self.dataset, versions=self.statistics.versions)
+        self.missing_values = MissingValueProcessor(self.dataset, versions=self.statistics.versions,
+                                                    schema=self.schema)
+        self.scaler = Scaler(self.dataset, versions=self.statistics.versions, schema=self.schema)
+        self.encoder = Encoder(self.dataset, versions=self.statistics.versions)
+
+        # fillna e scale podem distribuir as colunas entre processos (opt-in);
+        # com n_jobs=1 e sem executor o caminho serial é usado.
+        self.parallel = ColumnPool(n_jobs, executor) if n_jobs != 1 or executor is not None else None
+
+        # Hooks de instrumentação (ver profile()); sem hooks, nada é medido.
+        self.instrumentation = Instrumentation()
 
     def _validate_dataset_shape(self):
         """Valida se todas as listas (colunas) no dicionário do dataset têm o mesmo comprimento."""
@@ -268,22 +497,80 @@ class Preprocessing:
                 raise ValueError(
                     f"As colunas do dataset devem ter o mesmo comprimento. A coluna '{key}' tem {len(value)} elementos, mas o esperado era {expected_len}.")
 
-    def isna(self, columns: Set[str] = None) -> Dict[str, List[Any]]:
-        """Atalho para missing_values.isna(). Retorna as linhas com valores nulos."""
-        return self.missing_values.isna(columns=columns)
+    @classmethod
+    def from_csv(cls, path: str, columnar: bool = True, categorical: bool = True,
+                 block_size: int = DEFAULT_BLOCK_SIZE, read_jobs: int = 1, delimiter: str = ',',
+                 **kwargs) -> 'Preprocessing':
+        """Carrega um CSV com cabeçalho direto em colunas (ver csv_loader.read_csv): blocos
+        grandes, tipos int/float/bool/texto inferidos por coluna e campos vazios como None.
+        Com read_jobs != 1, intervalos de bytes do arquivo são lidos em paralelo. Os demais
+        argumentos são repassados ao construtor (ex.: n_jobs)."""
+        dataset = read_csv(path, columnar=columnar, categorical=categorical, block_size=block_size,
+                           n_jobs=read_jobs, delimiter=delimiter)
+        return cls(dataset, **kwargs)
+
+    def save(self, path: str):
+        """Grava o dataset no formato colunar binário (ver storage.save_dataset): esquema em
+        um cabeçalho, buffers tipados, bitmaps de nulos e o dicionário de categorias."""
+        save_dataset(self.dataset, path)
+        return self
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> 'Preprocessing':
+        """Abre um arquivo gravado por save() via mmap. O custo de abertura depende do número
+        de colunas, não de linhas: as páginas de cada coluna só são lidas quando ela é usada.
+        Os demais argumentos são repassados ao construtor (ex.: n_jobs)."""
+        return cls(open_dataset(path), **kwargs)
+
+    def lazy(self) -> LazyPreprocessing:
+        """Retorna um encadeamento preguiçoso: as operações são registradas como um plano,
+        otimizadas (ver explain()) e executadas apenas em collect()."""
+        return LazyPreprocessing(self)
 
-    def notna(self, columns: Set[str] = None) -> Dict[str, List[Any]]:
-        """Atalho para missing_values.notna(). Retorna as linhas sem valores nulos."""
-        return self.missing_values.notna(columns=columns)
+    def isna(self, columns: Set[str] = None, view: bool = False) -> Union[Dict[str, List[Any]], RowSelection]:
+        """Atalho para missing_values.isna(). Retorna as linhas com valores nulos
+        (com view=True, uma RowSelection sem cópia das colunas)."""
+        return self.missing_values.isna(columns=columns, view=view)
+
+    def notna(self, columns: Set[str] = None, view: bool = False) -> Union[Dict[str, List[Any]], RowSelection]:
+        """Atalho para missing_values.notna(). Retorna as linhas sem valores nulos
+        (com view=True, uma RowSelection sem cópia das colunas)."""
+        return self.missing_values.notna(columns=columns, view=view)
 
     def fillna(self, columns: Set[str] = None, method: str = 'mean', default_value: Any = 0):
         """ Atalho para missing_values.fillna(). Preenche valores nulos. Retorna 'self' para permitir encadeamento de métodos."""
-        self.missing_values.fillna(columns=columns, method=method, default_value=default_value)
+        # As colunas preenchidas já são registradas em 'versions' pelo MissingValueProcessor
+        self._instrumented('fillna', columns, {'method': method},
+                           lambda target: self._fillna(target, method, default_value))
         return self
 
+    def _fillna(self, columns: Set[str], method: str, default_value: Any):
+        if self.parallel is None:
+            self.missing_values.fillna(columns=columns, method=method, default_value=default_value)
+            return
+        target_columns = self.missing_values.columns_to_fill(columns)
+        if not target_columns:
+            return
+        states, remaining = self.parallel.fillna(self.dataset, target_columns, method, default_value)
+        # Os processos gravam as colunas tipadas diretamente, sem passar pelo MissingValueProcessor
+        self.statistics.invalidate(set(target_columns) - set(remaining) - {state.column for state in states})
+        self.missing_values.transform(states)
+        if remaining:
+            self.missing_values.fillna(columns=set(remaining), method=method, default_value=default_value)
+
+    def groupby(self, by) -> GroupedPreprocessing:
+        """Operações por grupo de 'by' (uma coluna ou lista de colunas), por exemplo
+        groupby('restaurante').fillna(columns={'tempo'}, method='median'), que preenche cada
+        nulo com a mediana do restaurante da linha. Retorna o Preprocessing no fim."""
+        return GroupedPreprocessing(self, by)
+
     def dropna(self, columns: Set[str] = None):
         """ Atalho para missing_values.dropna(). Remove linhas com valores nulos. Retorna 'self' para permitir encadeamento de métodos."""
-        self.missing_values.dropna(columns=columns)
+        if self.instrumentation.enabled:
+            with self.instrumentation.span('dropna', self.dataset, None, {'columns': sorted(columns or ())}):
+                self.missing_values.dropna(columns=columns)
+        else:
+            self.missing_values.dropna(columns=columns)
         return self
 
     def scale(self, columns: Set[str] = None, method: str = 'minMax'):
@@ -296,32 +583,80 @@ class Preprocessing:
 
         Retorna 'self' para permitir encadeamento de métodos.
         """
-        if method == 'minMax':
-            self.scaler.minMax_scaler(columns=columns)
-        elif method == 'standard':
-            self.scaler.standard_scaler(columns=columns)
-        else:
+        if method not in ('minMax', 'standard'):
             raise ValueError(f"Método de escalonamento '{method}' não suportado. Use 'minMax' ou 'standard'.")
+
+        self._instrumented('scale', columns, {'method': method}, lambda target: self._scale(target, method))
         return self
 
-    def encode(self, columns: Set[str], method: str = 'label'):
+    def _scale(self, columns: Set[str], method: str):
+        target_columns = columns
+        if self.parallel is not None:
+            parallel_columns = self.scaler._get_target_columns(columns)
+            remaining = self.parallel.scale(self.dataset, parallel_columns, method)
+            target_columns = set(remaining)
+            # Os processos gravam as colunas diretamente, sem passar pelo Scaler
+            self.statistics.invalidate(set(parallel_columns) - target_columns)
+
+        if self.parallel is None or target_columns:
+            if method == 'minMax':
+                self.scaler.minMax_scaler(columns=target_columns)
+            else:
+                self.scaler.standard_scaler(columns=target_columns)
+
+    def encode(self, columns: Set[str], method: str = 'label', n_features: int = DEFAULT_HASH_FEATURES,
+               seed: int = 0):
         """
         Aplica codificação nas colunas especificadas.
 
         Args:
             columns (Set[str]): Colunas para aplicar a codificação.
-            method (str): O método a ser usado: 'label' ou 'oneHot'.
+            method (str): O método a ser usado: 'label', 'oneHot', 'sparseOneHot' ou 'hash'
+                (os dois últimos podem ser convertidos depois com encoder.densify()).
+            n_features (int): Largura da saída do método 'hash'.
+            seed (int): Semente do hash do método 'hash'.
         
         Retorna 'self' para permitir encadeamento de métodos.
         """
         if not columns:
-            print("Aviso: Nenhuma coluna especificada para codificação. Nenhuma ação foi tomada.")
+            warnings.warn("Nenhuma coluna especificada para codificação. Nenhuma ação foi tomada.", stacklevel=2)
             return self
 
+        if method not in ('label', 'oneHot', 'sparseOneHot', 'hash'):
+            raise ValueError(f"Método de codificação '{method}' não suportado. Use 'label', 'oneHot', 'sparseOneHot' ou 'hash'.")
+        self._instrumented('encode', columns, {'method': method},
+                           lambda target: self._encode(target, method, n_features, seed))
+        self.statistics.invalidate()
+        return self
+
+    def _encode(self, columns: Set[str], method: str, n_features: int, seed: int):
         if method == 'label':
             self.encoder.label_encode(columns=columns)
         elif method == 'oneHot':
             self.encoder.oneHot_encode(columns=columns)
+        elif method == 'sparseOneHot':
+            self.encoder.sparse_oneHot_encode(columns=columns)
         else:
-            raise ValueError(f"Método de codificação '{method}' não suportado. Use 'label' ou 'oneHot'.")
-        return self
+            self.encoder.hash_encode(columns=columns, n_features=n_features, seed=seed)
+
+    def _instrumented(self, operation: str, columns: Set[str], params: Dict[str, Any], run):
+        """Executa 'run(colunas)'. Com hooks de instrumentação registrados, o caminho serial
+        processa uma coluna por vez para medir cada uma; no modo paralelo, as colunas são
+        processadas juntas e o evento é registrado para a operação inteira (coluna None)."""
+        if not self.instrumentation.enabled:
+            run(columns)
+            return
+        if self.parallel is not None:
+            with self.instrumentation.span(operation, self.dataset, None, params):
+                run(columns)
+            return
+        for column_name in self.missing_values._get_target_columns(columns):
+            if column_name not in self.dataset:
+                continue
+            with self.instrumentation.span(operation, self.dataset, column_name, params):
+                run({column_name})
+
+    def profile(self, memory: bool = False) -> Profiler:
+        """Gerenciador de contexto que registra duração, linhas, nulos preenchidos e (com
+        memory=True) memória alocada de cada operação e coluna executada dentro do bloco."""
+        return Profiler(self, memory=memory)
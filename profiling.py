@@ -0,0 +1,194 @@
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from columnar import CategoricalColumn, TypedColumn
+from sparse import SparseOneHotColumn
+
+
+def count_nulls(column_data) -> int:
+    if isinstance(column_data, TypedColumn):
+        return column_data.null_count
+    if isinstance(column_data, CategoricalColumn):
+        return column_data.null_mask().count(1)
+    if isinstance(column_data, SparseOneHotColumn):
+        return 0
+    return column_data.count(None)
+
+
+def _num_rows(dataset) -> int:
+    return len(next(iter(dataset.values()))) if dataset else 0
+
+
+class OperationEvent:
+    """Registro de uma operação executada sobre uma coluna (ou sobre o dataset inteiro,
+    quando 'column' é None, como no dropna).
+
+    'bytes_allocated' é a variação líquida da memória alocada durante a operação e
+    'peak_memory' o pico acima do ponto de partida; ambos são None quando a memória não
+    está sendo rastreada (tracemalloc desligado)."""
+
+    __slots__ = ('operation', 'column', 'params', 'duration', 'rows_in', 'rows_out', 'nulls_filled',
+                 'bytes_allocated', 'peak_memory')
+
+    def __init__(self, operation: str, column: Optional[str], params: Dict[str, Any], duration: float,
+                 rows_in: int, rows_out: int, nulls_filled: int, bytes_allocated: Optional[int] = None,
+                 peak_memory: Optional[int] = None):
+        self.operation = operation
+        self.column = column
+        self.params = params
+        self.duration = duration
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.nulls_filled = nulls_filled
+        self.bytes_allocated = bytes_allocated
+        self.peak_memory = peak_memory
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"OperationEvent({self.operation!r}, column={self.column!r}, duration={self.duration:.6f})"
+
+
+class _Span:
+    """Mede uma operação e emite o OperationEvent correspondente ao sair do bloco.
+    Operações que terminam com exceção não geram evento."""
+
+    def __init__(self, instrumentation: 'Instrumentation', operation: str, dataset, column: Optional[str],
+                 params: Dict[str, Any]):
+        self._instrumentation = instrumentation
+        self._operation = operation
+        self._dataset = dataset
+        self._column = column
+        self._params = params
+
+    def _nulls(self) -> int:
+        if self._column is None:
+            return sum(map(count_nulls, self._dataset.values()))
+        column_data = self._dataset.get(self._column)
+        return count_nulls(column_data) if column_data is not None else 0
+
+    def __enter__(self):
+        self._rows_in = _num_rows(self._dataset)
+        self._nulls_before = self._nulls()
+        self._tracing = tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.reset_peak()
+            self._memory_before = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            return False
+
+        bytes_allocated = peak_memory = None
+        if self._tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            bytes_allocated = current - self._memory_before
+            peak_memory = peak - self._memory_before
+
+        # Só o fillna preenche nulos; nas demais operações a contagem é sempre 0
+        nulls_filled = self._nulls_before - self._nulls() if self._operation.startswith('fillna') else 0
+        self._instrumentation.emit(OperationEvent(
+            self._operation, self._column, self._params, duration, self._rows_in, _num_rows(self._dataset),
+            nulls_filled, bytes_allocated, peak_memory))
+        return False
+
+
+class Instrumentation:
+    """Registro de hooks chamados com um OperationEvent ao fim de cada operação do
+    Preprocessing. Sem hooks registrados, as operações não são medidas (o custo é uma
+    verificação de lista vazia por chamada)."""
+
+    def __init__(self):
+        self._hooks: List[Callable[[OperationEvent], None]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._hooks)
+
+    def add_hook(self, hook: Callable[[OperationEvent], None]):
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[OperationEvent], None]):
+        self._hooks.remove(hook)
+
+    def emit(self, event: OperationEvent):
+        for hook in list(self._hooks):
+            hook(event)
+
+    def span(self, operation: str, dataset, column: Optional[str], params: Dict[str, Any]) -> _Span:
+        return _Span(self, operation, dataset, column, params)
+
+
+class Profiler:
+    """Gerenciador de contexto que coleta os eventos das operações de um Preprocessing.
+
+    Com memory=True, o tracemalloc é ligado durante o bloco (se ainda não estiver) para
+    registrar bytes alocados e pico de memória, o que deixa as operações mais lentas.
+
+        with preprocessor.profile() as profiler:
+            preprocessor.fillna(method='median').scale(method='standard')
+        print(profiler.format_table())"""
+
+    def __init__(self, preprocessing, memory: bool = False):
+        self._instrumentation = preprocessing.instrumentation
+        self.memory = memory
+        self.events: List[OperationEvent] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> 'Profiler':
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._instrumentation.add_hook(self.events.append)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._instrumentation.remove_hook(self.events.append)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [event.to_dict() for event in self.events]
+
+    def to_json(self, path: str = None) -> str:
+        """Serializa os eventos em JSON (e grava em 'path', se informado)."""
+        text = json.dumps(self.to_dicts(), indent=2, default=str)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as output:
+                output.write(text)
+        return text
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Agrega os eventos por (operação, coluna), na ordem em que apareceram, somando
+        durações e nulos preenchidos e mantendo o maior pico de memória."""
+        groups = defaultdict(lambda: {'calls': 0, 'duration': 0.0, 'nulls_filled': 0, 'peak_memory': None})
+        for event in self.events:
+            group = groups[(event.operation, event.column)]
+            group['calls'] += 1
+            group['duration'] += event.duration
+            group['nulls_filled'] += event.nulls_filled
+            group['rows_out'] = event.rows_out
+            if event.peak_memory is not None:
+                group['peak_memory'] = max(group['peak_memory'] or 0, event.peak_memory)
+        return [{'operation': operation, 'column': column, **group} for (operation, column), group in groups.items()]
+
+    def format_table(self) -> str:
+        """Tabela de texto com o resumo, da operação mais demorada para a mais rápida."""
+        rows = sorted(self.summary(), key=lambda row: row['duration'], reverse=True)
+        lines = [f"{'operação':<14} {'coluna':<20} {'chamadas':>8} {'segundos':>10} {'nulos':>8} "
+                 f"{'linhas':>10} {'pico (KB)':>10}"]
+        for row in rows:
+            peak = f"{row['peak_memory'] / 1024:>10.1f}" if row['peak_memory'] is not None else f"{'-':>10}"
+            column = '-' if row['column'] is None else str(row['column'])
+            lines.append(f"{row['operation']:<14} {column:<20} {row['calls']:>8} {row['duration']:>10.4f} "
+                         f"{row['nulls_filled']:>8} {row['rows_out']:>10} {peak}")
+        return '\n'.join(lines)
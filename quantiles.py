@@ -0,0 +1,186 @@
+import math
+import random
+from itertools import islice
+from typing import Any, Iterable, List, Sequence
+
+# Erro de rank padrão dos sketches (1% de n)
+DEFAULT_ERROR = 0.01
+
+
+def select_kth(valores: Sequence[Any], k: int) -> Any:
+    """Retorna o k-ésimo menor valor (0-indexado) por seleção (quickselect) em O(n) esperado,
+    sem ordenar nem modificar a sequência original."""
+    if not 0 <= k < len(valores):
+        raise IndexError("Posição fora do intervalo da coluna.")
+
+    # Semente fixa: o resultado é determinístico e o pivô continua imprevisível para
+    # entradas ordenadas ou repetitivas
+    rng = random.Random(len(valores))
+    while len(valores) > 64:
+        pivo = sorted(valores[rng.randrange(len(valores))] for _ in range(3))[1]
+        menores = [item for item in valores if item < pivo]
+        if k < len(menores):
+            valores = menores
+            continue
+        maiores = [item for item in valores if item > pivo]
+        n_ate_pivo = len(valores) - len(maiores)
+        if k < n_ate_pivo:
+            return pivo
+        k -= n_ate_pivo
+        valores = maiores
+    return sorted(valores)[k]
+
+
+def exact_quantile(valores: Sequence[Any], q: float) -> float:
+    """Quantil exato com interpolação linear entre as posições vizinhas (q=0.5 é a mediana)."""
+    n = len(valores)
+    posicao = (n - 1) * q
+    i = int(posicao)
+    fracao = posicao - i
+
+    inferior = select_kth(valores, i)
+    if fracao == 0:
+        return float(inferior)
+
+    maiores = [item for item in valores if item > inferior]
+    superior = inferior if n - len(maiores) > i + 1 else min(maiores)
+    if fracao == 0.5:
+        return float((inferior + superior) / 2)
+    return float(inferior + (superior - inferior) * fracao)
+
+
+def validate_quantile(q: float):
+    if not 0 <= q <= 1:
+        raise ValueError("O quantil 'q' deve estar entre 0 e 1.")
+
+
+class KLLSketch:
+    """Sketch de quantis KLL (Karnin, Lang e Liberty): resume um fluxo de valores em
+    O(k log(n/k)) itens e responde quantis com erro de rank de aproximadamente 'error'
+    (fração de n), com alta probabilidade.
+
+    Os itens ficam em níveis (compactadores); um item no nível h representa 2**h valores.
+    Quando um nível enche, ele é ordenado e metade dos itens (os de posição par ou ímpar,
+    por sorteio) sobe para o nível seguinte. Dois sketches com o mesmo erro podem ser
+    combinados com merge(), o que permite usá-lo em blocos (streaming) e em shards.
+
+    O sorteio das compactações usa 'seed', de modo que o mesmo fluxo produz sempre o mesmo sketch."""
+
+    def __init__(self, error: float = DEFAULT_ERROR, seed: int = 0):
+        if not 0 < error < 1:
+            raise ValueError("O erro do sketch deve estar entre 0 e 1.")
+        self.error = error
+        # Relação empírica entre k e o erro de rank normalizado (DataSketches/KLL)
+        self.k = max(8, math.ceil((2.296 / error) ** (1 / 0.9723)))
+        self.count = 0
+        self.min_value = None
+        self.max_value = None
+        self._compactors: List[List[Any]] = [[]]
+        self._max_size = self._capacity(0)
+        self._size = 0
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def _compress(self):
+        while self._size >= self._max_size:
+            for level, compactor in enumerate(self._compactors):
+                if len(compactor) >= self._capacity(level):
+                    if level + 1 == len(self._compactors):
+                        self._grow()
+                    compactor.sort()
+                    sobra = [compactor.pop()] if len(compactor) % 2 else []
+                    self._compactors[level + 1].extend(compactor[self._rng.randrange(2)::2])
+                    self._compactors[level] = sobra
+                    break
+            self._size = sum(len(compactor) for compactor in self._compactors)
+
+    def _track_bounds(self, min_value: Any, max_value: Any):
+        self.min_value = min_value if self.min_value is None else min(self.min_value, min_value)
+        self.max_value = max_value if self.max_value is None else max(self.max_value, max_value)
+
+    def update(self, value: Any, count: int = 1) -> 'KLLSketch':
+        """Insere 'value' repetido 'count' vezes (em O(log count), distribuindo as cópias pelos níveis)."""
+        if count <= 0:
+            return self
+        self._track_bounds(value, value)
+        self.count += count
+        level = 0
+        while count:
+            if count & 1:
+                while level >= len(self._compactors):
+                    self._grow()
+                self._compactors[level].append(value)
+                self._size += 1
+            count >>= 1
+            level += 1
+        self._compress()
+        return self
+
+    def update_many(self, values: Iterable[Any]) -> 'KLLSketch':
+        """Insere os valores de um iterável em blocos, sem materializá-lo por inteiro."""
+        iterator = iter(values)
+        while True:
+            bloco = list(islice(iterator, max(self._max_size - self._size, self.k)))
+            if not bloco:
+                return self
+            self._track_bounds(min(bloco), max(bloco))
+            self.count += len(bloco)
+            self._compactors[0].extend(bloco)
+            self._size += len(bloco)
+            self._compress()
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Combina outro sketch (criado com o mesmo erro) neste."""
+        if other.k != self.k:
+            raise ValueError("Só é possível combinar sketches criados com o mesmo erro.")
+        if not other.count:
+            return self
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, compactor in enumerate(other._compactors):
+            self._compactors[level].extend(compactor)
+        self._track_bounds(other.min_value, other.max_value)
+        self.count += other.count
+        self._size = sum(len(compactor) for compactor in self._compactors)
+        self._compress()
+        return self
+
+    def map_values(self, mapping) -> 'KLLSketch':
+        """Aplica uma transformação crescente (ex.: escalonamento afim) a todos os itens."""
+        self._compactors = [[mapping(item) for item in compactor] for compactor in self._compactors]
+        if self.count:
+            self.min_value, self.max_value = mapping(self.min_value), mapping(self.max_value)
+        return self
+
+    def quantile(self, q: float) -> Any:
+        """Retorna um item cujo rank se aproxima de q * count (0.0 para um sketch vazio)."""
+        validate_quantile(q)
+        if not self.count:
+            return 0.0
+        if q == 0:
+            return self.min_value
+        if q == 1:
+            return self.max_value
+
+        ponderados = sorted((item, 1 << level) for level, compactor in enumerate(self._compactors)
+                            for item in compactor)
+        alvo = q * self.count
+        acumulado = 0
+        for item, peso in ponderados:
+            acumulado += peso
+            if acumulado >= alvo:
+                return item
+        return self.max_value
+
+    def median(self) -> Any:
+        return self.quantile(0.5)
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+# Número padrão de resultados mantidos por Statistics
+DEFAULT_CACHE_SIZE = 256
+
+
+class ColumnVersions:
+    """Contador de versão por coluna, compartilhado entre Statistics e os processadores
+    que modificam o mesmo dataset.
+
+    Cada modificação incrementa a versão das colunas afetadas (ou uma época global, quando
+    todas são afetadas); resultados calculados sobre uma versão antiga deixam de ser
+    encontrados no cache, sem que seja preciso percorrê-lo."""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, column: str) -> Tuple[int, int]:
+        return self._epoch, self._versions.get(column, 0)
+
+    def bump(self, columns: Iterable[str] = None):
+        """Registra uma modificação nas colunas informadas (ou em todas)."""
+        if columns is None:
+            self._epoch += 1
+            return
+        for column in columns:
+            self._versions[column] = self._versions.get(column, 0) + 1
+
+
+class ResultCache:
+    """Cache de resultados com política LRU: ao passar de 'maxsize' entradas, a usada há
+    mais tempo é descartada. Com maxsize=0 nada é guardado."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError("O tamanho do cache deve ser um inteiro não negativo.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+        value = compute()
+        if self.maxsize:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,167 @@
+from functools import partial
+from operator import is_not
+from typing import Any, Dict, List, Optional
+
+from columnar import CategoricalColumn, TypedColumn
+from result_cache import ColumnVersions
+from sparse import SparseOneHotColumn
+
+# Tipos de coluna para os quais min/max são mantidos
+NUMERIC_DTYPES = ('int', 'float')
+_TYPE_NAMES = {int: 'int', float: 'float', bool: 'bool', str: 'str'}
+
+
+def _dtype_of(types) -> str:
+    """Nome do tipo de uma coluna a partir do conjunto de tipos dos valores não nulos."""
+    if not types:
+        return 'null'
+    if types <= {int, float}:
+        return 'float' if float in types else 'int'
+    if len(types) == 1:
+        return _TYPE_NAMES.get(next(iter(types)), 'object')
+    return 'mixed'
+
+
+def _merge_dtypes(dtype: str, other: str) -> str:
+    if dtype == other or other == 'null':
+        return dtype
+    if dtype == 'null':
+        return other
+    if {dtype, other} == {'int', 'float'}:
+        return 'float'
+    return 'mixed'
+
+
+class ColumnSchema:
+    """Metadados de uma coluna: tipo ('int', 'float', 'bool', 'str', 'category', 'sparse',
+    'object', 'mixed' ou 'null' quando só há nulos), número de nulos e, para colunas
+    numéricas, o mínimo e o máximo dos valores não nulos."""
+
+    __slots__ = ('dtype', 'null_count', 'min', 'max')
+
+    def __init__(self, dtype: str, null_count: int = 0, min: Any = None, max: Any = None):
+        self.dtype = dtype
+        self.null_count = null_count
+        self.min = min
+        self.max = max
+
+    @classmethod
+    def infer(cls, column_data) -> 'ColumnSchema':
+        """Calcula os metadados em uma passada por coluna (map/filter rodam em C)."""
+        if isinstance(column_data, SparseOneHotColumn):
+            return cls('sparse')
+        if isinstance(column_data, CategoricalColumn):
+            return cls('category', sum(column_data.null_mask()))
+        if isinstance(column_data, TypedColumn) and column_data.typecode in ('q', 'd'):
+            null_count = column_data.null_count
+            values = column_data.values if not null_count else list(filter(partial(is_not, None), column_data))
+            dtype = 'int' if column_data.typecode == 'q' else 'float'
+            if not len(values):
+                return cls('null', null_count)
+            return cls(dtype, null_count, min(values), max(values))
+
+        null_count = column_data.count(None) if isinstance(column_data, list) else sum(
+            value is None for value in column_data)
+        values = column_data if not null_count else list(filter(partial(is_not, None), column_data))
+        dtype = _dtype_of(set(map(type, values)))
+        if dtype in NUMERIC_DTYPES:
+            return cls(dtype, null_count, min(values), max(values))
+        return cls(dtype, null_count)
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.dtype in NUMERIC_DTYPES
+
+    def filled(self, value: Any) -> 'ColumnSchema':
+        """Metadados da coluna depois que todos os nulos recebem 'value'."""
+        if not self.null_count:
+            return self
+        if self.dtype in ('category', 'sparse'):
+            return ColumnSchema(self.dtype)
+        dtype = _merge_dtypes(self.dtype, _dtype_of({type(value)} - {type(None)}))
+        if value is None:
+            return ColumnSchema(dtype, self.null_count, self.min, self.max)
+        if dtype not in NUMERIC_DTYPES:
+            return ColumnSchema(dtype)
+        if self.min is None:
+            return ColumnSchema(dtype, 0, value, value)
+        return ColumnSchema(dtype, 0, min(self.min, value), max(self.max, value))
+
+    def scaled(self, state) -> 'ColumnSchema':
+        """Metadados da coluna depois de um escalonamento (MinMaxState/StandardState): a
+        transformação é crescente, então os novos extremos são os extremos transformados."""
+        if self.min is None:
+            return ColumnSchema('float', self.null_count)
+        return ColumnSchema('float', self.null_count, state.map_value(self.min), state.map_value(self.max))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'dtype': self.dtype, 'null_count': self.null_count, 'min': self.min, 'max': self.max}
+
+    def __eq__(self, other):
+        if not isinstance(other, ColumnSchema):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"ColumnSchema(dtype={self.dtype!r}, null_count={self.null_count}, "
+                f"min={self.min!r}, max={self.max!r})")
+
+
+class SchemaRegistry:
+    """Registro de ColumnSchema por coluna, ligado às versões de coluna compartilhadas com
+    Statistics e os processadores.
+
+    Os metadados de uma coluna são calculados no primeiro acesso e guardados com a versão
+    da coluna. Operações com efeito conhecido (fillna, scale) registram os novos metadados
+    com update(), sem percorrer a coluna; qualquer outra modificação registrada em
+    'versions' (dropna, encode, invalidate) faz a coluna ser recalculada no próximo acesso.
+
+    fillna, dropna e scale decidem pelo registro se uma coluna tem nulos ou é numérica,
+    sem percorrê-la. Por isso, alterações feitas diretamente dentro de uma lista (que não
+    passam por 'versions') exigem invalidate(colunas), como em Statistics."""
+
+    def __init__(self, dataset: Dict[str, List[Any]], versions: ColumnVersions = None):
+        self.dataset = dataset
+        self.versions = versions if versions is not None else ColumnVersions()
+        self._entries: Dict[str, tuple] = {}
+
+    def _stamp(self, column: str) -> tuple:
+        column_data = self.dataset[column]
+        return self.versions.get(column), id(column_data), len(column_data)
+
+    def get(self, column: str) -> ColumnSchema:
+        """Metadados atuais da coluna (KeyError se ela não existe)."""
+        schema = self.peek(column)
+        if schema is None:
+            schema = ColumnSchema.infer(self.dataset[column])
+            self._entries[column] = (self._stamp(column), schema)
+        return schema
+
+    def peek(self, column: str) -> Optional[ColumnSchema]:
+        """Metadados da coluna se já calculados para a versão atual; None, sem calcular, caso contrário."""
+        entry = self._entries.get(column)
+        if entry is not None and entry[0] == self._stamp(column):
+            return entry[1]
+        return None
+
+    def update(self, column: str, schema: ColumnSchema):
+        """Registra os metadados de uma coluna recém-modificada. Deve ser chamado depois de
+        registrar a modificação em 'versions'."""
+        self._entries[column] = (self._stamp(column), schema)
+
+    def invalidate(self, columns: List[str] = None):
+        """Registra uma modificação nas colunas informadas (ou em todas), de modo que os
+        metadados sejam recalculados no próximo acesso (e os resultados em cache de
+        Statistics que compartilham 'versions' deixem de valer)."""
+        self.versions.bump(columns)
+
+    def __getitem__(self, column: str) -> ColumnSchema:
+        return self.get(column)
+
+    def __contains__(self, column) -> bool:
+        return column in self.dataset
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {column: self.get(column).to_dict() for column in self.dataset}
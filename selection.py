@@ -0,0 +1,115 @@
+from array import array
+from collections.abc import Sequence
+from itertools import compress, count
+from typing import Any, Dict, Iterator, List
+
+from columnar import CategoricalColumn
+from sparse import SparseOneHotColumn
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele os índices saem de compress(count(), máscara)
+    np = None
+
+
+def select_rows(dataset: Dict[str, List[Any]], row_mask: bytes) -> Dict[str, List[Any]]:
+    """Compacta todas as colunas a partir da máscara de linhas, em uma passada por coluna."""
+    return {col: values.select(row_mask) if isinstance(values, (SparseOneHotColumn, CategoricalColumn))
+            else list(compress(values, row_mask)) for col, values in dataset.items()}
+
+
+class SelectedColumn(Sequence):
+    """Visão somente leitura de uma coluna restrita às linhas de uma RowSelection."""
+
+    __slots__ = ('_column', '_indices')
+
+    def __init__(self, column: List[Any], indices: array):
+        self._column = column
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SelectedColumn(self._column, self._indices[index])
+        return self._column[self._indices[index]]
+
+    def __iter__(self):
+        return map(self._column.__getitem__, self._indices)
+
+    def tolist(self) -> List[Any]:
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SelectedColumn({self.tolist()!r})"
+
+
+class RowSelection:
+    """Seleção de linhas de um dataset guardada apenas como um array de índices ('q').
+
+    Nenhuma coluna é copiada: len() é o número de linhas selecionadas, selection['col']
+    devolve uma SelectedColumn sobre a coluna original e a iteração produz cada linha como
+    um dicionário. materialize() gera o mesmo dicionário de listas que isna()/notna()
+    retornam sem view=True.
+
+    A seleção guarda as colunas existentes no momento da criação: operações que trocam as
+    colunas do dataset (ex.: dropna) não a afetam, mas modificações feitas dentro de uma
+    coluna (ex.: fillna) aparecem nela. Use materialize() para congelar os valores."""
+
+    def __init__(self, dataset: Dict[str, List[Any]], indices: array, num_rows: int):
+        self._columns = dict(dataset)
+        self.indices = indices
+        self.num_rows = num_rows
+
+    @classmethod
+    def from_mask(cls, dataset: Dict[str, List[Any]], row_mask: bytes) -> 'RowSelection':
+        """Cria a seleção a partir de uma máscara com um byte por linha (diferente de zero = selecionada)."""
+        if np is not None:
+            indices = array('q')
+            indices.frombytes(np.flatnonzero(np.frombuffer(row_mask, dtype=np.uint8)).astype(np.int64).tobytes())
+        else:
+            indices = array('q', compress(count(), row_mask))
+        return cls(dataset, indices, len(row_mask))
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def keys(self):
+        return self._columns.keys()
+
+    def row_mask(self) -> bytes:
+        """Reconstrói a máscara de linhas, visitando apenas as linhas selecionadas."""
+        mask = bytearray(self.num_rows)
+        for index in self.indices:
+            mask[index] = 1
+        return bytes(mask)
+
+    def materialize(self) -> Dict[str, List[Any]]:
+        """Copia as linhas selecionadas de todas as colunas para um novo dicionário."""
+        return select_rows(self._columns, self.row_mask())
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __contains__(self, column_name) -> bool:
+        return column_name in self._columns
+
+    def __getitem__(self, column_name: str) -> SelectedColumn:
+        return SelectedColumn(self._columns[column_name], self.indices)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        columns = list(self._columns.items())
+        for index in self.indices:
+            yield {name: column[index] for name, column in columns}
+
+    def __repr__(self) -> str:
+        return f"RowSelection({len(self.indices)} de {self.num_rows} linhas, colunas={self.columns!r})"
@@ -0,0 +1,54 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Union
+
+from incremental_statistics import IncrementalStatistics
+from parallel import resolve_n_jobs
+
+Shard = Union[str, Dict[str, List[Any]]]
+
+
+def summarize_shard(shard: Shard, track_median: bool = False, chunk_size: int = 100_000,
+                    sketch_error: float = None) -> IncrementalStatistics:
+    """Etapa map: resume um shard (dicionário de listas ou caminho de um CSV) em estatísticas parciais.
+
+    O resumo guarda apenas contagens, média/M2, co-momentos, frequências e bigramas, de
+    modo que seu tamanho depende do número de valores distintos, não do número de linhas.
+    Shards em CSV são lidos em blocos de 'chunk_size' linhas pelo próprio processo. Com
+    sketch_error, o resumo inclui um sketch de quantis combinável (median/quantile)."""
+    summary = IncrementalStatistics(track_median=track_median, sketch_error=sketch_error)
+    if isinstance(shard, str):
+        from streaming import read_csv_chunks
+
+        for chunk in read_csv_chunks(shard, chunk_size):
+            summary.append(chunk)
+        return summary
+    return summary.append(shard)
+
+
+def merge_summaries(summaries: Iterable[IncrementalStatistics]) -> IncrementalStatistics:
+    """Etapa reduce: combina os resumos na ordem dos shards. O resultado responde às mesmas
+    consultas de Statistics sobre a concatenação dos shards (a ordem importa apenas para
+    conditional_probability, que conta as transições entre o fim de um shard e o início do seguinte)."""
+    merged = None
+    for summary in summaries:
+        merged = summary if merged is None else merged.merge(summary)
+    return merged if merged is not None else IncrementalStatistics(track_median=False)
+
+
+def sharded_statistics(shards: Iterable[Shard], n_jobs: int = None, executor: Executor = None,
+                       track_median: bool = False, chunk_size: int = 100_000,
+                       sketch_error: float = None) -> IncrementalStatistics:
+    """Driver local de map-reduce: resume cada shard em um processo e combina os resumos.
+
+    Sem 'executor', usa um ProcessPoolExecutor com 'n_jobs' processos (None ou -1 = todos os
+    núcleos). Apenas os resumos voltam ao processo principal; shards passados como caminhos
+    de CSV também não são enviados aos processos de trabalho."""
+    shards = list(shards)
+    summarize = partial(summarize_shard, track_median=track_median, chunk_size=chunk_size,
+                        sketch_error=sketch_error)
+    if executor is not None:
+        return merge_summaries(executor.map(summarize, shards))
+
+    with ProcessPoolExecutor(max_workers=max(1, min(resolve_n_jobs(n_jobs), len(shards)))) as pool:
+        return merge_summaries(pool.map(summarize, shards))
@@ -0,0 +1,85 @@
+from array import array
+from collections.abc import Sequence
+from itertools import compress, repeat
+from typing import Any, Dict, List, Tuple
+
+
+class SparseOneHotColumn(Sequence):
+    """Representação esparsa de um one-hot encoding: um código por linha (índice da
+    categoria no vocabulário, ou -1 para categorias desconhecidas) e o vocabulário.
+
+    Ocupa 8 bytes por linha, independentemente do número de categorias. Como sequência,
+    expõe os códigos; column(categoria) e densify() materializam sob demanda as colunas
+    binárias 'coluna_categoria' do one-hot denso, e to_csr() devolve a matriz no formato
+    CSR (indptr, indices)."""
+
+    __slots__ = ('name', 'categories', 'codes')
+
+    def __init__(self, name: str, categories: List[Any], codes: array):
+        self.name = name
+        # Um range (vocabulário do feature hashing) é mantido sem materializar a lista
+        self.categories = categories if isinstance(categories, range) else list(categories)
+        self.codes = codes
+
+    @classmethod
+    def encode(cls, name: str, values, categories: List[Any]) -> 'SparseOneHotColumn':
+        """Codifica os valores em uma única passada (o dicionário de lookup roda em C via map)."""
+        mapping = {category: index for index, category in enumerate(categories)}
+        return cls(name, categories, array('q', map(mapping.get, values, repeat(-1))))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SparseOneHotColumn(self.name, self.categories, self.codes[index])
+        return self.codes[index]
+
+    def select(self, row_mask: bytes) -> 'SparseOneHotColumn':
+        """Retorna as linhas cujo byte na máscara é diferente de zero, mantendo o vocabulário."""
+        return SparseOneHotColumn(self.name, self.categories, array('q', compress(self.codes, row_mask)))
+
+    def output_columns(self) -> List[str]:
+        return [f'{self.name}_{category}' for category in self.categories]
+
+    def column(self, category: Any) -> List[int]:
+        """Coluna binária densa de uma categoria (0 para todas as linhas se ela não existir)."""
+        try:
+            code = self.categories.index(category)
+        except ValueError:
+            return [0] * len(self.codes)
+        return [1 if value == code else 0 for value in self.codes]
+
+    def densify(self) -> Dict[str, List[int]]:
+        """Materializa todas as colunas do one-hot denso, na ordem do vocabulário."""
+        dense = [[0] * len(self.codes) for _ in self.categories]
+        for row, code in enumerate(self.codes):
+            if code >= 0:
+                dense[code][row] = 1
+        return dict(zip(self.output_columns(), dense))
+
+    def to_csr(self) -> Tuple[array, array]:
+        """Retorna (indptr, indices) da matriz esparsa linhas x categorias (valores implícitos iguais a 1)."""
+        indptr = array('q', [0])
+        indices = array('q')
+        total = 0
+        for code in self.codes:
+            if code >= 0:
+                indices.append(code)
+                total += 1
+            indptr.append(total)
+        return indptr, indices
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.codes) * self.codes.itemsize
+
+    def __eq__(self, other):
+        if isinstance(other, SparseOneHotColumn):
+            return self.categories == other.categories and self.codes == other.codes
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"SparseOneHotColumn({self.name!r}, categories={self.categories!r}, codes={self.codes.tolist()!r})"
@@ -0,0 +1,158 @@
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from typing import Any, Dict, List
+
+from columnar import CategoricalColumn, ColumnarDataset, TypedColumn, _infer_typecode
+from sparse import SparseOneHotColumn
+
+# Identificador e versão do formato colunar binário
+MAGIC = b'FSCOLv1\x00'
+FORMAT_VERSION = 1
+# Todos os buffers começam em posições múltiplas de 8 bytes
+_ALIGNMENT = 8
+# Tipos que a tabela de categorias (JSON) consegue representar sem perdas
+_CATEGORY_TYPES = (str, int, float, bool, type(None))
+
+
+def _padding(position: int) -> int:
+    return -position % _ALIGNMENT
+
+
+def _encode_column(name: str, column_data) -> Dict[str, Any]:
+    """Converte a coluna nos buffers a gravar. Retorna o esquema da coluna com os buffers
+    em '_buffers' (removidos antes de gravar o cabeçalho)."""
+    if isinstance(column_data, SparseOneHotColumn):
+        categories = column_data.categories
+        schema = {'name': name, 'kind': 'sparse', 'sparse_name': column_data.name,
+                  'categories': {'range': len(categories)} if isinstance(categories, range) else list(categories)}
+        codes = column_data.codes
+        if not isinstance(categories, range):
+            _check_categories(name, categories)
+        return {**schema, 'length': len(codes), '_buffers': [codes]}
+
+    if not isinstance(column_data, (TypedColumn, CategoricalColumn)):
+        values = column_data if isinstance(column_data, list) else list(column_data)
+        typecode = _infer_typecode(values)
+        column_data = TypedColumn(values, typecode) if typecode is not None else CategoricalColumn(values)
+
+    if isinstance(column_data, TypedColumn) and column_data.typecode in ('q', 'd'):
+        buffers = [column_data.values]
+        if column_data.validity is not None:
+            buffers.append(column_data.validity)
+        return {'name': name, 'kind': 'typed', 'typecode': column_data.typecode, 'length': len(column_data),
+                'has_validity': column_data.validity is not None, '_buffers': buffers}
+
+    if isinstance(column_data, TypedColumn):
+        column_data = CategoricalColumn(column_data.tolist())
+    _check_categories(name, column_data.categories)
+    return {'name': name, 'kind': 'categorical', 'length': len(column_data), 'categories': column_data.categories,
+            'ordered': column_data.ordered, '_buffers': [column_data.codes]}
+
+
+def _check_categories(name: str, categories: List[Any]):
+    if not all(isinstance(category, _CATEGORY_TYPES) for category in categories):
+        raise TypeError(f"A coluna '{name}' contém valores que não podem ser gravados "
+                        "(use apenas texto, números, booleanos ou None).")
+
+
+def save_dataset(dataset: Dict[str, List[Any]], path: str):
+    """Grava o dataset no formato colunar binário.
+
+    Layout: MAGIC, tamanho do cabeçalho (uint64), cabeçalho JSON com o esquema (nome,
+    tipo, tamanho, categorias e posição de cada buffer) e os buffers alinhados em 8 bytes:
+    valores numéricos ('q'/'d') com o bitmap de validade, códigos 'q' das colunas
+    categóricas (com o dicionário de categorias no cabeçalho) e dos one-hot esparsos."""
+    columns = [_encode_column(name, values) for name, values in dataset.items()]
+    lengths = {column['length'] for column in columns}
+    if len(lengths) > 1:
+        raise ValueError("Todas as colunas no dataset devem ter o mesmo tamanho.")
+
+    # As posições dos buffers são relativas ao início da área de dados
+    position = 0
+    for column in columns:
+        column['buffers'] = []
+        for buffer in column['_buffers']:
+            position += _padding(position)
+            nbytes = memoryview(buffer).nbytes
+            column['buffers'].append([position, nbytes])
+            position += nbytes
+
+    buffers = [column.pop('_buffers') for column in columns]
+    header = json.dumps({'version': FORMAT_VERSION, 'byteorder': sys.byteorder,
+                         'num_rows': lengths.pop() if lengths else 0, 'columns': columns}).encode('utf-8')
+    data_start = len(MAGIC) + 8 + len(header)
+    data_start += _padding(data_start)
+
+    # Grava em um arquivo temporário e o renomeia no fim: truncar o arquivo de destino
+    # invalidaria colunas que ainda estejam mapeadas a partir dele (inclusive as do próprio
+    # dataset sendo gravado)
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as output:
+            output.write(MAGIC)
+            output.write(len(header).to_bytes(8, 'little'))
+            output.write(header)
+            output.write(b'\x00' * (data_start - output.tell()))
+            written = 0
+            for column, column_buffers in zip(columns, buffers):
+                for (offset, _), buffer in zip(column['buffers'], column_buffers):
+                    output.write(b'\x00' * (offset - written))
+                    output.write(buffer)
+                    written = offset + memoryview(buffer).nbytes
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def open_dataset(path: str) -> ColumnarDataset:
+    """Abre um arquivo gravado por save_dataset via mmap, sem ler as linhas.
+
+    Só o cabeçalho é lido: cada coluna vira uma TypedColumn, CategoricalColumn ou
+    SparseOneHotColumn apoiada em memoryviews somente leitura do arquivo mapeado, de modo
+    que as páginas só são lidas do disco quando a coluna é acessada. A primeira escrita
+    em uma coluna copia o buffer dela para a memória (o arquivo nunca é modificado)."""
+    with open(path, 'rb') as source:
+        if source.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"O arquivo '{path}' não está no formato colunar binário.")
+        header_size = int.from_bytes(source.read(8), 'little')
+        header = json.loads(source.read(header_size).decode('utf-8'))
+        if header['version'] != FORMAT_VERSION:
+            raise ValueError(f"Versão do formato não suportada: {header['version']}.")
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError("O arquivo foi gravado em uma máquina com outra ordem de bytes.")
+
+        data_start = len(MAGIC) + 8 + header_size
+        data_start += _padding(data_start)
+        # Um arquivo sem buffers (dataset vazio ou só com colunas vazias) não pode ser mapeado
+        has_data = any(nbytes for column in header['columns'] for _, nbytes in column['buffers'])
+        mapped = memoryview(mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)) if has_data else None
+
+    def buffer(offset_nbytes, typecode):
+        offset, nbytes = offset_nbytes
+        if not nbytes:
+            return memoryview(array(typecode))
+        view = mapped[data_start + offset:data_start + offset + nbytes]
+        return view.cast(typecode) if typecode != 'B' else view
+
+    dataset = ColumnarDataset()
+    for column in header['columns']:
+        kind = column['kind']
+        if kind == 'typed':
+            values = buffer(column['buffers'][0], column['typecode'])
+            validity = buffer(column['buffers'][1], 'B') if column['has_validity'] else None
+            dataset[column['name']] = TypedColumn.from_buffers(values, validity)
+        elif kind == 'categorical':
+            codes = buffer(column['buffers'][0], 'q')
+            dataset[column['name']] = CategoricalColumn.from_codes(codes, column['categories'], column['ordered'])
+        else:
+            categories = column['categories']
+            if isinstance(categories, dict):
+                categories = range(categories['range'])
+            dataset[column['name']] = SparseOneHotColumn(column['sparse_name'], categories,
+                                                         buffer(column['buffers'][0], 'q'))
+    return dataset
@@ -0,0 +1,314 @@
+import csv
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Set, Union
+
+from csv_loader import parse_value
+from fitted import (DEFAULT_HASH_FEATURES, DropState, FillState, FittedPipeline, HashState, LabelState,
+                    MinMaxState, OneHotState, SparseOneHotState, StandardState)
+from lazy import ENCODE_METHODS, FILL_METHODS, SCALE_METHODS
+from preprocessing import MissingValueProcessor
+from quantiles import KLLSketch
+
+Chunk = Dict[str, List[Any]]
+
+
+def read_csv_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    """Lê um CSV com cabeçalho em blocos de até 'chunk_size' linhas, no formato de dicionário de listas."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        rows = []
+        for row in reader:
+            if len(row) != len(header):
+                raise ValueError(f"A linha {reader.line_num} tem {len(row)} campos, mas o cabeçalho tem {len(header)}.")
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield _rows_to_columns(header, rows)
+                rows = []
+        if rows:
+            yield _rows_to_columns(header, rows)
+
+
+def _rows_to_columns(header: List[str], rows: List[List[str]]) -> Chunk:
+    return {name: [parse_value(field) for field in values] for name, values in zip(header, zip(*rows))}
+
+
+class _ColumnSummary:
+    """Estatísticas de uma coluna acumuladas bloco a bloco (combinação de Chan para média/M2)."""
+
+    def __init__(self, track_frequencies: bool, track_quantiles: bool = False):
+        self.rows = 0
+        self.nulls = 0
+        self.numeric = True  # todos os valores não nulos são int/float (exceto bool)
+        self.count = 0       # quantidade de valores numéricos
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_value = None
+        self.max_value = None
+        self.frequencies = Counter() if track_frequencies else None
+        self.sketch = KLLSketch() if track_quantiles else None
+
+    def update(self, values: List[Any]):
+        present = [value for value in values if value is not None]
+        self.rows += len(values)
+        self.nulls += len(values) - len(present)
+
+        numeric_values = [value for value in present if isinstance(value, (int, float))]
+        if len(numeric_values) != len(present) or any(isinstance(value, bool) for value in numeric_values):
+            self.numeric = False
+        if numeric_values:
+            chunk_mean = sum(numeric_values) / len(numeric_values)
+            chunk_m2 = sum((value - chunk_mean) ** 2 for value in numeric_values)
+            self._merge_moments(len(numeric_values), chunk_mean, chunk_m2, min(numeric_values), max(numeric_values))
+            if self.sketch is not None:
+                self.sketch.update_many(numeric_values)
+
+        if self.frequencies is not None:
+            self.frequencies.update(present)
+
+    def _merge_moments(self, count: int, mean: float, m2: float, min_value: Any, max_value: Any):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min_value = min_value if self.min_value is None else min(self.min_value, min_value)
+        self.max_value = max_value if self.max_value is None else max(self.max_value, max_value)
+
+    def fill(self, value: Any):
+        """Atualiza o resumo como se os nulos tivessem sido preenchidos com 'value'."""
+        if not self.nulls:
+            return
+        if isinstance(value, (int, float)):
+            self._merge_moments(self.nulls, value, 0.0, value, value)
+            if self.sketch is not None:
+                self.sketch.update(value, self.nulls)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            self.numeric = False
+        if self.frequencies is not None:
+            self.frequencies[value] += self.nulls
+        self.nulls = 0
+
+    def rescale(self, offset: float, divisor: float):
+        """Atualiza o resumo após a transformação (x - offset) / divisor (ou 0.0 se divisor == 0)."""
+        if divisor == 0:
+            self.mean, self.m2, self.min_value, self.max_value = 0.0, 0.0, 0.0, 0.0
+            mapped = lambda value: 0.0  # noqa: E731
+        else:
+            self.mean = (self.mean - offset) / divisor
+            self.m2 = self.m2 / divisor ** 2
+            self.min_value = (self.min_value - offset) / divisor
+            self.max_value = (self.max_value - offset) / divisor
+            mapped = lambda value: float((value - offset) / divisor)  # noqa: E731
+        if self.frequencies is not None:
+            self.frequencies = self._remap(mapped)
+        if self.sketch is not None:
+            self.sketch.map_values(mapped)
+
+    def _remap(self, mapping: Callable[[Any], Any]) -> Counter:
+        remapped = Counter()
+        for value, count in self.frequencies.items():
+            remapped[mapping(value)] += count
+        return remapped
+
+    def categories(self) -> List[Any]:
+        present = set(self.frequencies)
+        if self.nulls:
+            present.add(None)
+        return sorted(present)
+
+    @classmethod
+    def from_frequencies(cls, frequencies: Counter, rows: int) -> '_ColumnSummary':
+        """Reconstrói o resumo de uma coluna numérica sem nulos a partir da contagem de valores."""
+        summary = cls(track_frequencies=True, track_quantiles=True)
+        summary.rows = rows
+        frequencies = Counter({value: count for value, count in frequencies.items() if count > 0})
+        for value, count in frequencies.items():
+            summary._merge_moments(count, value, 0.0, value, value)
+            summary.sketch.update(value, count)
+        summary.frequencies = frequencies
+        return summary
+
+
+class StreamingPreprocessing:
+    """Pré-processamento fora da memória, em blocos de tamanho fixo.
+
+    As operações são registradas como no modo preguiçoso. fit() faz uma primeira
+    passada acumulando, por coluna, contagem, média/variância, mínimo/máximo e (quando
+    necessário) a contagem de categorias; os parâmetros de cada etapa são derivados
+    desses resumos, sem reler os dados. transform_to_csv()/iter_transform() fazem a
+    segunda passada aplicando os parâmetros bloco a bloco. O pico de memória depende
+    do tamanho do bloco, não do tamanho do arquivo.
+
+    Limitações: dropna só é aceito antes das demais etapas, e fillna(method='median')
+    não está disponível neste modo; use method='approx_median', que mantém um sketch de
+    quantis KLL por coluna durante a primeira passada."""
+
+    def __init__(self, source: Union[str, Callable[[], Iterator[Chunk]]], chunk_size: int = 100_000):
+        if chunk_size <= 0:
+            raise ValueError("O 'chunk_size' deve ser positivo.")
+        self.source = source
+        self.chunk_size = chunk_size
+        self._dropna_columns: List[Set[str]] = []
+        self._steps: List[tuple] = []
+        self.states: List[Any] = None
+
+    def _chunks(self) -> Iterator[Chunk]:
+        chunks = read_csv_chunks(self.source, self.chunk_size) if isinstance(self.source, str) else self.source()
+        for chunk in chunks:
+            for columns in self._dropna_columns:
+                MissingValueProcessor(chunk).dropna(columns=columns)
+            yield chunk
+
+    def fillna(self, columns: Set[str] = None, method: str = 'mean', default_value: Any = 0):
+        """Registra um fillna. Retorna 'self' para permitir encadeamento de métodos."""
+        if method not in FILL_METHODS:
+            raise ValueError(f"Método '{method}' não suportado. Use: 'mean', 'median', 'approx_median', 'mode', 'default_value'")
+        if method == 'median':
+            raise ValueError("fillna(method='median') não é suportado no modo streaming. Use method='approx_median'.")
+        self._steps.append(('fillna', columns, method, default_value))
+        return self
+
+    def dropna(self, columns: Set[str] = None):
+        """Registra um dropna (apenas antes das demais etapas). Retorna 'self'."""
+        if self._steps:
+            raise ValueError("No modo streaming, dropna deve ser registrado antes das demais etapas.")
+        self._dropna_columns.append(columns)
+        return self
+
+    def scale(self, columns: Set[str] = None, method: str = 'minMax'):
+        """Registra um scale. Retorna 'self' para permitir encadeamento de métodos."""
+        if method not in SCALE_METHODS:
+            raise ValueError(f"Método de escalonamento '{method}' não suportado. Use 'minMax' ou 'standard'.")
+        self._steps.append(('scale', columns, method, None))
+        return self
+
+    def encode(self, columns: Set[str], method: str = 'label', n_features: int = DEFAULT_HASH_FEATURES,
+               seed: int = 0):
+        """Registra um encode. Retorna 'self' para permitir encadeamento de métodos. O método 'hash'
+        não acumula categorias na primeira passada: a memória por coluna é constante."""
+        if method not in ENCODE_METHODS:
+            raise ValueError(f"Método de codificação '{method}' não suportado. Use 'label', 'oneHot', 'sparseOneHot' ou 'hash'.")
+        self._steps.append(('encode', columns, method, (n_features, seed) if method == 'hash' else None))
+        return self
+
+    def fit(self):
+        """Primeira passada: acumula os resumos por coluna e deriva os parâmetros de cada etapa."""
+        summaries: Dict[str, _ColumnSummary] = None
+        for chunk in self._chunks():
+            if summaries is None:
+                summaries = self._create_summaries(list(chunk.keys()))
+            for column_name, summary in summaries.items():
+                summary.update(chunk[column_name])
+
+        self.states = []
+        for operation, columns, method, parameter in self._steps:
+            target_columns = list(columns) if columns else list(summaries or {})
+            for column_name in target_columns:
+                if not summaries or column_name not in summaries:
+                    continue
+                state = self._fit_step(summaries, column_name, operation, method, parameter)
+                if state is not None:
+                    self.states.append(state)
+        return self
+
+    def _create_summaries(self, header: List[str]) -> Dict[str, _ColumnSummary]:
+        referenced, needs_frequencies, needs_quantiles = set(), set(), set()
+        for operation, columns, method, _ in self._steps:
+            target_columns = set(columns) if columns else set(header)
+            referenced |= target_columns
+            if (operation == 'encode' and method != 'hash') or method == 'mode':
+                needs_frequencies |= target_columns
+            elif method == 'approx_median':
+                needs_quantiles |= target_columns
+        return {name: _ColumnSummary(name in needs_frequencies, name in needs_quantiles)
+                for name in header if name in referenced}
+
+    @staticmethod
+    def _fit_step(summaries, column_name, operation, method, parameter):
+        """Deriva o estado de uma etapa a partir do resumo da coluna e atualiza o resumo.
+        'parameter' é o default_value do fillna ou (n_features, seed) do encode 'hash'."""
+        summary = summaries[column_name]
+
+        if operation == 'fillna':
+            default_value = parameter
+            if method == 'mean':
+                fill_value = float(summary.mean) if summary.count else default_value
+            elif method == 'approx_median':
+                fill_value = float(summary.sketch.median()) if summary.sketch.count else default_value
+            elif method == 'mode':
+                fill_value = max(summary.frequencies.items(), key=lambda item: item[1])[0] \
+                    if summary.frequencies else default_value
+            else:
+                fill_value = default_value
+            summary.fill(fill_value)
+            return FillState(column_name, fill_value)
+
+        if operation == 'scale':
+            if not summary.numeric or not summary.rows:
+                return None
+            if summary.nulls:
+                raise TypeError(f"A coluna '{column_name}' contém valores ausentes e não pode ser escalonada.")
+            if method == 'minMax':
+                state = MinMaxState(column_name, summary.min_value, summary.max_value - summary.min_value)
+                summary.rescale(state.min_value, state.value_range)
+            else:
+                state = StandardState(column_name, summary.mean, (summary.m2 / summary.count) ** 0.5)
+                summary.rescale(state.mean, state.std_deviation)
+            return state
+
+        if method == 'hash':
+            state = HashState(column_name, *parameter)
+            if summary.frequencies is None:
+                del summaries[column_name]
+            else:
+                summaries[column_name] = _ColumnSummary.from_frequencies(summary._remap(state.map_value), summary.rows)
+            return state
+
+        categories = summary.categories()
+        if method in ('label', 'sparseOneHot'):
+            # O one-hot esparso grava um código por linha, como o label encoding
+            state = (LabelState if method == 'label' else SparseOneHotState)(column_name, categories)
+            summaries[column_name] = _ColumnSummary.from_frequencies(summary._remap(state.map_value), summary.rows)
+            return state
+
+        state = OneHotState(column_name, categories)
+        del summaries[column_name]
+        for category, new_column_name in zip(categories, state.output_columns()):
+            ones = summary.frequencies[category] if category is not None else summary.nulls
+            summaries[new_column_name] = _ColumnSummary.from_frequencies(
+                Counter({1: ones, 0: summary.rows - ones}), summary.rows)
+        return state
+
+    def pipeline(self) -> FittedPipeline:
+        """Retorna os parâmetros ajustados em fit() como um FittedPipeline persistível."""
+        if self.states is None:
+            raise RuntimeError("Chame fit() antes de transformar os dados.")
+        return FittedPipeline([DropState(columns) for columns in self._dropna_columns] + self.states)
+
+    def iter_transform(self) -> Iterator[Chunk]:
+        """Segunda passada: aplica os parâmetros ajustados e devolve os blocos transformados."""
+        if self.states is None:
+            raise RuntimeError("Chame fit() antes de transformar os dados.")
+        for chunk in self._chunks():
+            for state in self.states:
+                state.transform(chunk)
+            yield chunk
+
+    def transform_to_csv(self, path: str) -> int:
+        """Grava o resultado da segunda passada em CSV, bloco a bloco. Retorna o número de linhas escritas."""
+        rows_written = 0
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            header = None
+            for chunk in self.iter_transform():
+                if header is None:
+                    header = list(chunk.keys())
+                    writer.writerow(header)
+                columns = [chunk[name] for name in header]
+                writer.writerows(zip(*columns))
+                rows_written += len(columns[0]) if columns else 0
+        return rows_written
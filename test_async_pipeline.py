@@ -0,0 +1,94 @@
+import asyncio
+import copy
+import unittest
+from contextlib import aclosing
+
+from async_pipeline import AsyncPipeline, InMemoryProducer
+from preprocessing import Preprocessing
+
+
+class TestAsyncPipeline(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        train = {
+            'tempo': [10.0, None, 30.0, 20.0],
+            'distancia': [1.0, 2.0, 3.0, None],
+            'bairro': ['Pina', 'Torre', 'Pina', 'Derby'],
+        }
+        self.pipeline = Preprocessing(train).lazy() \
+            .fillna(columns={'tempo', 'distancia'}, method='mean') \
+            .scale(columns={'tempo'}, method='minMax') \
+            .encode(columns={'bairro'}, method='oneHot') \
+            .fit()
+        self.events = {
+            'tempo': [None, 15.0, 25.0, None, 40.0],
+            'distancia': [2.5, None, 1.0, 4.0, 2.0],
+            'bairro': ['Torre', 'Pina', 'Derby', 'Pina', 'Torre'],
+        }
+
+    async def test_stream_matches_batch_transform(self):
+        expected = self.pipeline.transform(copy.deepcopy(self.events))
+        producer = InMemoryProducer.from_dataset(self.events, batch_size=2)
+
+        batches = [batch async for batch in AsyncPipeline(self.pipeline, maxsize=1).stream(producer)]
+        self.assertEqual([len(batch['tempo']) for batch in batches], [2, 2, 1])
+        self.assertEqual({name: [value for batch in batches for value in batch[name]] for name in expected},
+                         expected)
+
+        received = []
+        rows = await AsyncPipeline(self.pipeline, offload=False).run(
+            InMemoryProducer.from_dataset(self.events, batch_size=3), received.append)
+        self.assertEqual(rows, 5)
+        self.assertEqual(received[0]['bairro_Torre'], [1, 0, 0])
+
+    async def test_backpressure_with_live_producer(self):
+        producer = InMemoryProducer(maxsize=1)
+        produced = []
+
+        async def feed():
+            for index in range(20):
+                await producer.put({'tempo': [float(index)], 'distancia': [1.0], 'bairro': ['Pina']})
+                produced.append(index)
+            await producer.close()
+
+        ahead = []
+
+        async def slow_sink(batch):
+            ahead.append(len(produced) - len(ahead))
+            await asyncio.sleep(0.001)
+
+        feeder = asyncio.create_task(feed())
+        rows = await AsyncPipeline(self.pipeline, maxsize=1).run(producer, slow_sink)
+        await feeder
+        self.assertEqual(rows, 20)
+        # Filas limitadas: a produção nunca se adianta mais que alguns lotes ao consumo
+        self.assertLessEqual(max(ahead), 6)
+        with self.assertRaises(RuntimeError):
+            await producer.put({'tempo': [1.0]})
+
+    async def test_errors_propagate_and_stopping_cancels_stages(self):
+        producer = InMemoryProducer([{'tempo': ['lento'], 'distancia': [1.0], 'bairro': ['Pina']}])
+        with self.assertRaises(TypeError):
+            async for _ in AsyncPipeline(self.pipeline).stream(producer):
+                pass
+
+        async def failing_source():
+            yield copy.deepcopy(self.events)
+            raise ConnectionError('fonte indisponível')
+
+        received = []
+        with self.assertRaises(ConnectionError):
+            await AsyncPipeline(self.pipeline).run(failing_source(), received.append)
+        self.assertEqual(len(received), 1)
+
+        before = len(asyncio.all_tasks())
+        live = InMemoryProducer()
+        await live.put(copy.deepcopy(self.events))
+        async with aclosing(AsyncPipeline(self.pipeline).stream(live)) as stream:
+            async for _ in stream:
+                break
+        self.assertEqual(len(asyncio.all_tasks()), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import copy
+
+from columnar import CategoricalColumn, ColumnarDataset, TypedColumn
+from food_statistics import Statistics
+from preprocessing import Preprocessing
+
+
+class TestTypedColumn(unittest.TestCase):
+
+    def test_numeric_storage_and_nulls(self):
+        column = TypedColumn([1, None, 3])
+        self.assertEqual(column.typecode, 'q')
+        self.assertEqual(column.tolist(), [1, None, 3])
+        self.assertEqual(column.null_count, 1)
+        self.assertEqual(column.null_mask(), b'\x00\x01\x00')
+
+        column[1] = 2
+        self.assertEqual(column, [1, 2, 3])
+        self.assertEqual(column.null_count, 0)
+
+    def test_promotion_on_assignment(self):
+        column = TypedColumn([1, 2])
+        column[0] = 0.5
+        self.assertEqual(column.typecode, 'd')
+        self.assertEqual(column, [0.5, 2.0])
+
+        column[1] = 'texto'
+        self.assertEqual(column.typecode, 'O')
+        self.assertEqual(column, [0.5, 'texto'])
+
+    def test_append_keeps_bitmap_in_sync(self):
+        column = TypedColumn([None] * 8)
+        column.append(9)
+        column.append(None)
+        self.assertEqual(column.tolist(), [None] * 8 + [9, None])
+
+    def test_memory_per_numeric_cell(self):
+        column = TypedColumn([float(i) for i in range(10000)])
+        self.assertLessEqual(column.nbytes / len(column), 8)
+
+
+class TestColumnarDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'idade': [20, 30, None, 50],
+            'salario': [500.0, None, 800.0, 1200.0],
+            'cidade': ['A', 'B', 'A', None]
+        }
+
+    def test_columns_are_typed(self):
+        dataset = ColumnarDataset(self.data)
+        self.assertIsInstance(dataset['idade'], TypedColumn)
+        self.assertIsInstance(dataset['cidade'], list)
+        self.assertEqual(dataset.to_dict(), self.data)
+
+    def test_statistics_accepts_columnar(self):
+        stats = Statistics(ColumnarDataset({'x': [2, 4, 4, 4, 5, 5, 7, 9]}))
+        self.assertAlmostEqual(stats.mean('x'), 5.0)
+        self.assertAlmostEqual(stats.stdev('x'), 2.0)
+        self.assertEqual(stats.mode('x'), [4])
+
+    def test_missing_value_masks(self):
+        data = {'a': [1, None, 3, 4, 5, 6, 7, 8, None, 10],
+                'b': [None, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
+                'c': list('abcdefghij')}
+        preprocessor = Preprocessing(ColumnarDataset(data))
+        self.assertEqual(preprocessor.isna(columns={'a', 'b'})['c'], ['a', 'b', 'i'])
+        self.assertEqual(preprocessor.notna(columns={'a'})['b'], [None, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 10.0])
+
+        preprocessor.dropna()
+        self.assertEqual(preprocessor.dataset['a'], [3, 4, 5, 6, 7, 8, 10])
+        self.assertEqual(preprocessor.dataset['c'], list('cdefghj'))
+        self.assertIsInstance(preprocessor.dataset['a'], TypedColumn)
+
+    def test_pipeline_matches_dict_backend(self):
+        expected = Preprocessing(copy.deepcopy(self.data))
+        expected.fillna(columns={'idade'}, method='mean') \
+                .dropna(columns={'cidade'}) \
+                .fillna(columns={'salario'}, method='median') \
+                .scale(columns={'idade', 'salario'}, method='standard') \
+                .encode(columns={'cidade'}, method='oneHot')
+
+        columnar = Preprocessing(copy.deepcopy(self.data), columnar=True)
+        columnar.fillna(columns={'idade'}, method='mean') \
+                .dropna(columns={'cidade'}) \
+                .fillna(columns={'salario'}, method='median') \
+                .scale(columns={'idade', 'salario'}, method='standard') \
+                .encode(columns={'cidade'}, method='oneHot')
+
+        self.assertIsInstance(columnar.dataset, ColumnarDataset)
+        result = columnar.dataset.to_dict()
+        self.assertEqual(set(result), set(expected.dataset))
+        for column, values in expected.dataset.items():
+            for expected_value, value in zip(values, result[column]):
+                self.assertAlmostEqual(expected_value, value)
+
+
+class TestCategoricalColumn(unittest.TestCase):
+
+    def setUp(self):
+        self.values = ['SP', 'RJ', 'SP', 'MG', 'SP', 'RJ']
+
+    def test_codes_and_sequence_interface(self):
+        column = CategoricalColumn(self.values)
+        self.assertEqual(column.categories, ['MG', 'RJ', 'SP'])
+        self.assertTrue(column.ordered)
+        self.assertEqual(column.codes.tolist(), [2, 1, 2, 0, 2, 1])
+        self.assertEqual(column, self.values)
+        self.assertEqual(column.value_counts(), {'SP': 3, 'RJ': 2, 'MG': 1})
+
+        column[3] = 'BA'
+        column.append(None)
+        self.assertFalse(column.ordered)
+        self.assertEqual(column.tolist(), ['SP', 'RJ', 'SP', 'BA', 'SP', 'RJ', None])
+        self.assertEqual(column.value_counts(), {'SP': 3, 'RJ': 2, 'BA': 1, None: 1})
+        self.assertEqual(column.null_mask(), b'\x00' * 6 + b'\x01')
+        self.assertEqual(column.select(b'\x01\x01\x00\x00\x00\x00\x01'), ['SP', 'RJ', None])
+
+    def test_dataset_opt_in(self):
+        dataset = ColumnarDataset({'uf': self.values, 'n': [1, 2, 3, 4, 5, 6]}, categorical=True)
+        self.assertIsInstance(dataset['uf'], CategoricalColumn)
+        self.assertIsInstance(dataset['n'], TypedColumn)
+        self.assertEqual(dataset.to_dict()['uf'], self.values)
+
+        stats = Statistics(dataset)
+        self.assertEqual(stats.mode('uf'), ['SP'])
+        self.assertEqual(stats.itemset('uf'), {'SP', 'RJ', 'MG'})
+        self.assertEqual(stats.absolute_frequency('uf'), Statistics({'uf': self.values}).absolute_frequency('uf'))
+
+    def test_label_encode_is_view_of_codes(self):
+        dataset = ColumnarDataset({'uf': self.values}, categorical=True)
+        codes = dataset['uf'].codes
+        Preprocessing(dataset).encode(columns={'uf'}, method='label')
+        self.assertEqual(dataset['uf'], [2, 1, 2, 0, 2, 1])
+        self.assertEqual(dataset['uf']._values.obj, codes)
+
+    def test_encoders_match_list_backend(self):
+        for method in ('label', 'oneHot', 'sparseOneHot'):
+            expected = Preprocessing({'uf': list(self.values)}).encode(columns={'uf'}, method=method)
+            categorical = Preprocessing(ColumnarDataset({'uf': self.values}, categorical=True))
+            categorical.encode(columns={'uf'}, method=method)
+            self.assertEqual(dict(categorical.dataset), expected.dataset)
+
+    def test_fillna_and_dropna(self):
+        dataset = ColumnarDataset({'uf': ['SP', None, 'RJ', 'SP'], 'n': [1, 2, 3, 4]}, categorical=True)
+        self.assertEqual(Preprocessing(dataset).isna()['n'], [2])
+        Preprocessing(dataset).fillna(columns={'uf'}, method='mode')
+        self.assertEqual(dataset['uf'], ['SP', 'SP', 'RJ', 'SP'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from columnar import CategoricalColumn, ColumnarDataset, TypedColumn
+from csv_loader import read_csv
+from preprocessing import Preprocessing
+from streaming import read_csv_chunks
+
+
+class TestReadCsv(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'pedidos.csv')
+        lines = ['id,tempo,bairro,ativo,obs']
+        for index in range(200):
+            tempo = '' if index % 7 == 0 else f'{10 + index * 0.5}'
+            bairro = ['Pina', 'Torre', 'Derby', ''][index % 4]
+            ativo = 'true' if index % 3 else 'false'
+            obs = '"com, vírgula"' if index % 50 == 0 else f'nota {index % 5}'
+            lines.append(f'{index},{tempo},{bairro},{ativo},{obs}')
+        self._write('\n'.join(lines) + '\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, text, newline='\n'):
+        with open(self.path, 'w', encoding='utf-8', newline=newline) as output:
+            output.write(text)
+
+    def test_infers_types_and_nulls(self):
+        dataset = read_csv(self.path)
+        self.assertIsInstance(dataset, ColumnarDataset)
+        self.assertIsInstance(dataset['id'], TypedColumn)
+        self.assertEqual(dataset['id'].typecode, 'q')
+        self.assertEqual(dataset['tempo'].typecode, 'd')
+        self.assertEqual(dataset['tempo'].null_count, 29)
+        self.assertIsInstance(dataset['bairro'], CategoricalColumn)
+        self.assertEqual(dataset['bairro'][:4], ['Pina', 'Torre', 'Derby', None])
+        self.assertEqual(dataset['ativo'][:2], [False, True])
+        self.assertEqual(dataset['obs'][0], 'com, vírgula')
+
+    def test_matches_row_by_row_parsing(self):
+        expected = next(read_csv_chunks(self.path, 1000))
+        result = read_csv(self.path, columnar=False, block_size=64)
+        for column in ('id', 'tempo', 'bairro', 'obs'):
+            self.assertEqual(result[column], expected[column])
+        self.assertEqual(result, read_csv(self.path, columnar=False))
+        self.assertEqual(result, read_csv(self.path, columnar=False, n_jobs=2))
+
+    def test_quoted_newlines_crlf_and_type_promotion(self):
+        self._write('a,b,c\r\n1,"linha\r\num",\r\n2.5,x,\r\n\r\n', newline='')
+        result = read_csv(self.path, columnar=False, block_size=8)
+        self.assertEqual(result, {'a': [1.0, 2.5], 'b': ['linha\r\num', 'x'], 'c': [None, None]})
+
+    def test_wrong_field_count_and_empty_file(self):
+        self._write('a,b\n1,2\n3\n')
+        with self.assertRaises(ValueError):
+            read_csv(self.path)
+
+        self._write('')
+        self.assertEqual(read_csv(self.path, columnar=False), {})
+        self._write('a,b\n')
+        self.assertEqual(read_csv(self.path, columnar=False), {'a': [], 'b': []})
+
+    def test_preprocessing_from_csv(self):
+        preprocessor = Preprocessing.from_csv(self.path)
+        preprocessor.fillna(columns={'tempo'}, method='mean') \
+                    .fillna(columns={'bairro'}, method='mode') \
+                    .encode(columns={'bairro'}, method='label')
+        self.assertEqual(preprocessor.dataset['tempo'].null_count, 0)
+        self.assertEqual(sorted(set(preprocessor.dataset['bairro'])), [0, 1, 2])
+        self.assertEqual(preprocessor.statistics.mode('ativo'), [True])
+
+        plain = Preprocessing.from_csv(self.path, columnar=False)
+        self.assertIsInstance(plain.dataset['id'], list)
+
+
+if __name__ == '__main__':
+    unittest.main()
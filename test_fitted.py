@@ -0,0 +1,129 @@
+import copy
+import os
+import tempfile
+import unittest
+
+from fitted import FittedPipeline, MinMaxState
+from preprocessing import Encoder, MissingValueProcessor, Preprocessing, Scaler
+
+
+class TestFitTransform(unittest.TestCase):
+
+    def setUp(self):
+        self.train = {
+            'tempo_entrega': [30, None, 45, 25, 50],
+            'distancia': [1.5, 3.0, 2.0, None, 4.5],
+            'cidade': ['Itabuna', 'Ilhéus', 'Itabuna', 'Salvador', None],
+        }
+
+    def test_fit_does_not_modify_dataset(self):
+        data = copy.deepcopy(self.train)
+        MissingValueProcessor(data).fit(columns={'tempo_entrega'}, method='mean')
+        self.assertEqual(data, self.train)
+
+        clean = {'tempo_entrega': [30, 40, 45], 'cidade': ['Itabuna', 'Ilhéus', 'Itabuna']}
+        original = copy.deepcopy(clean)
+        Scaler(clean).fit(columns={'tempo_entrega'}, method='standard')
+        Encoder(clean).fit(columns={'cidade'}, method='oneHot')
+        self.assertEqual(clean, original)
+
+    def test_transform_reuses_training_parameters(self):
+        scaler = Scaler({'feature': [10, 20, 30]})
+        states = scaler.fit(columns={'feature'}, method='minMax')
+        self.assertIsInstance(states[0], MinMaxState)
+
+        new_data = Scaler({'feature': [20, 40]})
+        new_data.transform(states)
+        self.assertEqual(new_data.dataset['feature'], [0.5, 1.5])
+
+    def test_fit_rejects_unknown_methods(self):
+        with self.assertRaises(ValueError):
+            Scaler({'a': [1]}).fit(method='invalid_method')
+        with self.assertRaises(ValueError):
+            Encoder({'a': ['x']}).fit(columns={'a'}, method='invalid_method')
+
+
+class TestFittedPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.train = {
+            'tempo_entrega': [30, None, 45, 25, 50],
+            'distancia': [1.5, 3.0, 2.0, None, 4.5],
+            'cidade': ['Itabuna', 'Ilhéus', 'Itabuna', 'Salvador', None],
+        }
+        self.pipeline = Preprocessing(copy.deepcopy(self.train)).lazy() \
+            .dropna(columns={'cidade'}) \
+            .fillna(columns={'tempo_entrega', 'distancia'}, method='median') \
+            .scale(columns={'tempo_entrega'}, method='standard') \
+            .scale(columns={'distancia'}, method='minMax') \
+            .encode(columns={'cidade'}, method='oneHot') \
+            .fit()
+
+    def test_fit_matches_eager_execution(self):
+        expected = Preprocessing(copy.deepcopy(self.train))
+        expected.dropna(columns={'cidade'}) \
+                .fillna(columns={'tempo_entrega', 'distancia'}, method='median') \
+                .scale(columns={'tempo_entrega'}, method='standard') \
+                .scale(columns={'distancia'}, method='minMax') \
+                .encode(columns={'cidade'}, method='oneHot')
+
+        result = self.pipeline.transform(copy.deepcopy(self.train))
+        self.assertEqual(set(result), set(expected.dataset))
+        for column, values in expected.dataset.items():
+            for expected_value, value in zip(values, result[column]):
+                self.assertAlmostEqual(expected_value, value)
+
+    def test_transform_record_matches_batch(self):
+        batch = self.pipeline.transform(copy.deepcopy(self.train))
+        record = {'tempo_entrega': 30, 'distancia': 1.5, 'cidade': 'Itabuna'}
+        transformed = self.pipeline.transform_record(record)
+        for column, value in transformed.items():
+            self.assertAlmostEqual(batch[column][0], value)
+        # O registro original não é modificado
+        self.assertEqual(record['cidade'], 'Itabuna')
+
+    def test_record_dropped_and_unknown_category(self):
+        self.assertIsNone(self.pipeline.transform_record({'tempo_entrega': 1, 'distancia': 1.0, 'cidade': None}))
+        transformed = self.pipeline.transform_record({'tempo_entrega': None, 'distancia': 2.0, 'cidade': 'Recife'})
+        self.assertEqual([transformed[f'cidade_{city}'] for city in ('Ilhéus', 'Itabuna', 'Salvador')], [0, 0, 0])
+
+    def test_save_and_load_round_trip(self):
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            self.pipeline.save(path)
+            loaded = FittedPipeline.load(path)
+        finally:
+            os.remove(path)
+
+        record = {'tempo_entrega': 41, 'distancia': None, 'cidade': 'Salvador'}
+        self.assertEqual(loaded.transform_record(record), self.pipeline.transform_record(record))
+        self.assertEqual(len(loaded), len(self.pipeline))
+
+    def test_sparse_oneHot_state_round_trip(self):
+        pipeline = Preprocessing(copy.deepcopy(self.train)).lazy() \
+            .dropna(columns={'cidade'}) \
+            .encode(columns={'cidade'}, method='sparseOneHot') \
+            .fit()
+        loaded = FittedPipeline.from_dict(pipeline.to_dict())
+        result = loaded.transform(copy.deepcopy(self.train))
+        self.assertEqual(list(result['cidade']), [1, 0, 1, 2])
+        self.assertEqual(loaded.transform_record({'cidade': 'Recife'})['cidade'], -1)
+
+    def test_hash_state_round_trip(self):
+        pipeline = Preprocessing(copy.deepcopy(self.train)).lazy() \
+            .encode(columns={'cidade'}, method='hash', n_features=16, seed=7) \
+            .fit()
+        loaded = FittedPipeline.from_dict(pipeline.to_dict())
+        record = {'cidade': 'Recife'}
+        self.assertEqual(loaded.transform_record(record), pipeline.transform_record(record))
+        self.assertEqual(list(loaded.transform(copy.deepcopy(self.train))['cidade']),
+                         list(pipeline.transform(copy.deepcopy(self.train))['cidade']))
+
+    def test_load_rejects_unknown_version(self):
+        with self.assertRaises(ValueError):
+            FittedPipeline.from_dict({'version': 99, 'steps': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
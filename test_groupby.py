@@ -0,0 +1,60 @@
+import unittest
+
+from columnar import ColumnarDataset
+from food_statistics import Statistics
+from preprocessing import Preprocessing
+
+
+class TestGroupBy(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'restaurante': ['A', 'B', 'A', 'C', 'B', 'A', 'C'],
+            'turno': ['dia', 'noite', 'noite', 'dia', 'noite', 'dia', 'dia'],
+            'tempo': [10.0, 30.0, None, None, 50.0, 20.0, None],
+            'itens': [1, 2, 2, 5, None, 1, 5],
+        }
+
+    def test_aggregations_match_per_group_statistics(self):
+        for dataset in (self.data, ColumnarDataset(self.data), ColumnarDataset(self.data, categorical=True)):
+            grupos = Statistics(dataset).groupby('restaurante')
+            self.assertEqual(grupos.sizes(), {'A': 3, 'B': 2, 'C': 2})
+            self.assertEqual(grupos.mean('tempo'), {'A': 15.0, 'B': 40.0, 'C': None})
+            self.assertEqual(grupos.median('itens'), {'A': 1.0, 'B': 2.0, 'C': 5.0})
+            self.assertEqual(grupos.mode('itens'), {'A': [1], 'B': [2], 'C': [5]})
+            self.assertEqual(grupos.sum('itens'), {'A': 4, 'B': 2, 'C': 10})
+            self.assertEqual(grupos.count('tempo'), {'A': 2, 'B': 2, 'C': 0})
+            self.assertEqual(grupos.indices()['A'].tolist(), [0, 2, 5])
+
+    def test_multiple_keys(self):
+        grupos = Statistics(self.data).groupby(['restaurante', 'turno'])
+        self.assertEqual(grupos.sizes(), {('A', 'dia'): 2, ('B', 'noite'): 2, ('A', 'noite'): 1, ('C', 'dia'): 2})
+        self.assertEqual(grupos.mean('tempo')[('A', 'dia')], 15.0)
+
+        with self.assertRaises(KeyError):
+            Statistics(self.data).groupby('cidade')
+        with self.assertRaises(ValueError):
+            grupos.aggregate('tempo', 'variance')
+
+    def test_grouped_fillna(self):
+        for columnar in (False, True):
+            preprocessor = Preprocessing({name: list(values) for name, values in self.data.items()},
+                                         columnar=columnar)
+            with preprocessor.profile() as profiler:
+                result = preprocessor.groupby('restaurante').fillna(columns={'tempo', 'itens'}, method='median',
+                                                                    default_value=-1.0)
+            self.assertIs(result, preprocessor)
+            self.assertEqual(preprocessor.dataset['tempo'], [10.0, 30.0, 15.0, -1.0, 50.0, 20.0, -1.0])
+            self.assertEqual(preprocessor.dataset['itens'], [1, 2, 2, 5, 2, 1, 5])
+            self.assertEqual({event.column for event in profiler.events}, {'tempo', 'itens'})
+            self.assertEqual(preprocessor.schema['tempo'].null_count, 0)
+
+        preprocessor = Preprocessing({name: list(values) for name, values in self.data.items()})
+        preprocessor.groupby(['restaurante']).fillna(method='mode')
+        self.assertEqual(preprocessor.dataset['tempo'], [10.0, 30.0, 10.0, 0, 50.0, 20.0, 0])
+        with self.assertRaises(ValueError):
+            preprocessor.groupby('restaurante').fillna(method='approx_median')
+
+
+if __name__ == '__main__':
+    unittest.main()
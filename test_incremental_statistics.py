@@ -0,0 +1,95 @@
+import random
+import unittest
+
+from food_statistics import Statistics
+from incremental_statistics import IncrementalStatistics
+
+
+def _random_batch(rng, size):
+    return {
+        'tempo': [rng.randint(5, 60) for _ in range(size)],
+        'valor': [round(rng.uniform(10, 120), 2) for _ in range(size)],
+        'prato': [rng.choice(['pizza', 'acai', 'moqueca', 'acaraje']) for _ in range(size)],
+    }
+
+
+def _concatenate(batches):
+    return {column: [value for batch in batches for value in batch[column]] for column in batches[0]}
+
+
+class TestIncrementalStatistics(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.batches = [_random_batch(rng, size) for size in (1, 13, 7, 30, 2)]
+        self.reference = Statistics(_concatenate(self.batches))
+
+    def _assert_matches_reference(self, incremental):
+        for column in ('tempo', 'valor'):
+            self.assertAlmostEqual(incremental.mean(column), self.reference.mean(column))
+            self.assertAlmostEqual(incremental.median(column), self.reference.median(column))
+            self.assertAlmostEqual(incremental.variance(column), self.reference.variance(column))
+            self.assertAlmostEqual(incremental.stdev(column), self.reference.stdev(column))
+        self.assertAlmostEqual(incremental.covariance('tempo', 'valor'), self.reference.covariance('tempo', 'valor'))
+        self.assertAlmostEqual(incremental.covariance('valor', 'tempo'), self.reference.covariance('tempo', 'valor'))
+
+        for column in ('tempo', 'prato'):
+            self.assertEqual(incremental.itemset(column), self.reference.itemset(column))
+            self.assertEqual(incremental.absolute_frequency(column), self.reference.absolute_frequency(column))
+            self.assertEqual(incremental.mode(column), self.reference.mode(column))
+            self.assertEqual(incremental.cumulative_frequency(column), self.reference.cumulative_frequency(column))
+            relative = self.reference.relative_frequency(column)
+            for item, value in incremental.relative_frequency(column).items():
+                self.assertAlmostEqual(value, relative[item])
+
+        for value1 in ('pizza', 'acai'):
+            for value2 in ('moqueca', 'acaraje', 'feijoada'):
+                self.assertAlmostEqual(incremental.conditional_probability('prato', value1, value2),
+                                       self.reference.conditional_probability('prato', value1, value2))
+
+    def test_append_batches(self):
+        incremental = IncrementalStatistics()
+        for batch in self.batches:
+            incremental.append(batch)
+        self.assertEqual(len(incremental), 53)
+        self._assert_matches_reference(incremental)
+
+    def test_merge_partial_statistics(self):
+        left = IncrementalStatistics(self.batches[0]).append(self.batches[1])
+        right = IncrementalStatistics(self.batches[2])
+        for batch in self.batches[3:]:
+            right.append(batch)
+        self._assert_matches_reference(left.merge(right))
+
+    def test_quantile_sketch_survives_merge(self):
+        left = IncrementalStatistics(self.batches[0], track_median=False, sketch_error=0.01)
+        right = IncrementalStatistics(track_median=False, sketch_error=0.01)
+        for batch in self.batches[1:]:
+            right.append(batch)
+        merged = left.merge(right)
+        # Com poucas linhas o sketch guarda todos os valores e a mediana é exata
+        ordered = sorted(_concatenate(self.batches)['tempo'])
+        self.assertEqual(merged.median('tempo'), self.reference.median('tempo'))
+        self.assertEqual(merged.quantile('tempo', 1), ordered[-1])
+        with self.assertRaises(ValueError):
+            IncrementalStatistics(self.batches[0]).quantile('tempo', 0.5)
+
+    def test_non_numeric_column_and_schema_errors(self):
+        incremental = IncrementalStatistics(self.batches[0])
+        with self.assertRaises(TypeError):
+            incremental.mean('prato')
+        with self.assertRaises(KeyError):
+            incremental.mean('coluna_falsa')
+        with self.assertRaises(ValueError):
+            incremental.append({'tempo': [1]})
+
+    def test_empty_statistics(self):
+        incremental = IncrementalStatistics({'vazia': []})
+        self.assertEqual(incremental.mean('vazia'), 0.0)
+        self.assertEqual(incremental.median('vazia'), 0.0)
+        self.assertEqual(incremental.mode('vazia'), [])
+        self.assertEqual(incremental.relative_frequency('vazia'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
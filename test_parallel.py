@@ -0,0 +1,87 @@
+import copy
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from columnar import ColumnarDataset
+from parallel import ColumnPool, resolve_n_jobs
+from preprocessing import Preprocessing
+
+
+class TestParallelPreprocessing(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        size = 300
+        self.data = {
+            'tempo_preparo': [None if rng.random() < 0.1 else rng.randint(5, 60) for _ in range(size)],
+            'valor': [None if rng.random() < 0.2 else round(rng.uniform(10, 120), 2) for _ in range(size)],
+            'avaliacao': [rng.choice([1, 2.5, None]) for _ in range(size)],
+            'cidade': [rng.choice(['Itabuna', 'Ilhéus', None]) for _ in range(size)],
+        }
+
+    def _run(self, n_jobs, columnar=False, executor=None):
+        processor = Preprocessing(copy.deepcopy(self.data), columnar=columnar, n_jobs=n_jobs, executor=executor)
+        processor.fillna(columns={'tempo_preparo', 'valor'}, method='median') \
+                 .fillna(columns={'avaliacao'}, method='mean') \
+                 .fillna(columns={'cidade'}, method='mode') \
+                 .scale(columns={'tempo_preparo', 'avaliacao'}, method='standard') \
+                 .scale(columns={'valor'}, method='minMax')
+        dataset = processor.dataset
+        return dataset.to_dict() if columnar else dataset
+
+    def test_parallel_matches_serial(self):
+        self.assertEqual(self._run(n_jobs=2), self._run(n_jobs=1))
+
+    def test_parallel_keeps_cell_types(self):
+        data = {'a': [1, 2, None, 4], 'b': [None, 3, 5, 7]}
+        results = []
+        for n_jobs in (1, 2):
+            processor = Preprocessing(copy.deepcopy(data), n_jobs=n_jobs)
+            processor.fillna(method='mean')
+            results.append(processor.dataset)
+        serial, parallel = results
+        self.assertEqual(parallel, serial)
+        for column_name in data:
+            self.assertEqual([type(value) for value in parallel[column_name]],
+                             [type(value) for value in serial[column_name]])
+        self.assertEqual([type(value) for value in serial['a']], [int, int, float, int])
+
+    def test_parallel_matches_serial_on_columnar_dataset(self):
+        self.assertEqual(self._run(n_jobs=2, columnar=True), self._run(n_jobs=1, columnar=True))
+
+    def test_external_executor_is_reused(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(self._run(n_jobs=None, executor=executor), self._run(n_jobs=1))
+            # O executor do chamador não é encerrado pelo Preprocessing
+            self.assertEqual(executor.submit(abs, -1).result(), 1)
+
+    def test_errors_match_serial_path(self):
+        processor = Preprocessing(copy.deepcopy(self.data), n_jobs=2)
+        with self.assertRaises(ValueError):
+            processor.fillna(columns={'valor'}, method='invalid_method')
+        with self.assertRaises(TypeError):
+            processor.scale(columns={'valor'}, method='standard')
+
+    def test_non_numeric_fill_value(self):
+        expected = Preprocessing(copy.deepcopy(self.data)).fillna(columns={'valor'}, method='default_value',
+                                                                   default_value='n/d')
+        result = Preprocessing(copy.deepcopy(self.data), n_jobs=2).fillna(columns={'valor'}, method='default_value',
+                                                                          default_value='n/d')
+        self.assertEqual(result.dataset, expected.dataset)
+
+    def test_non_numeric_columns_use_serial_path(self):
+        states, remaining = ColumnPool(2).fillna(self.data, ['cidade', 'avaliacao', 'coluna_falsa'], 'mode', 0)
+        self.assertEqual(states, [])
+        self.assertEqual(remaining, ['cidade', 'avaliacao', 'coluna_falsa'])
+        self.assertEqual(ColumnPool(2).scale(ColumnarDataset({'vazia': []}), ['vazia'], 'minMax'), ['vazia'])
+
+    def test_resolve_n_jobs(self):
+        self.assertGreaterEqual(resolve_n_jobs(-1), 1)
+        self.assertEqual(resolve_n_jobs(3), 3)
+        with self.assertRaises(ValueError):
+            resolve_n_jobs(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
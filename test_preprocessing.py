@@ -3,7 +3,10 @@ from unittest.mock import patch
 import copy
 
 # Importa as classes do seu arquivo
+from columnar import ColumnarDataset
+from fitted import HashState
 from preprocessing import Preprocessing, MissingValueProcessor, Scaler, Encoder
+import preprocessing
 
 class TestMissingValueProcessor(unittest.TestCase):
     
@@ -33,18 +36,49 @@ class TestMissingValueProcessor(unittest.TestCase):
         self.assertEqual(result['idade'], [20, 50])
         self.assertEqual(len(result['idade']), 2)
 
+    def test_isna_and_notna_views(self):
+        processor = MissingValueProcessor(copy.deepcopy(self.data))
+        view = processor.isna(columns={'idade', 'cidade'}, view=True)
+        self.assertEqual(len(view), 2)
+        self.assertEqual(view.indices.tolist(), [2, 3])
+        self.assertEqual(view['salario'], [800, 1200])
+        self.assertEqual([row['idade'] for row in view], [None, 50])
+        self.assertEqual(view.materialize(), processor.isna(columns={'idade', 'cidade'}))
+
+        complete = processor.notna(view=True)
+        self.assertEqual(complete.materialize(), processor.notna())
+        self.assertEqual(list(complete['cidade']), ['A'])
+
+        # A seleção continua válida depois que o dataset é compactado
+        processor.dropna()
+        self.assertEqual(view['cidade'].tolist(), ['C', None])
+
     def test_fillna_mean(self):
         processor = MissingValueProcessor(copy.deepcopy(self.data))
         processor.fillna(columns={'idade'}, method='mean')
         # Média de (20+30+50)/3 = 33.333...
         self.assertAlmostEqual(processor.dataset['idade'][2], 33.3333333)
 
+    def test_fillna_median_and_approx_median(self):
+        processor = MissingValueProcessor(copy.deepcopy(self.data))
+        processor.fillna(columns={'idade'}, method='median')
+        self.assertEqual(processor.dataset['idade'][2], 30.0)
+        # Com poucos valores o sketch guarda todos e a mediana aproximada é um valor da coluna
+        processor = MissingValueProcessor(copy.deepcopy(self.data))
+        processor.fillna(columns={'salario'}, method='approx_median')
+        self.assertEqual(processor.dataset['salario'][1], 800.0)
+
     def test_fillna_mode(self):
         data_with_mode = {'cat': ['A', 'B', 'A', None]}
         processor = MissingValueProcessor(data_with_mode)
         processor.fillna(columns={'cat'}, method='mode')
         self.assertEqual(processor.dataset['cat'][3], 'A')
 
+    def test_fillna_mode_tie_uses_first_appearance(self):
+        processor = MissingValueProcessor({'n': [5, 1, None, 1, 5]})
+        processor.fillna(columns={'n'}, method='mode')
+        self.assertEqual(processor.dataset['n'][2], 5)
+
     def test_dropna(self):
         processor = MissingValueProcessor(copy.deepcopy(self.data))
         processor.dropna(columns={'cidade'})
@@ -73,6 +107,40 @@ class TestScaler(unittest.TestCase):
             self.assertAlmostEqual(original, scaled, places=4)
 
 
+@unittest.skipIf(preprocessing.np is None, "NumPy não está instalado")
+class TestVectorizedScaler(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'inteiros': [10, 8, 12, 8, 15, 6, 9, 10],
+            'floats': [3.5, 2.1, 4.8, 2.1, 5.5, 1.2, 3.3, 4.0],
+            'booleanos': [True, False, True, True, False, True, False, False],
+        }
+
+    def _run(self, method, vectorized):
+        scaler = Scaler(copy.deepcopy(self.data))
+        if vectorized:
+            getattr(scaler, method)()
+        else:
+            with patch('preprocessing.np', None):
+                getattr(scaler, method)()
+        return scaler.dataset
+
+    def test_matches_pure_python_path(self):
+        for method in ('minMax_scaler', 'standard_scaler'):
+            expected = self._run(method, vectorized=False)
+            result = self._run(method, vectorized=True)
+            for column in ('inteiros', 'floats'):
+                for expected_value, value in zip(expected[column], result[column]):
+                    self.assertAlmostEqual(expected_value, value)
+            # Colunas booleanas continuam sendo ignoradas, como no caminho em Python
+            self.assertEqual(result['booleanos'], self.data['booleanos'])
+
+    def test_columns_with_none_use_fallback(self):
+        scaler = Scaler({'col': [1, None, 3]})
+        self.assertIsNone(scaler._as_numpy('col'))
+
+
 class TestEncoder(unittest.TestCase):
     
     def setUp(self):
@@ -95,6 +163,141 @@ class TestEncoder(unittest.TestCase):
         self.assertEqual(encoder.dataset['cor_azul'], [1, 0, 0, 1])
         self.assertEqual(encoder.dataset['cor_verde'], [0, 1, 0, 0])
 
+    def test_sparse_oneHot_encode_densifies_to_dense_output(self):
+        dense = Encoder(copy.deepcopy(self.data))
+        dense.oneHot_encode(columns={'cor'})
+
+        encoder = Encoder(copy.deepcopy(self.data))
+        encoder.sparse_oneHot_encode(columns={'cor'})
+        sparse_column = encoder.dataset['cor']
+        self.assertEqual(list(sparse_column), [0, 1, 2, 0])
+        self.assertEqual(sparse_column.categories, ['azul', 'verde', 'vermelho'])
+        self.assertEqual(sparse_column.column('cor_inexistente'), [0, 0, 0, 0])
+        self.assertEqual(sparse_column.column('azul'), dense.dataset['cor_azul'])
+        indptr, indices = sparse_column.to_csr()
+        self.assertEqual((list(indptr), list(indices)), ([0, 1, 2, 3, 4], [0, 1, 2, 0]))
+
+        encoder.densify()
+        self.assertEqual(encoder.dataset, dense.dataset)
+
+    def test_sparse_oneHot_unknown_category(self):
+        states = Encoder(copy.deepcopy(self.data)).fit(columns={'cor'}, method='sparseOneHot')
+        new_data = Encoder({'cor': ['verde', 'roxo']})
+        new_data.transform(states)
+        self.assertEqual(list(new_data.dataset['cor']), [1, -1])
+        new_data.densify(columns={'cor'})
+        self.assertEqual(new_data.dataset['cor_verde'], [1, 0])
+        self.assertEqual(new_data.dataset['cor_azul'], [0, 0])
+
+
+class TestHashEncoder(unittest.TestCase):
+
+    def test_hash_encode_fixed_width_and_stable(self):
+        data = {'prato': ['pizza', 'acai', 'pizza', 'moqueca', None]}
+        processor = Preprocessing(copy.deepcopy(data)).encode(columns={'prato'}, method='hash', n_features=8, seed=3)
+        codes = list(processor.dataset['prato'])
+        self.assertEqual(len(codes), 5)
+        self.assertTrue(all(0 <= code < 8 for code in codes))
+        self.assertEqual(codes[0], codes[2])
+
+        # Mesmos parâmetros, mesmos códigos, inclusive para categorias novas
+        encoder = Encoder({'prato': ['feijoada', 'pizza']})
+        encoder.hash_encode(columns={'prato'}, n_features=8, seed=3)
+        self.assertEqual(encoder.dataset['prato'][1], codes[0])
+
+        encoder.densify()
+        self.assertEqual(sorted(encoder.dataset), [f'prato_{index}' for index in range(8)])
+        self.assertEqual(encoder.dataset[f'prato_{codes[0]}'][1], 1)
+
+    def test_hash_encode_categorical_hashes_each_category_once(self):
+        values = ['pizza', 'sushi', None, 'pizza', 'sushi'] * 20
+        expected = Encoder({'prato': list(values)})
+        expected.hash_encode(columns={'prato'}, n_features=8, seed=5)
+
+        encoder = Encoder(ColumnarDataset({'prato': values}, categorical=True))
+        with patch.object(HashState, 'map_value', autospec=True, side_effect=HashState.map_value) as map_value:
+            encoder.hash_encode(columns={'prato'}, n_features=8, seed=5)
+        self.assertEqual(map_value.call_count, 3)
+        self.assertEqual(list(encoder.dataset['prato']), list(expected.dataset['prato']))
+
+    def test_hash_seed_and_value_types(self):
+        values = [str(index) for index in range(200)]
+        first = Encoder({'id': list(values)})
+        first.hash_encode(columns={'id'}, n_features=1 << 16, seed=0)
+        second = Encoder({'id': list(values)})
+        second.hash_encode(columns={'id'}, n_features=1 << 16, seed=1)
+        self.assertNotEqual(list(first.dataset['id']), list(second.dataset['id']))
+
+        # A semente muda quais valores colidem, não apenas o rótulo dos baldes
+        def collisions(seed):
+            state = HashState('id', n_features=16, seed=seed)
+            return {(a, b) for a in values[:60] for b in values[:60]
+                    if a < b and state.map_value(a) == state.map_value(b)}
+        self.assertNotEqual(collisions(0), collisions(1))
+
+        typed = Encoder({'id': ['1', 1]})
+        typed.hash_encode(columns={'id'}, n_features=1 << 16)
+        self.assertNotEqual(typed.dataset['id'][0], typed.dataset['id'][1])
+
+        with self.assertRaises(ValueError):
+            Encoder({'id': ['a']}).hash_encode(columns={'id'}, n_features=0)
+
+
+class TestLazyPreprocessing(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'idade': [25, 30, None, 45, 38],
+            'salario': [5000.0, None, 4500.0, None, 7000.0],
+            'cidade': ['Recife', 'Salvador', 'Recife', 'São Paulo', None]
+        }
+
+    def _eager(self):
+        preprocessor = Preprocessing(copy.deepcopy(self.data))
+        preprocessor.fillna(columns={'idade'}, method='mean') \
+                    .scale(columns={'idade'}, method='standard') \
+                    .fillna(columns={'salario'}, method='median') \
+                    .scale(columns={'salario'}, method='minMax') \
+                    .fillna(columns={'cidade'}, method='mode') \
+                    .encode(columns={'cidade'}, method='oneHot')
+        return preprocessor.dataset
+
+    def _lazy_plan(self):
+        return Preprocessing(copy.deepcopy(self.data)).lazy() \
+            .fillna(columns={'idade'}, method='mean') \
+            .scale(columns={'idade'}, method='standard') \
+            .fillna(columns={'salario'}, method='median') \
+            .scale(columns={'salario'}, method='minMax') \
+            .fillna(columns={'cidade'}, method='mode') \
+            .encode(columns={'cidade'}, method='oneHot')
+
+    def test_collect_matches_eager_execution(self):
+        expected = self._eager()
+        result = self._lazy_plan().collect().dataset
+        self.assertEqual(set(result), set(expected))
+        for column, values in expected.items():
+            for expected_value, value in zip(values, result[column]):
+                self.assertAlmostEqual(expected_value, value)
+
+    def test_nothing_runs_before_collect(self):
+        plan = self._lazy_plan()
+        self.assertEqual(plan._preprocessing.dataset, self.data)
+
+    def test_explain_shows_fused_stages(self):
+        explanation = self._lazy_plan().explain()
+        self.assertIn("4 estágio(s)", explanation)
+        self.assertEqual(explanation.count("[fundido]"), 2)
+
+    def test_mixed_column_falls_back_to_step_by_step(self):
+        data = {'col': [1, 'x', None, 3]}
+        expected = Preprocessing(copy.deepcopy(data)).fillna(columns={'col'}).scale(columns={'col'}).dataset
+        result = Preprocessing(copy.deepcopy(data)).lazy().fillna(columns={'col'}).scale(columns={'col'}).collect()
+        self.assertEqual(result.dataset, expected)
+
+    def test_invalid_method_fails_when_recorded(self):
+        with self.assertRaises(ValueError):
+            Preprocessing(copy.deepcopy(self.data)).lazy().scale(method='invalid_method')
+
 
 class TestPreprocessingFacade(unittest.TestCase):
 
@@ -133,7 +336,9 @@ class TestPreprocessingFacade(unittest.TestCase):
         mock_mvp_instance.fillna.assert_called_once_with(columns={'b'}, method='median', default_value=0)
         
         preprocessor.isna(columns={'a'})
-        mock_mvp_instance.isna.assert_called_once_with(columns={'a'})
+        mock_mvp_instance.isna.assert_called_once_with(columns={'a'}, view=False)
+        preprocessor.notna(columns={'a'}, view=True)
+        mock_mvp_instance.notna.assert_called_once_with(columns={'a'}, view=True)
         
         # Testa o atalho de Scaler
         preprocessor.scale(columns={'a'}, method='standard')
@@ -148,6 +353,29 @@ class TestPreprocessingFacade(unittest.TestCase):
         mock_encoder_instance.oneHot_encode.assert_called_once_with(columns={'b'})
         mock_encoder_instance.label_encode.assert_not_called()
         
+    def test_statistics_cache_follows_mutations(self):
+        preprocessor = Preprocessing({'cat': ['A', None, None, 'B']})
+        self.assertEqual(preprocessor.statistics.mode('cat'), [None])
+        preprocessor.fillna(columns={'cat'}, method='default_value', default_value='B')
+        self.assertEqual(preprocessor.statistics.mode('cat'), ['B'])
+
+    def test_processors_bump_statistics_versions(self):
+        preprocessor = Preprocessing({'x': [1.0, 2.0, 3.0], 'cat': ['A', 'B', 'B']})
+        self.assertAlmostEqual(preprocessor.statistics.mean('x'), 2.0)
+        self.assertEqual(preprocessor.statistics.mode('cat'), ['B'])
+
+        # Chamadas diretas aos processadores também registram a modificação
+        preprocessor.scaler.minMax_scaler(columns={'x'})
+        self.assertAlmostEqual(preprocessor.statistics.mean('x'), 0.5)
+        preprocessor.encoder.label_encode(columns={'cat'})
+        self.assertEqual(preprocessor.statistics.mode('cat'), [1])
+
+    def test_encode_without_columns_warns(self):
+        preprocessor = Preprocessing({'cat': ['A', 'B']})
+        with self.assertWarns(UserWarning):
+            self.assertIs(preprocessor.encode(columns=set()), preprocessor)
+        self.assertEqual(preprocessor.dataset, {'cat': ['A', 'B']})
+
     def test_scale_raises_error_for_invalid_method(self):
         preprocessor = Preprocessing(self.data)
         with self.assertRaises(ValueError):
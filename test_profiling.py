@@ -0,0 +1,66 @@
+import json
+import unittest
+
+from preprocessing import Preprocessing
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'tempo': [10.0, None, 30.0, None, 50.0],
+            'distancia': [1.0, 2.0, None, 4.0, 5.0],
+            'bairro': ['Pina', 'Torre', None, 'Pina', 'Derby'],
+        }
+
+    def test_events_per_operation_and_column(self):
+        preprocessor = Preprocessing(self.data)
+        with preprocessor.profile() as profiler:
+            preprocessor.fillna(columns={'tempo', 'distancia'}, method='mean') \
+                        .dropna() \
+                        .scale(columns={'tempo'}, method='standard') \
+                        .encode(columns={'bairro'}, method='oneHot')
+
+        events = {(event.operation, event.column): event for event in profiler.events}
+        self.assertEqual(set(events), {('fillna', 'tempo'), ('fillna', 'distancia'), ('dropna', None),
+                                       ('scale', 'tempo'), ('encode', 'bairro')})
+        self.assertEqual(events[('fillna', 'tempo')].nulls_filled, 2)
+        self.assertEqual(events[('fillna', 'distancia')].nulls_filled, 1)
+        self.assertEqual((events[('dropna', None)].rows_in, events[('dropna', None)].rows_out), (5, 4))
+        self.assertEqual(events[('scale', 'tempo')].params, {'method': 'standard'})
+        self.assertTrue(all(event.duration >= 0 and event.peak_memory is None for event in profiler.events))
+
+        summary = profiler.summary()
+        self.assertEqual(sum(row['nulls_filled'] for row in summary), 3)
+        self.assertIn('fillna', profiler.format_table())
+        self.assertEqual(len(json.loads(profiler.to_json())), 5)
+
+        # Fora do bloco o hook é removido e nada mais é registrado
+        preprocessor.scale(columns={'distancia'})
+        self.assertEqual(len(profiler.events), 5)
+        self.assertFalse(preprocessor.instrumentation.enabled)
+
+    def test_memory_and_custom_hooks(self):
+        preprocessor = Preprocessing(self.data)
+        received = []
+        preprocessor.instrumentation.add_hook(received.append)
+        with preprocessor.profile(memory=True) as profiler:
+            preprocessor.lazy().fillna(columns={'tempo'}).scale(columns={'tempo'}).collect()
+
+        self.assertEqual([(event.operation, event.column) for event in received], [('fillna+scale', 'tempo')])
+        self.assertEqual(profiler.events, received)
+        self.assertEqual(received[0].nulls_filled, 2)
+        self.assertIsNotNone(received[0].peak_memory)
+
+    def test_results_match_uninstrumented_run(self):
+        expected = Preprocessing({name: list(values) for name, values in self.data.items()})
+        expected.fillna(method='mode').encode(columns={'bairro'}, method='label')
+
+        preprocessor = Preprocessing(self.data)
+        with preprocessor.profile():
+            preprocessor.fillna(method='mode').encode(columns={'bairro'}, method='label')
+        self.assertEqual(preprocessor.dataset, expected.dataset)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import bisect
+import random
+import unittest
+
+from quantiles import KLLSketch, exact_quantile, select_kth
+
+
+class TestExactSelection(unittest.TestCase):
+
+    def test_select_matches_sorted(self):
+        rng = random.Random(5)
+        for values in ([rng.randint(0, 20) for _ in range(500)], [rng.random() for _ in range(999)],
+                       list(range(300)), [7] * 200):
+            ordered = sorted(values)
+            for k in (0, len(values) // 3, len(values) // 2, len(values) - 1):
+                self.assertEqual(select_kth(values, k), ordered[k])
+
+    def test_exact_quantile_interpolates(self):
+        self.assertEqual(exact_quantile([4, 1, 3, 2], 0.5), 2.5)
+        self.assertEqual(exact_quantile([3, 1, 2], 0.25), 1.5)
+        self.assertAlmostEqual(exact_quantile(list(range(100)), 0.3), 29.7)
+
+    def test_select_out_of_range(self):
+        with self.assertRaises(IndexError):
+            select_kth([1, 2], 2)
+
+
+class TestKLLSketch(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(9)
+        self.values = [rng.gauss(50, 10) for _ in range(50000)]
+        self.ordered = sorted(self.values)
+
+    def _rank_error(self, sketch, q):
+        return abs(bisect.bisect_left(self.ordered, sketch.quantile(q)) / len(self.ordered) - q)
+
+    def test_rank_error_bound(self):
+        sketch = KLLSketch(error=0.01).update_many(self.values)
+        self.assertEqual(len(sketch), len(self.values))
+        self.assertLess(sketch._size, len(self.values) // 20)
+        for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+            self.assertLessEqual(self._rank_error(sketch, q), 0.01)
+        self.assertEqual(sketch.quantile(0), self.ordered[0])
+        self.assertEqual(sketch.quantile(1), self.ordered[-1])
+
+    def test_merge_of_partial_sketches(self):
+        merged = KLLSketch(error=0.01)
+        for start in range(0, len(self.values), 7000):
+            merged.merge(KLLSketch(error=0.01, seed=start).update_many(self.values[start:start + 7000]))
+        self.assertEqual(merged.count, len(self.values))
+        for q in (0.1, 0.5, 0.9):
+            self.assertLessEqual(self._rank_error(merged, q), 0.01)
+        with self.assertRaises(ValueError):
+            merged.merge(KLLSketch(error=0.1))
+
+    def test_weighted_update_and_mapping(self):
+        sketch = KLLSketch(error=0.05).update(10, count=1000).update(20, count=10)
+        self.assertEqual(sketch.count, 1010)
+        self.assertEqual(sketch.median(), 10)
+        sketch.map_values(lambda value: (value - 10) / 2)
+        self.assertEqual(sketch.median(), 0.0)
+        self.assertEqual(sketch.quantile(1), 5.0)
+        self.assertEqual(KLLSketch().quantile(0.5), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from columnar import CategoricalColumn, ColumnarDataset
+from food_statistics import Statistics
+from preprocessing import Preprocessing
+from schema import ColumnSchema
+
+
+class _GuardedList(list):
+    """Lista que falha se for percorrida dentro de blocked()."""
+    _blocked = False
+
+    @classmethod
+    @contextmanager
+    def blocked(cls):
+        cls._blocked = True
+        try:
+            yield
+        finally:
+            cls._blocked = False
+
+    def _scan(self):
+        if _GuardedList._blocked:
+            raise AssertionError('varredura')
+
+    def __iter__(self):
+        self._scan()
+        return super().__iter__()
+
+    def __contains__(self, value):
+        self._scan()
+        return super().__contains__(value)
+
+    def count(self, value):
+        self._scan()
+        return super().count(value)
+
+
+class TestColumnSchema(unittest.TestCase):
+
+    def test_infer_types_nulls_and_bounds(self):
+        self.assertEqual(ColumnSchema.infer([3, None, 1, 7]), ColumnSchema('int', 1, 1, 7))
+        self.assertEqual(ColumnSchema.infer([1, 2.5]), ColumnSchema('float', 0, 1, 2.5))
+        self.assertEqual(ColumnSchema.infer(['a', None]), ColumnSchema('str', 1))
+        self.assertEqual(ColumnSchema.infer([True, 1]).dtype, 'mixed')
+        self.assertEqual(ColumnSchema.infer([None, None]), ColumnSchema('null', 2))
+        self.assertEqual(ColumnSchema.infer(CategoricalColumn(['a', None, 'b'])), ColumnSchema('category', 1))
+
+        typed = ColumnarDataset({'x': [4.0, None, -2.0]})['x']
+        self.assertEqual(ColumnSchema.infer(typed), ColumnSchema('float', 1, -2.0, 4.0))
+
+
+class TestSchemaRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'tempo': [10.0, None, 30.0, 20.0],
+            'itens': [1, 2, 3, 4],
+            'bairro': ['Pina', 'Torre', None, 'Pina'],
+        }
+
+    def assertRegistryMatchesData(self, preprocessor):
+        for column_name, values in preprocessor.dataset.items():
+            self.assertEqual(preprocessor.schema[column_name], ColumnSchema.infer(values), column_name)
+
+    def test_operations_update_metadata_without_rescanning(self):
+        for columnar in (False, True):
+            preprocessor = Preprocessing({name: list(values) for name, values in self.data.items()},
+                                         columnar=columnar)
+            self.assertEqual(preprocessor.schema['tempo'].null_count, 1)
+            preprocessor.schema.to_dict()
+
+            with patch.object(ColumnSchema, 'infer', side_effect=AssertionError('varredura')):
+                preprocessor.fillna(columns={'tempo'}, method='mean').scale(columns={'tempo', 'itens'})
+                self.assertEqual(preprocessor.schema['tempo'], ColumnSchema('float', 0, 0.0, 1.0))
+            self.assertRegistryMatchesData(preprocessor)
+
+            # dropna e encode invalidam os metadados, recalculados no próximo acesso
+            preprocessor.dropna().encode(columns={'bairro'}, method='label')
+            self.assertRegistryMatchesData(preprocessor)
+            self.assertEqual(preprocessor.schema['bairro'].dtype, 'int')
+
+    def test_clean_columns_short_circuit(self):
+        preprocessor = Preprocessing({name: _GuardedList(values) for name, values in self.data.items()})
+        preprocessor.schema.to_dict()
+        version = preprocessor.statistics.versions.get('itens')
+
+        # Com o registro calculado, colunas limpas e a validação de tipo não percorrem a lista
+        with _GuardedList.blocked():
+            preprocessor.fillna(columns={'itens'}, method='mean').dropna(columns={'itens'})
+            self.assertEqual(len(preprocessor.isna(columns={'itens'}, view=True)), 0)
+            self.assertTrue(preprocessor.scaler._validate_numeric_data('itens'))
+            self.assertFalse(preprocessor.scaler._validate_numeric_data('bairro'))
+            self.assertEqual(preprocessor.scaler._fit_column('itens', 'minMax').divisor, 3)
+
+        # Nada mudou, então o cache de Statistics continua válido
+        self.assertEqual(preprocessor.statistics.versions.get('itens'), version)
+        self.assertEqual(preprocessor.dataset, self.data)
+
+    def test_first_operations_infer_each_column_once(self):
+        preprocessor = Preprocessing({'tempo': [float(index % 7) if index % 5 else None for index in range(3000)]})
+        with patch.object(ColumnSchema, 'infer', side_effect=ColumnSchema.infer) as infer:
+            preprocessor.fillna(columns={'tempo'}).scale(columns={'tempo'}).fillna(columns={'tempo'})
+        self.assertEqual(infer.call_count, 1)
+        self.assertRegistryMatchesData(preprocessor)
+
+    def test_in_place_edits_require_invalidate(self):
+        for columnar in (False, True):
+            preprocessor = Preprocessing({'a': [1.0, 2.0, None], 'b': [1.0, 2.0, 3.0]}, columnar=columnar)
+            preprocessor.fillna()
+            preprocessor.schema.to_dict()
+            self.assertEqual(preprocessor.schema['a'].null_count, 0)
+
+            # Alterações diretas nas listas não passam por 'versions': o registro é avisado
+            preprocessor.dataset['a'][0] = None
+            preprocessor.dataset['b'][1] = 'x'
+            preprocessor.schema.invalidate(['a', 'b'])
+            self.assertEqual(preprocessor.schema['b'].dtype, 'mixed')
+
+            preprocessor.fillna(columns={'a'}).scale(columns={'a', 'b'})
+            self.assertNotIn(None, list(preprocessor.dataset['a']))
+            self.assertEqual(list(preprocessor.dataset['b']), [1.0, 'x', 3.0])
+            self.assertRegistryMatchesData(preprocessor)
+
+    def test_every_mutating_facade_path_refreshes_statistics_and_schema(self):
+        data = {'loja': ['a', 'b', 'a', 'b'], 'tempo': [10, None, 30, 20], 'nota': [4.0, 5.0, None, 3.0]}
+        operations = {
+            'fillna': lambda p: p.fillna(columns={'tempo', 'nota'}),
+            'groupby_fillna': lambda p: p.groupby('loja').fillna(columns={'tempo', 'nota'}),
+            'dropna': lambda p: p.dropna(),
+            'scale': lambda p: p.fillna(columns={'tempo', 'nota'}).scale(columns={'tempo', 'nota'}),
+        }
+        for n_jobs in (1, 2):
+            for columnar in (False, True):
+                for name, operation in operations.items():
+                    with self.subTest(operation=name, n_jobs=n_jobs, columnar=columnar):
+                        preprocessor = Preprocessing({column: list(values) for column, values in data.items()},
+                                                     columnar=columnar, n_jobs=n_jobs)
+                        for column in ('tempo', 'nota'):
+                            preprocessor.statistics.absolute_frequency(column)
+                            preprocessor.schema.get(column)
+                        operation(preprocessor)
+                        for column in ('tempo', 'nota'):
+                            values = list(preprocessor.dataset[column])
+                            self.assertEqual(preprocessor.statistics.absolute_frequency(column),
+                                             Statistics({column: values}).absolute_frequency(column))
+                        self.assertRegistryMatchesData(preprocessor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+
+from food_statistics import Statistics
+from sharded_statistics import merge_summaries, sharded_statistics, summarize_shard
+
+
+class TestShardedStatistics(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.shards = []
+        for size in (17, 0, 5, 40, 1):
+            self.shards.append({
+                'tempo': [rng.randint(5, 60) for _ in range(size)],
+                'valor': [round(rng.uniform(10, 120), 2) for _ in range(size)],
+                'prato': [rng.choice(['pizza', 'acai', 'moqueca']) for _ in range(size)],
+            })
+        full = {column: [value for shard in self.shards for value in shard[column]] for column in self.shards[0]}
+        self.reference = Statistics(full)
+
+    def _assert_matches_reference(self, summary):
+        for column in ('tempo', 'valor'):
+            self.assertAlmostEqual(summary.mean(column), self.reference.mean(column))
+            self.assertAlmostEqual(summary.variance(column), self.reference.variance(column))
+        self.assertAlmostEqual(summary.covariance('tempo', 'valor'), self.reference.covariance('tempo', 'valor'))
+        for column in ('tempo', 'prato'):
+            self.assertEqual(summary.absolute_frequency(column), self.reference.absolute_frequency(column))
+            self.assertEqual(summary.cumulative_frequency(column), self.reference.cumulative_frequency(column))
+            self.assertEqual(summary.mode(column), self.reference.mode(column))
+        for value1 in ('pizza', 'acai', 'moqueca'):
+            for value2 in ('pizza', 'acai', 'moqueca'):
+                self.assertAlmostEqual(summary.conditional_probability('prato', value1, value2),
+                                       self.reference.conditional_probability('prato', value1, value2))
+
+    def test_merge_in_process(self):
+        summary = merge_summaries(summarize_shard(shard) for shard in self.shards)
+        self.assertEqual(len(summary), 63)
+        self._assert_matches_reference(summary)
+
+    def test_multiprocessing_driver(self):
+        self._assert_matches_reference(sharded_statistics(self.shards, n_jobs=2))
+
+    def test_csv_shards(self):
+        paths = []
+        try:
+            for shard in self.shards:
+                handle, path = tempfile.mkstemp(suffix='.csv')
+                paths.append(path)
+                with os.fdopen(handle, 'w', newline='', encoding='utf-8') as file:
+                    writer = csv.writer(file)
+                    writer.writerow(list(shard))
+                    writer.writerows(zip(*shard.values()))
+            self._assert_matches_reference(sharded_statistics(paths, n_jobs=2, chunk_size=4))
+        finally:
+            for path in paths:
+                os.remove(path)
+
+    def test_no_shards(self):
+        self.assertEqual(len(merge_summaries([])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from columnar import CategoricalColumn, ColumnarDataset, TypedColumn
+from preprocessing import Preprocessing
+from storage import open_dataset, save_dataset
+
+
+class TestBinaryStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'pedidos.fscol')
+        self.data = {
+            'tempo': [10.5, None, 30.0, 22.0],
+            'itens': [1, 2, None, 4],
+            'bairro': ['Pina', 'Torre', 'Pina', None],
+            'misto': [1, 'a', None, 2.5],
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_keeps_values_and_types(self):
+        Preprocessing({name: list(values) for name, values in self.data.items()}).save(self.path)
+        dataset = open_dataset(self.path)
+
+        self.assertIsInstance(dataset, ColumnarDataset)
+        self.assertEqual(dataset.to_dict(), self.data)
+        self.assertIsInstance(dataset['tempo'], TypedColumn)
+        self.assertIsInstance(dataset['tempo'].values, memoryview)
+        self.assertIsInstance(dataset['bairro'], CategoricalColumn)
+        self.assertEqual(dataset['itens'].null_count, 1)
+
+    def test_mutations_copy_buffers_and_leave_file_untouched(self):
+        save_dataset(self.data, self.path)
+        preprocessor = Preprocessing.open(self.path)
+        preprocessor.fillna(columns={'tempo', 'itens'}, method='mean') \
+                    .fillna(columns={'bairro'}, method='mode') \
+                    .encode(columns={'bairro'}, method='sparseOneHot')
+        self.assertEqual(preprocessor.dataset['itens'], [1, 2, 7 / 3, 4])
+        self.assertEqual(preprocessor.dataset['bairro'].codes.tolist(), [0, 1, 0, 0])
+
+        self.assertEqual(open_dataset(self.path).to_dict(), self.data)
+
+        # Colunas codificadas também são gravadas e reabertas
+        preprocessor.save(self.path)
+        reopened = Preprocessing.open(self.path)
+        self.assertEqual(reopened.dataset['bairro'], preprocessor.dataset['bairro'])
+        reopened.encoder.densify()
+        self.assertEqual(reopened.dataset['bairro_Pina'], [1, 0, 1, 1])
+
+    def test_empty_dataset_and_invalid_files(self):
+        save_dataset({'a': [], 'b': []}, self.path)
+        self.assertEqual(open_dataset(self.path).to_dict(), {'a': [], 'b': []})
+
+        with self.assertRaises(TypeError):
+            save_dataset({'a': [(1, 2), (3, 4)]}, self.path)
+        with self.assertRaises(ValueError):
+            save_dataset({'a': [1, 2], 'b': [1]}, self.path)
+
+        with open(self.path, 'wb') as output:
+            output.write(b'nao e um arquivo colunar')
+        with self.assertRaises(ValueError):
+            open_dataset(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
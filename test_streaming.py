@@ -0,0 +1,119 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+
+from preprocessing import Preprocessing
+from streaming import StreamingPreprocessing, read_csv_chunks
+
+
+class TestStreamingPreprocessing(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(42)
+        self.rows = []
+        for _ in range(57):
+            self.rows.append([
+                '' if rng.random() < 0.2 else str(rng.randint(10, 90)),
+                '' if rng.random() < 0.1 else f"{rng.uniform(5, 60):.2f}",
+                rng.choice(['Itabuna', 'Ilhéus', 'Salvador']),
+                '' if rng.random() < 0.15 else rng.choice(['pizza', 'acai', 'moqueca']),
+            ])
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['tempo_preparo', 'distancia', 'cidade', 'prato'])
+            writer.writerows(self.rows)
+        self.output_path = self.path + '.out.csv'
+
+    def tearDown(self):
+        for path in (self.path, self.output_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _full_dataset(self):
+        return next(read_csv_chunks(self.path, chunk_size=10 ** 6))
+
+    def _assert_same_dataset(self, expected, result):
+        self.assertEqual(set(expected), set(result))
+        for column, values in expected.items():
+            self.assertEqual(len(values), len(result[column]))
+            for expected_value, value in zip(values, result[column]):
+                if isinstance(expected_value, float):
+                    self.assertAlmostEqual(expected_value, value)
+                else:
+                    self.assertEqual(expected_value, value)
+
+    def test_chunked_pipeline_matches_in_memory(self):
+        expected = Preprocessing(self._full_dataset())
+        expected.dropna(columns={'distancia'}) \
+                .fillna(columns={'tempo_preparo'}, method='mean') \
+                .scale(columns={'tempo_preparo'}, method='standard') \
+                .fillna(columns={'prato'}, method='mode') \
+                .scale(columns={'distancia'}, method='minMax') \
+                .encode(columns={'cidade'}, method='oneHot') \
+                .encode(columns={'prato'}, method='label')
+
+        stream = StreamingPreprocessing(self.path, chunk_size=8)
+        stream.dropna(columns={'distancia'}) \
+              .fillna(columns={'tempo_preparo'}, method='mean') \
+              .scale(columns={'tempo_preparo'}, method='standard') \
+              .fillna(columns={'prato'}, method='mode') \
+              .scale(columns={'distancia'}, method='minMax') \
+              .encode(columns={'cidade'}, method='oneHot') \
+              .encode(columns={'prato'}, method='label') \
+              .fit()
+
+        chunks = list(stream.iter_transform())
+        self.assertTrue(all(len(next(iter(chunk.values()))) <= 8 for chunk in chunks))
+        result = {column: [] for column in chunks[0]}
+        for chunk in chunks:
+            for column, values in chunk.items():
+                result[column].extend(values)
+        self._assert_same_dataset(expected.dataset, result)
+
+        rows_written = stream.transform_to_csv(self.output_path)
+        self.assertEqual(rows_written, len(expected.dataset['prato']))
+        written = next(read_csv_chunks(self.output_path, chunk_size=10 ** 6))
+        self._assert_same_dataset(expected.dataset, written)
+
+    def test_sparse_oneHot_matches_in_memory_codes(self):
+        expected = Preprocessing(self._full_dataset()).encode(columns={'cidade'}, method='sparseOneHot')
+        stream = StreamingPreprocessing(self.path, chunk_size=8).encode(columns={'cidade'}, method='sparseOneHot').fit()
+        codes = [code for chunk in stream.iter_transform() for code in chunk['cidade']]
+        self.assertEqual(codes, list(expected.dataset['cidade']))
+
+    def test_hash_encode_chunk_by_chunk(self):
+        expected = Preprocessing(self._full_dataset()).encode(columns={'prato'}, method='hash', n_features=4, seed=1)
+        stream = StreamingPreprocessing(self.path, chunk_size=8) \
+            .encode(columns={'prato'}, method='hash', n_features=4, seed=1).fit()
+        codes = [code for chunk in stream.iter_transform() for code in chunk['prato']]
+        self.assertEqual(codes, list(expected.dataset['prato']))
+
+    def test_approx_median_fill(self):
+        stream = StreamingPreprocessing(self.path, chunk_size=8).fillna(columns={'tempo_preparo'},
+                                                                         method='approx_median').fit()
+        present = sorted(row[0] for row in self.rows if row[0] != '')
+        fill_value = stream.states[0].value
+        rank = sum(1 for value in present if int(value) < fill_value) / len(present)
+        self.assertAlmostEqual(rank, 0.5, delta=0.05)
+        with self.assertRaises(ValueError):
+            StreamingPreprocessing(self.path).fillna(method='median')
+
+    def test_transform_requires_fit(self):
+        with self.assertRaises(RuntimeError):
+            next(StreamingPreprocessing(self.path).fillna().iter_transform())
+
+    def test_scaling_column_with_nulls_raises(self):
+        stream = StreamingPreprocessing(self.path, chunk_size=10).scale(columns={'tempo_preparo'})
+        with self.assertRaises(TypeError):
+            stream.fit()
+
+    def test_dropna_must_come_first(self):
+        with self.assertRaises(ValueError):
+            StreamingPreprocessing(self.path).fillna(columns={'prato'}, method='mode').dropna()
+
+
+if __name__ == '__main__':
+    unittest.main()
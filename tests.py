@@ -49,6 +49,11 @@ class TestStatistics(unittest.TestCase):
         # '-5' aparece 4 vezes
         self.assertEqual(sorted(self.stats.mode('negativos')), [-5])
 
+    def test_mode_ties_follow_first_appearance(self):
+        # Empates na ordem em que os valores aparecem pela primeira vez, não na ordem do set
+        self.assertEqual(Statistics({'x': [5, 1, 1, 5, 3]}).mode('x'), [5, 1])
+        self.assertEqual(self.stats.mode('categorica'), ['A', 'B'])
+
     def test_variance_and_stdev(self):
         # Usando um dataset simples para facilitar a verificação manual
         simple_data = {'col': [2, 4, 4, 4, 5, 5, 7, 9]}
@@ -114,6 +119,130 @@ class TestStatistics(unittest.TestCase):
         # P(X=1 | X=4) -> '4' não existe, contagem do condicionante é 0
         self.assertEqual(self.stats.conditional_probability('sequencial', 1, 4), 0.0)
 
+    def test_next_item_distribution_and_higher_orders(self):
+        # Mesmo denominador de conditional_probability: ocorrências de '1' (8)
+        self.assertEqual(self.stats.next_item_distribution('sequencial', 1), {2: 0.5, 3: 0.375})
+        self.assertEqual(self.stats.next_item_distribution('sequencial', 4), {})
+
+        # Trigramas: P(X=3 | anteriores = (1, 2)); o par (1, 2) aparece 4 vezes, seguido de 3 uma vez
+        self.assertAlmostEqual(self.stats.conditional_probability('sequencial', 3, (1, 2), order=3), 0.25)
+        self.assertAlmostEqual(sum(self.stats.next_item_distribution('sequencial', (1, 2), order=3).values()), 1.0)
+        with self.assertRaises(ValueError):
+            self.stats.next_item_distribution('sequencial', 1, order=1)
+
+        # O índice é montado uma única vez para todas as consultas da coluna
+        self.assertIs(self.stats._transition_table('sequencial'), self.stats._transition_table('sequencial'))
+        faltas = self.stats.cache_info()['misses']
+        for valor in (1, 2, 3, 4):
+            self.stats.conditional_probability('sequencial', 1, valor)
+            self.stats.next_item_distribution('sequencial', valor)
+        self.assertEqual(self.stats.cache_info()['misses'], faltas)
+
+        # O índice acompanha a troca da lista e invalidate()
+        self.test_data['sequencial'] = [1, 1, 2]
+        self.assertEqual(self.stats.conditional_probability('sequencial', 1, 1), 0.5)
+        self.test_data['sequencial'][2] = 1
+        self.stats.invalidate(['sequencial'])
+        self.assertEqual(self.stats.next_item_distribution('sequencial', 1), {1: 2 / 3})
+
+    def test_frequency_table_is_shared_and_invalidated(self):
+        # As frequências derivadas reaproveitam a mesma tabela de contagem
+        self.assertIs(self.stats._frequency_table('categorica'), self.stats._frequency_table('categorica'))
+        self.assertEqual(self.stats.mode('categorica'), ['A', 'B'])
+
+        # Alteração interna da lista exige invalidate()
+        self.test_data['categorica'][1] = 'A'
+        self.stats.invalidate({'categorica'})
+        self.assertEqual(self.stats.mode('categorica'), ['A'])
+        self.assertEqual(self.stats.absolute_frequency('categorica')['A'], 7)
+
+        # Trocar a lista da coluna invalida o cache automaticamente
+        self.test_data['categorica'] = ['D', 'D', 'C'] + ['A'] * 17
+        self.assertEqual(self.stats.absolute_frequency('categorica'), {'D': 2, 'C': 1, 'A': 17})
+
+    def test_result_cache_versions_and_lru(self):
+        # variance reaproveita a média e stdev reaproveita a variância em cache
+        self.stats.stdev('inteiros')
+        acertos = self.stats.cache_info()['hits']
+        self.stats.mean('inteiros')
+        self.stats.variance('inteiros')
+        self.assertEqual(self.stats.cache_info()['hits'], acertos + 2)
+
+        # Incrementar a versão de outra coluna não afeta os resultados desta
+        self.stats.invalidate(['floats'])
+        self.stats.mean('inteiros')
+        self.assertEqual(self.stats.cache_info()['hits'], acertos + 3)
+
+        self.test_data['inteiros'][0] = 30
+        self.stats.invalidate(['inteiros'])
+        self.assertAlmostEqual(self.stats.mean('inteiros'), 11.5)
+
+        # Cache limitado: a entrada usada há mais tempo é descartada
+        pequeno = Statistics(self.test_data, cache_size=2)
+        pequeno.mean('inteiros')
+        pequeno.mean('floats')
+        pequeno.mean('inteiros')
+        pequeno.mean('negativos')
+        self.assertEqual(pequeno.cache_info()['size'], 2)
+        faltas = pequeno.cache_info()['misses']
+        pequeno.mean('inteiros')
+        pequeno.mean('floats')
+        self.assertEqual(pequeno.cache_info()['misses'], faltas + 1)
+
+        with self.assertRaises(ValueError):
+            Statistics(self.test_data, cache_size=-1)
+
+    def test_cache_contract_for_in_place_edits(self):
+        # Alterações diretas dentro da lista não são vistas até invalidate()
+        self.assertAlmostEqual(self.stats.mean('inteiros'), 10.5)
+        self.test_data['inteiros'][0] = 30
+        self.assertAlmostEqual(self.stats.mean('inteiros'), 10.5)
+        self.stats.invalidate(['inteiros'])
+        self.assertAlmostEqual(self.stats.mean('inteiros'), 11.5)
+
+        # Trocar a lista sempre invalida, mesmo que a nova tenha o id de uma lista descartada
+        for _ in range(20):
+            self.test_data['inteiros'] = [1] * 20
+            self.assertEqual(self.stats.mean('inteiros'), 1)
+            self.test_data['inteiros'] = [2] * 20
+            self.assertEqual(self.stats.mean('inteiros'), 2)
+
+    def test_quantile(self):
+        # Interpolação linear: posição (n - 1) * q na lista ordenada
+        self.assertAlmostEqual(self.stats.quantile('inteiros', 0.5), self.stats.median('inteiros'))
+        self.assertAlmostEqual(self.stats.quantile('inteiros', 0.25), 8.75)
+        self.assertAlmostEqual(self.stats.quantile('negativos', 0.0), -15.0)
+        self.assertAlmostEqual(self.stats.quantile('negativos', 1.0), 6.0)
+
+        # O sketch devolve um valor da coluna com rank próximo de q * n
+        large = Statistics({'valores': list(range(10000, 0, -1))})
+        self.assertAlmostEqual(large.median('valores'), 5000.5)
+        self.assertAlmostEqual(large.quantile('valores', 0.9, method='approx', error=0.01), 9000, delta=200)
+
+        with self.assertRaises(ValueError):
+            self.stats.quantile('inteiros', 1.5)
+        with self.assertRaises(ValueError):
+            self.stats.quantile('inteiros', 0.5, method='invalid_method')
+
+    def test_covariance_and_correlation_matrix(self):
+        # Sem colunas explícitas, a matriz cobre apenas as colunas numéricas
+        matriz = self.stats.covariance_matrix()
+        self.assertEqual(list(matriz), ['inteiros', 'floats', 'negativos', 'sequencial'])
+        for a in matriz:
+            for b in matriz:
+                self.assertAlmostEqual(matriz[a][b], self.stats.covariance(a, b))
+        self.assertAlmostEqual(matriz['floats']['floats'], self.stats.variance('floats'))
+
+        correlacoes = Statistics({'x': [1, 2, 3, 4], 'y': [4, 2, 3, 1], 'z': [2, 4, 6, 8], 'c': [5, 5, 5, 5]}) \
+            .correlation_matrix(['x', 'y', 'z', 'c'])
+        self.assertAlmostEqual(correlacoes['x']['y'], -0.8)
+        self.assertAlmostEqual(correlacoes['x']['z'], 1.0)
+        self.assertAlmostEqual(correlacoes['y']['y'], 1.0)
+        self.assertEqual(correlacoes['c']['x'], 0.0)
+
+        with self.assertRaises(TypeError):
+            self.stats.covariance_matrix(['inteiros', 'categorica'])
+
     # ==================================================================
     # Testes de Casos de Exceção
     # ==================================================================
@@ -161,6 +290,8 @@ class TestStatistics(unittest.TestCase):
         self.assertEqual(empty_stats.variance('vazia'), 0.0)
         self.assertEqual(empty_stats.stdev('vazia'), 0.0)
         self.assertEqual(empty_stats.covariance('vazia', 'outra'), 0.0)
+        self.assertEqual(empty_stats.covariance_matrix(['vazia', 'outra']), {'vazia': {'vazia': 0.0, 'outra': 0.0},
+                                                                             'outra': {'vazia': 0.0, 'outra': 0.0}})
         self.assertEqual(empty_stats.itemset('vazia'), set())
         self.assertEqual(empty_stats.absolute_frequency('vazia'), {})
         self.assertEqual(empty_stats.relative_frequency('vazia'), {})